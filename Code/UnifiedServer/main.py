@@ -13,32 +13,95 @@ import mediapipe as mp
 import cv2
 import numpy as np
 import torch
-import albumentations as A
-from albumentations.pytorch import ToTensorV2
-import socket
 import json
 import time
 import math
+import functools
+import threading
+import argparse
+import logging
 from src.signdetr_model import DETR
-from src.utils.boxes import rescale_bboxes
+from src.signdetr_engine import BACKENDS, SignDETREngine, hand_rois
+from src.signdetr_quant import load_frames
+from src.utils.boxes import postprocess_detections
 from src.utils.setup import get_classes
 from src.asl_classifier import ASLClassifier
 from src.threaded_inference import ThreadedInference
-from src.two_handed_gestures import detect_two_handed_gestures, is_ext
-from src.two_handed_gestures import detect_two_handed_gestures, is_ext
+from src.pipeline import Pipeline, Stage
+from src.scheduler import HandMotion, Schedule, extrapolate_body_pose
+from src.frame_source import open_source
+from src.control import ControlChannel
+from src.preview import PreviewThread
+from src.telemetry import Sampler, get_logger, log_event, setup_logging
+from src.fanout import FanoutSender
 from src.two_handed_gestures import detect_two_handed_gestures
+from src.landmark_arrays import FrameLandmarks, fingers_extended
+from src.gesture_tracker import GestureTracker
+from src.filters import FILTERS, PacketSmoother
 
 # --- CONFIGURATION ---
 UDP_IP = "127.0.0.1"
-UDP_PORT = 5005
+UDP_PORT = 5005 # Default (static) receiver; more can subscribe on SUBSCRIBE_PORT
+SUBSCRIBE_PORT = 5007 # UDP port where receivers send "hello" to subscribe (see src/fanout.py); 0 = off
+SUBSCRIBE_IP = "127.0.0.1" # Interface for subscriptions; "0.0.0.0" lets other hosts on the network subscribe
+MAX_SUBSCRIBERS = 8 # Hellos beyond this many subscribers are dropped
+SUBSCRIBER_TIMEOUT = 5.0 # Seconds without a hello before a subscriber is dropped
 DEVICE = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
 MODEL_PATH = "models/signdetr.pt"
 OPENPOSE_PATH = "models/graph_opt.pb"
 ASL_RF_PATH = "models/asl_model.p"
 NEW_ASL_MODEL_PATH = "models/cnn8grps_rad1_model.h5"
+ASL_CNN_RUNTIME = "auto" # "tflite" / "onnx" export next to the .h5 on first use; "auto" uses a cached export if present; "keras"
+SPEECH_CACHE_MB = 64 # Disk budget for cached speech audio (LRU, in <exchange>/Audio/cache); 0 = synthesise every time
+SPEECH_WARMUP = ["HELLO", "THANK YOU", "YES", "NO"] # Phrases pre-synthesised into the cache in the background at startup
+ASL_LANDMARK_MODEL_PATH = "models/asl_landmark_mlp.p" # Landmark MLP distilled from the CNN; used instead of it if present
 WHITE_IMG_PATH = "models/white.jpg"
 CONFIDENCE_THRESHOLD = 0.7 
+SIGNDETR_NMS_IOU = None # IoU for class-aware NMS of SignDETR boxes (None = off, DETR rarely duplicates)
 OPENPOSE_THR = 0.2
+INFERENCE_TIMEOUT = 1.0 # Max seconds to wait for MediaPipe results of a frame
+PARALLEL_LANDMARKERS = True # Run face and hand landmarkers on separate threads
+LATENCY_REPORT_INTERVAL = 300 # Frames between latency reports (0 = off)
+STAGE_QUEUE_SIZE = 2 # Frames buffered in front of each pipeline stage (oldest dropped)
+STAGE_WORKERS = {"mediapipe": 1, "body_pose": 1, "signdetr": 1} # Threads per model stage
+# Per-model scheduling (see src/scheduler.py): run at least every N frames, and earlier when the frame
+# changed (mean grayscale diff, 0-255) or the hands moved (normalised units). MediaPipe always runs.
+MODEL_SCHEDULES = {
+    "signdetr": {"every": 6, "diff_threshold": 6.0, "hand_threshold": 0.02},
+    "body_pose": {"every": 3, "diff_threshold": 4.0},
+}
+CONTROL_PORT = 5006 # Local UDP port for control commands ("speak", "quit", "keyframe"); 0 = off
+KEY_COMMANDS = {27: "quit", ord('s'): "speak"} # Window key -> control command (ESC, 's')
+PACKET_LOG_INTERVAL = 1.0 # Seconds between per-packet summary log lines
+WIRE_FORMAT = "json" # "json" or "binary" (see src/wire_format.py)
+KEYFRAME_INTERVAL = 0 # >0: send keyframes every N packets and deltas in between (see src/delta_stream.py)
+SIGNDETR_BACKEND = "eager" # "eager", "torchscript", "onnx", or quantised "int8", "dynamic", "fp16" (cached next to MODEL_PATH)
+SIGNDETR_CALIBRATION = "data/signdetr_calibration" # Frames (image dir or video) used to calibrate the "int8" backbone
+SIGNDETR_BATCH_WAIT_MS = 0 # >0: micro-batch concurrent SignDETR requests (several cameras / workers)
+SIGNDETR_ROI = False # Run SignDETR only on crops around the MediaPipe hands (waits for the hand landmarks)
+SIGNDETR_ROI_PADDING = 0.25 # Crop margin on each side, as a fraction of the hand's size
+SMOOTHING = "one_euro" # Server-side filtering of head pose / body joints (src/filters.py): "one_euro", "kalman" or "none"
+SMOOTHING_PARAMS = { # Per filter and signal; tuned on tests/bench_filters.py
+    "one_euro": {"head_pose": {"min_cutoff": 1.0, "beta": 0.1},   # degrees
+                 "body_pose": {"min_cutoff": 1.0, "beta": 0.05},  # pixels
+                 "hands": {"min_cutoff": 1.0, "beta": 30.0}},     # normalised image coordinates
+    "kalman": {"head_pose": {"process_noise": 1e3, "measurement_noise": 1.0},
+               "body_pose": {"process_noise": 1e4, "measurement_noise": 9.0},
+               "hands": {"process_noise": 0.025, "measurement_noise": 2e-5}},
+}
+SMOOTH_HANDS = False # Also filter the hand landmarks before gestures / ASL (smoother, but adds some lag to them)
+MAX_PREDICTION = 0.1 # Head pose / joints are predicted ahead by the capture-to-send latency, up to this (s); 0 = off
+
+logger = get_logger("server")
+expression_logger = get_logger("expression")
+expression_sampler = Sampler() # Disabled unless --debug-sample is given
+hand_motion = HandMotion() # Updated per frame in build_packet, read by the model schedules
+trace_file = None # --record-trace: raw head pose / body joints per packet, for tests/bench_filters.py
+
+def make_smoother(kind):
+    return PacketSmoother(kind, SMOOTHING_PARAMS.get(kind), smooth_hands=SMOOTH_HANDS, max_prediction=MAX_PREDICTION)
+
+pose_smoother = make_smoother(SMOOTHING)
 
 # --- MEDIAPIPE SETUP ---
 BaseOptions = mp.tasks.BaseOptions
@@ -62,13 +125,10 @@ options = HandLandmarkerOptions(
 )
 hand_landmarker = HandLandmarker.create_from_options(options)
 
-# --- SOCKET SETUP ---
-sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-
 # --- SIGNDETR SETUP ---
 classes = get_classes()
 num_classes = len(classes)
-detr_model = DETR(num_classes=num_classes)
+detr_model = DETR(num_classes=num_classes, pretrained_backbone=not os.path.exists(MODEL_PATH))
 # Check if model exists
 if os.path.exists(MODEL_PATH):
     detr_model.load_pretrained(MODEL_PATH)
@@ -78,11 +138,35 @@ else:
 detr_model.to(DEVICE)
 detr_model.eval()
 
+def make_signdetr_engine(backend):
+    calibration = None
+    if os.path.exists(SIGNDETR_CALIBRATION):
+        calibration = functools.partial(load_frames, SIGNDETR_CALIBRATION) # Only read if the int8 artifact is rebuilt
+    return SignDETREngine(detr_model, DEVICE, backend, MODEL_PATH,
+                          batch_wait_ms=SIGNDETR_BATCH_WAIT_MS, calibration=calibration)
+
+signdetr_engine = make_signdetr_engine(SIGNDETR_BACKEND)
+
+# --- SENDER SETUP ---
+fanout = None # Built in main() (make_fanout), once the command line is known
+
+def make_fanout(wire_format=WIRE_FORMAT, keyframe_interval=KEYFRAME_INTERVAL, subscribe_port=SUBSCRIBE_PORT,
+                subscribe_ip=SUBSCRIBE_IP, default_target=True):
+    sender = FanoutSender(classes, wire_format, keyframe_interval, bind_ip=subscribe_ip, port=subscribe_port,
+                          timeout=SUBSCRIBER_TIMEOUT, max_subscribers=MAX_SUBSCRIBERS)
+    if default_target:
+        sender.add_target((UDP_IP, UDP_PORT))
+    return sender
+
 # --- ASL CLASSIFIER SETUP ---
 # Initialize the Unified ASL Classifier with both CNN (Primary) and RF (Legacy) models
 asl_classifier = ASLClassifier(
     model_path_cnn=NEW_ASL_MODEL_PATH, 
-    white_img_path=WHITE_IMG_PATH
+    white_img_path=WHITE_IMG_PATH,
+    landmark_model_path=ASL_LANDMARK_MODEL_PATH,
+    cnn_runtime=ASL_CNN_RUNTIME,
+    speech_cache_mb=SPEECH_CACHE_MB,
+    speech_warmup=SPEECH_WARMUP
 )
 
 # --- OPENPOSE SETUP ---
@@ -93,14 +177,9 @@ if os.path.exists(OPENPOSE_PATH):
 else:
     print(f"WARNING: OpenPose model not found at {OPENPOSE_PATH}")
 
-# Transform for SignDETR
-transform = A.Compose([
-    A.Resize(224, 224),
-    A.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225]),
-    ToTensorV2()
-])
-
 # --- UTILS ---
+HEAD_POSE_LANDMARKS = [1, 152, 33, 263, 61, 291]
+
 def get_head_pose(landmarks, img_w, img_h):
     # 3D model points (Adjusted for Y-Down Coordinate System compatibility)
     # Nose (0,0,0)
@@ -115,16 +194,9 @@ def get_head_pose(landmarks, img_w, img_h):
         (150.0, 150.0, 125.0)        # Right mouth corner
     ])
 
-    # 2D image points from landmarks
+    # 2D image points from the (468+, 3) face landmark array
     # Nose: 1, Chin: 152, Left Eye Left: 33, Right Eye Right: 263, Left Mouth: 61, Right Mouth: 291
-    image_points = np.array([
-        (landmarks[1].x * img_w, landmarks[1].y * img_h),
-        (landmarks[152].x * img_w, landmarks[152].y * img_h),
-        (landmarks[33].x * img_w, landmarks[33].y * img_h),
-        (landmarks[263].x * img_w, landmarks[263].y * img_h),
-        (landmarks[61].x * img_w, landmarks[61].y * img_h),
-        (landmarks[291].x * img_w, landmarks[291].y * img_h)
-    ], dtype="double")
+    image_points = landmarks[HEAD_POSE_LANDMARKS, :2].astype("double") * (img_w, img_h)
 
     focal_length = img_w
     center = (img_w / 2, img_h / 2)
@@ -154,18 +226,20 @@ def get_head_pose(landmarks, img_w, img_h):
 def detect_expression_blendshapes(blendshapes):
     bs_map = {b.category_name: b.score for b in blendshapes}
     
-    # --- Debug Print ---
-    debug_scores = {
-        "smile": (bs_map.get('mouthSmileLeft', 0) + bs_map.get('mouthSmileRight', 0)) / 2.0,
-        "frown": (bs_map.get('mouthFrownLeft', 0) + bs_map.get('mouthFrownRight', 0)) / 2.0,
-        "blink": (bs_map.get('eyeBlinkLeft', 0) + bs_map.get('eyeBlinkRight', 0)) / 2.0,
-        "jawOpen": bs_map.get('jawOpen', 0),
-        "tongue": bs_map.get('tongueOut', 0),
-        "brow_down": (bs_map.get('browDownLeft', 0) + bs_map.get('browDownRight', 0)) / 2.0,
-        "brow_up": bs_map.get('browInnerUp', 0)
-    }
-    print(", ".join([f"{k}:{v:.2f}" for k, v in debug_scores.items()]))
-    # --- End Debug Print ---
+    # --- Debug Scores (opt-in sampling, see --debug-sample) ---
+    if expression_sampler.tick() and expression_logger.isEnabledFor(logging.DEBUG):
+        debug_scores = {
+            "smile": (bs_map.get('mouthSmileLeft', 0) + bs_map.get('mouthSmileRight', 0)) / 2.0,
+            "frown": (bs_map.get('mouthFrownLeft', 0) + bs_map.get('mouthFrownRight', 0)) / 2.0,
+            "blink": (bs_map.get('eyeBlinkLeft', 0) + bs_map.get('eyeBlinkRight', 0)) / 2.0,
+            "jawOpen": bs_map.get('jawOpen', 0),
+            "tongue": bs_map.get('tongueOut', 0),
+            "brow_down": (bs_map.get('browDownLeft', 0) + bs_map.get('browDownRight', 0)) / 2.0,
+            "brow_up": bs_map.get('browInnerUp', 0)
+        }
+        log_event(expression_logger, logging.DEBUG, "blendshapes",
+                  **{k: round(v, 2) for k, v in debug_scores.items()})
+    # --- End Debug Scores ---
     
     smile_left = bs_map.get('mouthSmileLeft', 0)
     smile_right = bs_map.get('mouthSmileRight', 0)
@@ -232,17 +306,14 @@ def get_body_pose(net, image):
             
     return parts
 
-def detect_hand_shape(landmarks):
+def detect_hand_shape(landmarks, extended=None):
     """
     Detects static hand shapes like punch and gun based on distances from wrist.
+    `landmarks` is one hand's (21, 3) array, `extended` its finger flags if already known.
     """
-    wrist = landmarks[0]
-    
-    index_ext = is_ext(landmarks, 8, 6)
-    middle_ext = is_ext(landmarks, 12, 10)
-    ring_ext = is_ext(landmarks, 16, 14)
-    pinky_ext = is_ext(landmarks, 20, 18)
-    thumb_ext = is_ext(landmarks, 4, 2)
+    if extended is None:
+        extended = fingers_extended(landmarks)
+    thumb_ext, index_ext, middle_ext, ring_ext, pinky_ext = extended.tolist()
     
     # Hello: All fingers extended
     if index_ext and middle_ext and ring_ext and pinky_ext and thumb_ext:
@@ -261,207 +332,348 @@ def detect_hand_shape(landmarks):
         return "punch"
         
     return "none"
-# Gesture History
-wrist_history = []
+# Gesture History: one ring buffer per hand (src/gesture_tracker.py)
 GESTURE_BUFFER_SIZE = 15
+gesture_tracker = GestureTracker(size=GESTURE_BUFFER_SIZE)
 
-def detect_gesture(landmarks):
-    global wrist_history
-    wrist = landmarks[0]
-    wrist_history.append((wrist.x, wrist.y))
-    if len(wrist_history) > GESTURE_BUFFER_SIZE:
-        wrist_history.pop(0)
-    
+def detect_gesture(landmarks, extended=None, motion="none"):
+    """A static hand shape wins; otherwise the hand's motion gesture from gesture_tracker."""
     # 1. Check Hand Shape (Static)
-    shape = detect_hand_shape(landmarks)
+    shape = detect_hand_shape(landmarks, extended)
     if shape != "none":
         return shape
 
-    # 2. Check Movement Gestures (Dynamic)
-    if len(wrist_history) < GESTURE_BUFFER_SIZE:
-        return "none"
-
-    xs = [p[0] for p in wrist_history]
-    ys = [p[1] for p in wrist_history]
-    
-    x_range = max(xs) - min(xs)
-    y_range = max(ys) - min(ys)
-    
-    if x_range > 0.2 and y_range < 0.1:
-        return "wave_horizontal"
-    if y_range > 0.2 and x_range < 0.1:
-        return "wave_vertical"
-        
-    return "none"
+    # 2. Movement Gestures (Dynamic)
+    return motion
 
 def draw_text(img, text, pos, color=(0, 255, 0)):
     cv2.putText(img, text, pos, cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
 
-# --- MAIN LOOP ---
-def main():
-    cap = cv2.VideoCapture(0)
-    
-    print("Unified CV Server Started. Streaming to 127.0.0.1:5005...")
-    
-    threaded_inference = ThreadedInference(face_landmarker, hand_landmarker)
+POSE_PAIRS = [[1,2], [1,5], [2,3], [3,4], [5,6], [6,7], [1,8], [8,9], [9,10], [1,11], [11,12], [12,13]]
 
-    while cap.isOpened():
-        success, image = cap.read()
-        if not success:
-            print("Ignoring empty camera frame.")
-            continue
+# --- PIPELINE STAGES ---
+# cv2.dnn nets are not thread-safe, so each body pose worker loads its own copy
+pose_local = threading.local()
 
-        h, w, _ = image.shape
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        
-        threaded_inference.start(image_rgb)
-        time.sleep(0.01) # Small delay to allow thread to start and hopefully finish
-        face_results, hand_results = threaded_inference.get_results()
-        
-        if face_results is None or hand_results is None:
-            continue
-        
-        data_packet = {
-            "face_found": False,
-            "head_pose": {"pitch":0, "yaw":0, "roll":0},
-            "expression": "neutral",
-            "hand_found": False,
-            "gesture": "none",
-            "sign_asl": "none",
-            "sign_conf": 0.0,
-            "asl_char": "none",
-            "current_text": asl_classifier.current_str,
-            "body_pose": []
-        }
-
-        # --- FACE LOGIC ---
-        if face_results.face_landmarks:
-            data_packet["face_found"] = True
-            landmarks = face_results.face_landmarks[0]
-            
-            # Head Pose
-            pose = get_head_pose(landmarks, w, h)
-            data_packet["head_pose"] = pose
-            
-            # Expression
-            if face_results.face_blendshapes:
-                expr, _ = detect_expression_blendshapes(face_results.face_blendshapes[0])
-                data_packet["expression"] = expr
-            
-            # Draw Face UI
-            cv2.rectangle(image, (10, 10), (250, 120), (0, 0, 0), -1) # Background
-            draw_text(image, f"Expr: {data_packet['expression']}", (20, 40), (0, 255, 255))
-            draw_text(image, f"Pitch: {pose['pitch']:.1f}", (20, 70))
-            draw_text(image, f"Yaw: {pose['yaw']:.1f}", (20, 95))
-            draw_text(image, f"Roll: {pose['roll']:.1f}", (20, 120))
+def prepare_frame(task):
+    task.image_rgb = cv2.cvtColor(task.image, cv2.COLOR_BGR2RGB)
 
+def run_mediapipe(threaded_inference, task):
+    frame_id = threaded_inference.submit(task.image_rgb, int(task.timestamp * 1000))
+    results = threaded_inference.get_results(frame_id, timeout=INFERENCE_TIMEOUT)
+    if results is None:
+        return None, None, FrameLandmarks()
+    # The one conversion to arrays per frame, done here so it stays off the aggregation thread
+    return results.face_results, results.hand_results, \
+        FrameLandmarks.from_results(results.face_results, results.hand_results)
 
-        # --- HAND LOGIC ---
-        if hand_results.hand_landmarks:
-            data_packet["hand_found"] = True
-            
-            two_handed_gesture = detect_two_handed_gestures(hand_results.hand_landmarks)
-            if two_handed_gesture:
-                data_packet["gesture"] = two_handed_gesture
-            else:
-                # Process single hand gestures
-                hand_landmarks = hand_results.hand_landmarks[0]
-                gesture = detect_gesture(hand_landmarks)
-                data_packet["gesture"] = gesture
-            
-            # ASL CNN (New)
-            asl_char = asl_classifier.predict_cnn(hand_results.hand_landmarks[0], w, h)
-            data_packet["asl_char"] = asl_char
-            
-            # Draw Hand UI
-            cv2.rectangle(image, (10, 150), (250, 240), (0, 0, 0), -1)
-            draw_text(image, f"Gesture: {data_packet['gesture']}", (20, 170), (0, 255, 0))
-            draw_text(image, f"ASL Char: {asl_char}", (20, 200), (255, 255, 0))
-            draw_text(image, f"Text: {asl_classifier.current_str[-15:]}", (20, 230), (255, 255, 255))
-
-
-        # --- BODY POSE LOGIC ---
-        if pose_net:
-            body_parts = get_body_pose(pose_net, image)
-            # Serialize for JSON
-            json_parts = []
-            for bp in body_parts:
-                if bp:
-                    json_parts.append(bp)
-                    cv2.circle(image, (bp['x'], bp['y']), 5, (0, 200, 200), -1)
-                else:
-                    json_parts.append(None)
-            
-            data_packet["body_pose"] = json_parts
-            
-            POSE_PAIRS = [[1,2], [1,5], [2,3], [3,4], [5,6], [6,7], [1,8], [8,9], [9,10], [1,11], [11,12], [12,13]]
-            for pair in POSE_PAIRS:
-                partA = body_parts[pair[0]]
-                partB = body_parts[pair[1]]
-                if partA and partB:
-                    cv2.line(image, (partA['x'], partA['y']), (partB['x'], partB['y']), (0, 200, 200), 2)
-
+def run_body_pose(task):
+    net = getattr(pose_local, "net", None)
+    if net is None:
+        net = pose_local.net = cv2.dnn.readNetFromTensorflow(OPENPOSE_PATH)
+    return get_body_pose(net, task.image)
+
+def run_signdetr(task):
+    return signdetr_engine.infer(task.image_rgb)
+
+def run_signdetr_roi(task):
+    """Runs after the mediapipe stage: no hands, no detector run."""
+    _, _, landmarks = task.results.get("mediapipe") or (None, None, FrameLandmarks())
+    if not len(landmarks.hands):
+        return None
+    height, width = task.image_rgb.shape[:2]
+    rois = hand_rois(landmarks.hands, width, height, padding=SIGNDETR_ROI_PADDING)
+    return signdetr_engine.infer_rois(task.image_rgb, rois)
+
+def hand_keys(hand_results):
+    """Per-hand signer keys: MediaPipe handedness, so each hand keeps its text when the order changes."""
+    keys = []
+    for i in range(len(hand_results.hand_landmarks)):
+        handedness = hand_results.handedness[i] if i < len(hand_results.handedness) else None
+        key = handedness[0].category_name if handedness else f"hand{i}"
+        keys.append(key if key not in keys else f"{key}{i}")
+    return keys
+
+def build_packet(task):
+    """
+    Aggregation step: turns the raw model outputs of one frame into the UDP packet.
+    Runs on a single thread in frame order, since gesture history and the ASL
+    classifier keep state across frames.
+    """
+    h, w, _ = task.image.shape
+    face_results, hand_results, landmarks = task.results.get("mediapipe") or (None, None, FrameLandmarks())
+
+    data_packet = {
+        "face_found": False,
+        "head_pose": {"pitch":0, "yaw":0, "roll":0},
+        "expression": "neutral",
+        "hand_found": False,
+        "gesture": "none",
+        "sign_asl": "none",
+        "sign_conf": 0.0,
+        "asl_char": "none",
+        "current_text": asl_classifier.current_str,
+        "body_pose": [],
+        **asl_classifier.io.status(), # speech: idle/speaking/error, speech_id: +1 per new speech.wav
+        "result_age": {k: round(v, 1) for k, v in task.result_age.items()} # ms, per scheduled model
+    }
 
-        # --- ASL LOGIC (SignDETR) ---
-        transformed = transform(image=image_rgb)
-        img_tensor = transformed['image'].unsqueeze(0).to(DEVICE)
+    # --- FACE LOGIC ---
+    if landmarks.face is not None:
+        data_packet["face_found"] = True
         
-        with torch.no_grad():
-            outputs = detr_model(img_tensor)
+        # Head Pose
+        pose = get_head_pose(landmarks.face, w, h)
+        data_packet["head_pose"] = pose
         
-        probas = outputs['pred_logits'].softmax(-1)[0, :, :-1]
-        keep = probas.max(-1).values > CONFIDENCE_THRESHOLD
+        # Expression
+        if face_results.face_blendshapes:
+            expr, _ = detect_expression_blendshapes(face_results.face_blendshapes[0])
+            data_packet["expression"] = expr
+
+    # --- HAND LOGIC ---
+    keys = hand_keys(hand_results) if len(landmarks.hands) else []
+    if pose_smoother.hands is not None:
+        landmarks = FrameLandmarks(landmarks.face, pose_smoother.smooth_hands(keys, landmarks.hands, task.timestamp))
+    hand_motion.update(landmarks.hands)
+    motions = gesture_tracker.update(keys, landmarks.hands, task.timestamp) # Every frame, so lost hands age out
+    if len(landmarks.hands):
+        data_packet["hand_found"] = True
         
-        if keep.any():
-            max_idx = probas.max(-1).values.argmax()
-            class_id = probas[max_idx].argmax()
-            conf = probas[max_idx][class_id].item()
-            sign_label = classes[class_id]
-            
-            data_packet["sign_asl"] = sign_label
-            data_packet["sign_conf"] = conf
+        two_handed_gesture = detect_two_handed_gestures(landmarks.hands, landmarks.extended)
+        if two_handed_gesture:
+            data_packet["gesture"] = two_handed_gesture
+        else:
+            # Process single hand gestures
+            gesture = detect_gesture(landmarks.hands[0], landmarks.extended[0], motions[0])
+            data_packet["gesture"] = gesture
+        
+        # ASL CNN (New): every hand spells its own text, one model call for all of them.
+        # The packet carries the first hand's character and text.
+        asl_chars = asl_classifier.predict_batch(
+            [(key, hand, w, h) for key, hand in zip(keys, landmarks.hands)])
+        task.results["asl_chars"] = asl_chars
+        data_packet["asl_char"] = asl_chars[0]
+        data_packet["current_text"] = asl_classifier.current_str
+
+    # --- BODY POSE LOGIC ---
+    body_parts = task.results.get("body_pose")
+    if body_parts:
+        data_packet["body_pose"] = body_parts
+
+    # --- ASL LOGIC (SignDETR) ---
+    outputs = task.results.get("signdetr")
+    detections = None
+    if outputs is not None:
+        detections = postprocess_detections(outputs, (w, h), CONFIDENCE_THRESHOLD, SIGNDETR_NMS_IOU)
+        if len(detections):
+            data_packet["sign_asl"] = classes[detections[0]["class_id"]]
+            data_packet["sign_conf"] = float(detections[0]["conf"])
+    task.results["detections"] = detections
+
+    # --- SMOOTHING ---
+    if trace_file is not None:
+        head_pose = data_packet["head_pose"] if data_packet["face_found"] else None
+        trace_file.write(json.dumps({"t": task.timestamp, "head_pose": head_pose, "body_pose": data_packet["body_pose"]}) + "\n")
+    # Predict ahead by how long this frame took since capture
+    pose_smoother.smooth_packet(data_packet, task.timestamp, lead=time.time() - task.timestamp)
+
+    return data_packet
+
+def send_packet(task, data_packet):
+    log_event(logger, logging.INFO, "packet", key="packet", interval=PACKET_LOG_INTERVAL,
+              frame=task.frame_id, gesture=data_packet['gesture'],
+              asl_char=data_packet['asl_char'], expression=data_packet['expression'])
+
+    # Encoding and the per-subscriber sends happen on the fan-out thread
+    fanout.publish(data_packet, task.timestamp)
+
+def draw_overlay(task):
+    """Draws the debug UI for one processed frame onto its image."""
+    image = task.image
+    data_packet = task.packet
+
+    if data_packet["face_found"]:
+        pose = data_packet["head_pose"]
+        cv2.rectangle(image, (10, 10), (250, 120), (0, 0, 0), -1) # Background
+        draw_text(image, f"Expr: {data_packet['expression']}", (20, 40), (0, 255, 255))
+        draw_text(image, f"Pitch: {pose['pitch']:.1f}", (20, 70))
+        draw_text(image, f"Yaw: {pose['yaw']:.1f}", (20, 95))
+        draw_text(image, f"Roll: {pose['roll']:.1f}", (20, 120))
+
+    if data_packet["hand_found"]:
+        cv2.rectangle(image, (10, 150), (250, 240), (0, 0, 0), -1)
+        draw_text(image, f"Gesture: {data_packet['gesture']}", (20, 170), (0, 255, 0))
+        asl_chars = task.results.get("asl_chars") or [data_packet['asl_char']]
+        draw_text(image, f"ASL Char: {' | '.join(str(c) for c in asl_chars)}", (20, 200), (255, 255, 0))
+        draw_text(image, f"Text: {data_packet['current_text'][-15:]}", (20, 230), (255, 255, 255))
+
+    body_parts = data_packet["body_pose"]
+    if body_parts:
+        for bp in body_parts:
+            if bp:
+                cv2.circle(image, (bp['x'], bp['y']), 5, (0, 200, 200), -1)
+        for pair in POSE_PAIRS:
+            partA = body_parts[pair[0]]
+            partB = body_parts[pair[1]]
+            if partA and partB:
+                cv2.line(image, (partA['x'], partA['y']), (partB['x'], partB['y']), (0, 200, 200), 2)
+
+    detections = task.results.get("detections")
+    for class_id, conf, x1, y1, x2, y2 in (detections.tolist() if detections is not None else []):
+        cv2.rectangle(image, (x1, y1), (x2, y2), (0, 255, 0), 2)
+        draw_text(image, f"{classes[class_id]} ({conf:.2f})", (x1, y1 - 10), (0, 255, 0))
+
+    return image
+
+def make_schedule(name, schedules):
+    config = schedules.get(name)
+    if not config:
+        return None
+    extrapolate = extrapolate_body_pose if name == "body_pose" else None
+    return Schedule(hand_motion=hand_motion, extrapolate=extrapolate, **config)
+
+def build_pipeline(source, threaded_inference, schedules=MODEL_SCHEDULES, roi=SIGNDETR_ROI):
+    """Wires capture -> [MediaPipe (-> SignDETR on hand crops) | OpenPose | SignDETR] -> packet -> UDP."""
+    stages = [
+        Stage("mediapipe", functools.partial(run_mediapipe, threaded_inference),
+              workers=STAGE_WORKERS["mediapipe"], queue_size=STAGE_QUEUE_SIZE),
+        Stage("signdetr", run_signdetr_roi if roi else run_signdetr,
+              workers=STAGE_WORKERS["signdetr"], queue_size=STAGE_QUEUE_SIZE,
+              schedule=make_schedule("signdetr", schedules), after=("mediapipe",) if roi else ()),
+    ]
+    if pose_net is not None:
+        stages.append(Stage("body_pose", run_body_pose,
+                            workers=STAGE_WORKERS["body_pose"], queue_size=STAGE_QUEUE_SIZE,
+                            schedule=make_schedule("body_pose", schedules)))
+
+    # Live sources drop stale frames; recorded ones are processed frame by frame
+    return Pipeline(source, stages, build_packet, send_packet,
+                    prepare=prepare_frame, queue_size=STAGE_QUEUE_SIZE,
+                    drop_frames=source.live)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Unified CV Server")
+    parser.add_argument("--source", default="0",
+                        help="Webcam index, video file, image directory or 'synthetic[:N]'")
+    parser.add_argument("--realtime", action="store_true",
+                        help="Pace recorded sources at their frame rate instead of as fast as possible")
+    parser.add_argument("--fps", type=float, default=None,
+                        help="Playback rate for recorded sources (default: file rate or 30)")
+    parser.add_argument("--loop", action="store_true", help="Loop recorded sources")
+    parser.add_argument("--headless", action="store_true",
+                        help="No window or overlay rendering; commands come from stdin / the control port")
+    parser.add_argument("--preview-fps", type=float, default=0,
+                        help="In headless mode, show the debug overlay in a preview window at this rate")
+    parser.add_argument("--wire-format", choices=["json", "binary"], default=WIRE_FORMAT,
+                        help="UDP packet encoding")
+    parser.add_argument("--keyframe-interval", type=int, default=KEYFRAME_INTERVAL,
+                        help="Send keyframes every N packets and only changes in between (0 = full packets)")
+    parser.add_argument("--no-schedule", action="store_true",
+                        help="Run every model on every frame (disables MODEL_SCHEDULES)")
+    parser.add_argument("--detr-backend", choices=BACKENDS, default=SIGNDETR_BACKEND,
+                        help="SignDETR inference backend")
+    parser.add_argument("--detr-roi", action=argparse.BooleanOptionalAction, default=SIGNDETR_ROI,
+                        help="Run SignDETR only on crops around the detected hands")
+    parser.add_argument("--smoothing", choices=FILTERS, default=SMOOTHING,
+                        help="Server-side filtering of head pose and body joints")
+    parser.add_argument("--record-trace", metavar="PATH",
+                        help="Write the raw head pose / body joints of every packet as JSON lines (for tests/bench_filters.py)")
+    parser.add_argument("--subscribe-port", type=int, default=SUBSCRIBE_PORT,
+                        help="UDP port for subscriber hello packets (0 = only the default target)")
+    parser.add_argument("--subscribe-ip", default=SUBSCRIBE_IP,
+                        help="Interface for subscriber hello packets (0.0.0.0 = accept viewers on the network)")
+    parser.add_argument("--no-default-target", action="store_true",
+                        help=f"Only send to subscribers, not to {UDP_IP}:{UDP_PORT}")
+    parser.add_argument("--log-level", default="INFO", help="DEBUG, INFO, WARNING, ...")
+    parser.add_argument("--log-json", action="store_true", help="Emit log records as JSON lines")
+    parser.add_argument("--debug-sample", type=int, default=0,
+                        help="Log blendshape debug scores for every Nth face frame (0 = off)")
+    return parser.parse_args(argv)
+
+def report_latency(pipeline, threaded_inference, task):
+    stats = pipeline.stats()
+    log_event(logger, logging.INFO, "pipeline", fps=round(stats['fps'], 1),
+              dropped=stats['dropped'], subscribers=len(fanout.subscribers),
+              **{f"{k}_run_ratio": round(v['run_ratio'], 2) for k, v in stats['scheduled'].items()},
+              **{f"{k}_ms": round(v, 1) for k, v in task.timings.items()})
+    summary = threaded_inference.latency_summary()
+    log_event(logger, logging.INFO, "mediapipe latency",
+              **{f"{k}_mean": round(v['mean'], 1) for k, v in summary.items()},
+              **{f"{k}_max": round(v['max'], 1) for k, v in summary.items()})
 
-            kept_indices = keep.nonzero(as_tuple=True)[0]
-            
-            for idx in kept_indices:
-                box_probas = probas[idx]
-                box_class_id = box_probas.argmax()
-                box_conf = box_probas[box_class_id].item()
-                box_label = classes[box_class_id]
-                
-                raw_box = outputs['pred_boxes'][0, idx]
-                cx, cy, bw, bh = raw_box.tolist()
-                
-                x1 = int((cx - bw/2) * w)
-                y1 = int((cy - bh/2) * h)
-                x2 = int((cx + bw/2) * w)
-                y2 = int((cy + bh/2) * h)
-                
-                cv2.rectangle(image, (x1, y1), (x2, y2), (0, 255, 0), 2)
-                draw_text(image, f"{box_label} ({box_conf:.2f})", (x1, y1 - 10), (0, 255, 0))
-
-
-        # Send Data
-        print(f"Gesture: {data_packet['gesture']}, ASL Char: {data_packet['asl_char']}, Expression: {data_packet['expression']}")
-
-        # Send Data
-        try:
-            json_str = json.dumps(data_packet)
-            sock.sendto(json_str.encode(), (UDP_IP, UDP_PORT))
-        except Exception as e:
-            print(f"Socket Error: {e}")
+# --- MAIN LOOP ---
+def main(argv=None):
+    global fanout, signdetr_engine, pose_smoother, trace_file
+    args = parse_args(argv)
+    if args.smoothing != SMOOTHING:
+        pose_smoother = make_smoother(args.smoothing)
+    if args.record_trace:
+        trace_file = open(args.record_trace, "w")
+    if args.detr_backend != signdetr_engine.backend:
+        signdetr_engine = make_signdetr_engine(args.detr_backend)
+    fanout = make_fanout(args.wire_format, args.keyframe_interval, args.subscribe_port, args.subscribe_ip,
+                         default_target=not args.no_default_target)
+    setup_logging(args.log_level.upper(), json_output=args.log_json)
+    if args.debug_sample > 0:
+        expression_sampler.every = args.debug_sample
+        expression_logger.setLevel(logging.DEBUG)
+    source = open_source(args.source, fps=args.fps, realtime=args.realtime, loop=args.loop)
+    
+    print(f"Unified CV Server Started. Streaming to {UDP_IP}:{UDP_PORT}...")
+    fanout.start()
+    
+    threaded_inference = ThreadedInference(
+        face_landmarker, hand_landmarker, parallel=PARALLEL_LANDMARKERS).start()
+    pipeline = build_pipeline(source, threaded_inference,
+                              schedules={} if args.no_schedule else MODEL_SCHEDULES,
+                              roi=args.detr_roi).start()
+
+    quit_event = threading.Event()
+    def speak():
+        logger.info("Speak command received!")
+        asl_classifier.speak_text(callback=speech_done) # Returns at once, synthesis runs on the I/O thread
+    def speech_done(status, path, text):
+        logger.info(f"Speech {status}: {path} ({text.strip()!r})")
+    control = ControlChannel({"speak": speak, "quit": quit_event.set,
+                              "keyframe": fanout.request_keyframe},
+                             udp_port=CONTROL_PORT, use_stdin=args.headless).start()
+    def on_key(key):
+        if key in KEY_COMMANDS:
+            control.dispatch(KEY_COMMANDS[key])
+
+    preview = None
+    if args.headless and args.preview_fps > 0:
+        preview = PreviewThread(pipeline, draw_overlay, fps=args.preview_fps, on_key=on_key).start()
+
+    while not pipeline.finished() and not quit_event.is_set():
+        task = pipeline.outputs.get(timeout=0.1)
+        if task is None:
+            continue
+
+        if LATENCY_REPORT_INTERVAL and task.frame_id % LATENCY_REPORT_INTERVAL == 0:
+            report_latency(pipeline, threaded_inference, task)
+
+        # Headless: no overlay and no GUI event loop on the hot path
+        if args.headless:
+            continue
 
         # Display
-        cv2.imshow('Unified CV Server', image)
-        key = cv2.waitKey(5) & 0xFF
-        if key == 27: # ESC
-            break
-        elif key == ord('s'): # Speak
-            print("Speak key pressed!")
-            asl_classifier.speak_text()
+        cv2.imshow('Unified CV Server', draw_overlay(task))
+        on_key(cv2.waitKey(1) & 0xFF)
             
-    cap.release()
-    cv2.destroyAllWindows()
+    if preview is not None:
+        preview.stop()
+    control.stop()
+    pipeline.stop()
+    fanout.stop()
+    threaded_inference.stop()
+    asl_classifier.close()
+    if trace_file is not None:
+        trace_file.close()
+    source.release()
+    if not args.headless:
+        cv2.destroyAllWindows()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,22 +1,65 @@
-import cv2
 import numpy as np
 import math
 import os
-import pickle
-import traceback
-import pyttsx3
 import time
-from keras.models import load_model
+from .landmark_classifier import LandmarkClassifier, landmark_features
+from .asl_rules import apply_rules
+from .asl_runtime import load_asl_cnn
+from .skeleton_render import CONNECTIONS, SkeletonCanvas, render_skeleton, skeleton_points
+from .audio_cache import AudioCache
+from .text_io import TextIOWorker
 try:
     import enchant
 except ImportError:
     enchant = None
 
+
+class SignerState:
+    """Text being spelled by one hand / user, with its own rate limit and character history."""
+
+    def __init__(self):
+        self.current_str = " "
+        self.prev_char = ""
+        self.count = -1
+        self.ten_prev_char = [" "] * 10
+        self.last_prediction_time = 0
+
+    def process_char(self, ch1):
+        """Updates the history with a new prediction; returns True if the text changed."""
+        changed = False
+        # Accumulate string logic
+        if ch1 == "next" and self.prev_char != "next":
+            # Append last stable char
+            char_to_add = self.ten_prev_char[(self.count - 2) % 10]
+            if char_to_add != "next":
+                if char_to_add == "Backspace":
+                    self.current_str = self.current_str[:-1]
+                else:
+                    self.current_str += char_to_add
+            changed = True
+
+        if ch1 == " " and self.prev_char != " ":
+             self.current_str += " "
+             changed = True
+
+        # Update history
+        self.prev_char = ch1
+        self.count += 1
+        self.ten_prev_char[self.count % 10] = ch1
+        return changed
+
+
 class ASLClassifier:
     def __init__(self, 
                  model_path_cnn, 
                  white_img_path, 
-                 output_dir=r"M:\CV\UnityExchange"):
+                 output_dir=r"M:\CV\UnityExchange",
+                 landmark_model_path=None,
+                 render_mode="canvas",
+                 cnn_runtime="auto",
+                 io_worker=None,
+                 speech_cache_mb=64,
+                 speech_warmup=()):
         
         self.output_dir = output_dir
         self.text_dir = os.path.join(output_dir, "Text")
@@ -27,17 +70,30 @@ class ASLClassifier:
         os.makedirs(self.audio_dir, exist_ok=True)
 
         # --- CNN Model Setup (New) ---
+        # Lean TFLite / ONNX export when cached next to the .h5 (see src/asl_runtime.py)
         self.model_cnn = None
+        self.cnn_runtime = None
         self.white_img_path = white_img_path
         try:
             if os.path.exists(model_path_cnn):
-                self.model_cnn = load_model(model_path_cnn)
-                print(f"ASL CNN Model loaded from {model_path_cnn}")
+                self.model_cnn, self.cnn_runtime = load_asl_cnn(model_path_cnn, cnn_runtime)
+                print(f"ASL CNN Model loaded from {model_path_cnn} ({self.cnn_runtime})")
             else:
                 print(f"ASL CNN Model not found at {model_path_cnn}")
         except Exception as e:
             print(f"Error loading ASL CNN model: {e}")
 
+        # --- Landmark Model Setup (optional, distilled from the CNN) ---
+        self.model_landmarks = None
+        if landmark_model_path:
+            try:
+                if os.path.exists(landmark_model_path):
+                    self.model_landmarks = LandmarkClassifier.load(landmark_model_path)
+                    print(f"ASL landmark model loaded from {landmark_model_path}")
+                else:
+                    print(f"ASL landmark model not found at {landmark_model_path}")
+            except Exception as e:
+                print(f"Error loading ASL landmark model: {e}")
         
         # --- Dictionary Setup ---
         self.d = None
@@ -48,469 +104,219 @@ class ASLClassifier:
                 print("Enchant dictionary not found.")
 
         # --- Text to Speech Setup ---
-        try:
-            self.engine = pyttsx3.init()
-            self.engine.setProperty("rate", 100)
-        except Exception as e:
-            print(f"TTS Init Error: {e}")
-            self.engine = None
+        # The TTS engine and the text / audio files live on a background thread,
+        # so saving and speaking never stall the frame loop (see src/text_io.py)
+        # Repeated phrases come from an LRU cache of synthesised audio (0 MB = off),
+        # kept next to speech.wav so hits can be hardlinked into place
+        if io_worker is None:
+            cache = AudioCache(os.path.join(self.audio_dir, "cache"), speech_cache_mb * 1024 * 1024) \
+                if speech_cache_mb else None
+            io_worker = TextIOWorker(cache=cache).start()
+        self.io = io_worker
+        self.io.warm_up(speech_warmup)
         
         # --- State Variables ---
-        self.current_str = " "
-        self.prev_char = ""
-        self.count = -1
-        self.ten_prev_char = [" "] * 10
-        self.last_prediction_time = 0
+        # One SignerState per hand / user (see predict_batch); None is the single-hand API's.
+        # current_str & co. refer to the primary signer (see predict_batch).
+        self.signers = {None: SignerState()}
+        self.primary = None
         self.prediction_interval = 0.1 # Predict every 100ms
+        self.batch_images = np.empty((0, 400, 400, 3), np.uint8)
         
-        # Skeleton connections (MediaPipe indices)
-        self.connections = [
-            (0,1), (1,2), (2,3), (3,4),
-            (5,6), (6,7), (7,8),
-            (9,10), (10,11), (11,12),
-            (13,14), (14,15), (15,16),
-            (17,18), (18,19), (19,20),
-            (5,9), (9,13), (13,17), (0,5), (0,17)
-        ]
+        # Skeleton rendering: "canvas" reuses one preallocated image (same pixels),
+        # "reference" is the original per-call allocation and Python loops
+        self.connections = CONNECTIONS
+        self.render_mode = render_mode
+        self.skeleton_canvas = SkeletonCanvas() if render_mode == "canvas" else None
         
         self.pts = [] # Current points storage
 
+    # --- Signer State ---
+    def signer(self, key=None):
+        state = self.signers.get(key)
+        if state is None:
+            state = self.signers[key] = SignerState()
+        return state
+
+    @property
+    def current_str(self):
+        return self.signer(self.primary).current_str
+
+    @current_str.setter
+    def current_str(self, value):
+        self.signer(self.primary).current_str = value
+
+    @property
+    def prev_char(self):
+        return self.signer(self.primary).prev_char
+
     # --- Helper Methods ---
     def distance(self, x, y):
         return math.sqrt(((x[0] - y[0]) ** 2) + ((x[1] - y[1]) ** 2))
 
     # --- Prediction Methods ---
 
+    def rate_limited(self, state=None):
+        state = state or self.signer()
+        if time.time() - state.last_prediction_time < self.prediction_interval:
+            return True
+        state.last_prediction_time = time.time()
+        return False
+
+    def skeleton_points(self, hand_landmarks, img_w, img_h):
+        """Landmarks -> 21 points on the CNN's 400x400 canvas (apply_rules reads these too)."""
+        if self.skeleton_canvas is not None:
+            return self.skeleton_canvas.points(hand_landmarks, img_w, img_h)
+        return skeleton_points(hand_landmarks, img_w, img_h)
+
+    def render_skeleton(self, adj_pts, out=None):
+        """The CNN input image (drawn into `out` if given). In "canvas" mode it is reused by the next call."""
+        if self.skeleton_canvas is not None:
+            return self.skeleton_canvas.render(adj_pts, out)
+        if out is None:
+            return render_skeleton(adj_pts)
+        out[...] = render_skeleton(adj_pts)
+        return out
+
+    def classify(self, prob, adj_pts, key=None):
+        """Top-2 label groups -> character via apply_rules, then string building."""
+        prob = np.array(prob, dtype='float32')
+        
+        # Logic from final_pred.py
+        ch1 = np.argmax(prob, axis=0)
+        prob[ch1] = 0
+        ch2 = np.argmax(prob, axis=0)
+        
+        # Use adj_pts for logic (plain ints: the rules index them a lot)
+        self.pts = adj_pts.tolist() if isinstance(adj_pts, np.ndarray) else adj_pts
+        
+        final_char = self.apply_rules(ch1, ch2)
+        
+        # Logic for string building
+        self.process_char(final_char, key)
+        
+        return final_char
+
+    def predict(self, hand_landmarks, img_w, img_h):
+        """Landmark model if one is loaded, else the skeleton CNN."""
+        if self.model_landmarks is not None:
+            return self.predict_landmarks(hand_landmarks, img_w, img_h)
+        return self.predict_cnn(hand_landmarks, img_w, img_h)
+
     def predict_cnn(self, hand_landmarks, img_w, img_h):
         """
         New CNN-based Prediction with Logic Rules
         """
         if self.model_cnn is None:
             return "Model Error"
+        self.primary = None # The single-hand API spells into the default signer
             
         # Rate limiting
-        if time.time() - self.last_prediction_time < self.prediction_interval:
-            return self.prev_char
-        self.last_prediction_time = time.time()
-
-        # Convert normalized landmarks to pixel coordinates
-        pts = []
-        x_vals = []
-        y_vals = []
-        for lm in hand_landmarks:
-            px = int(lm.x * img_w)
-            py = int(lm.y * img_h)
-            pts.append([px, py])
-            x_vals.append(px)
-            y_vals.append(py)
-
-        # Calculate Bounding Box
-        x_min, x_max = min(x_vals), max(x_vals)
-        y_min, y_max = min(y_vals), max(y_vals)
-        w = x_max - x_min
-        h = y_max - y_min
-        
-        # Add offset (simulating the crop offset from original code)
-        offset = 29
-        crop_w = w + 2 * offset
-        crop_h = h + 2 * offset
-        
-        # Setup White Image (400x400)
-        white = np.ones((400, 400, 3), np.uint8) * 255
-        
-        # Center the skeleton
-        os_x = ((400 - crop_w) // 2) - 15 
-        os_y = ((400 - crop_h) // 2) - 15
-        
-        crop_x = x_min - offset
-        crop_y = y_min - offset
-        
-        # Adjust points
-        adj_pts = []
-        for p in pts:
-            # Rel to crop
-            rel_x = p[0] - crop_x
-            rel_y = p[1] - crop_y
-            
-            # Rel to white image center
-            fin_x = rel_x + os_x
-            fin_y = rel_y + os_y
-            adj_pts.append([fin_x, fin_y])
-
-        # Draw Skeleton
-        for p1, p2 in self.connections:
-            cv2.line(white, tuple(adj_pts[p1]), tuple(adj_pts[p2]), (0, 255, 0), 3)
-        
-        for p in adj_pts:
-            cv2.circle(white, tuple(p), 2, (0, 0, 255), 1)
+        if self.rate_limited():
+            return self.signer().prev_char
+
+        adj_pts = self.skeleton_points(hand_landmarks, img_w, img_h)
 
         # Predict
         try:
+            white = self.render_skeleton(adj_pts)
             img_input = white.reshape(1, 400, 400, 3)
-            prob = np.array(self.model_cnn.predict(img_input, verbose=0)[0], dtype='float32')
-            
-            # Logic from final_pred.py
-            ch1 = np.argmax(prob, axis=0)
-            prob[ch1] = 0
-            ch2 = np.argmax(prob, axis=0)
-            
-            # Use adj_pts for logic
-            self.pts = adj_pts 
-            
-            final_char = self.apply_rules(ch1, ch2)
-            
-            # Logic for string building
-            self.process_char(final_char)
-            
-            return final_char
+            prob = self.model_cnn.predict(img_input, verbose=0)[0]
+            return self.classify(prob, adj_pts)
             
         except Exception as e:
             # print(f"Prediction logic error: {e}")
             return "Err"
 
-    def apply_rules(self, ch1, ch2):
-        # Huge block of rules from final_pred.py
-        pl = [ch1, ch2]
-        
-        # Mapping numeric class to logic group
-        # 0: Aemnst, 1: bdfikruvw, 2: c0, 3: gh, 4: l, 5: pqz, 6: x, 7: yj
-        
-        # condition for [Aemnst] (Class 0)
-        l = [[5, 2], [5, 3], [3, 5], [3, 6], [3, 0], [3, 2], [6, 4], [6, 1], [6, 2], [6, 6], [6, 7], [6, 0], [6, 5],
-             [4, 1], [1, 0], [1, 1], [6, 3], [1, 6], [5, 6], [5, 1], [4, 5], [1, 4], [1, 5], [2, 0], [2, 6], [4, 6],
-             [1, 0], [5, 7], [1, 6], [6, 1], [7, 6], [2, 5], [7, 1], [5, 4], [7, 0], [7, 5], [7, 2]]
-        if pl in l:
-            if (self.pts[6][1] < self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] < self.pts[20][1]):
-                ch1 = 0
-
-        # condition for [o][s]
-        l = [[2, 2], [2, 1]]
-        if pl in l:
-            if (self.pts[5][0] < self.pts[4][0]):
-                ch1 = 0
-
-        # condition for [c0][aemnst]
-        l = [[0, 0], [0, 6], [0, 2], [0, 5], [0, 1], [0, 7], [5, 2], [7, 6], [7, 1]]
-        if pl in l:
-            if (self.pts[0][0] > self.pts[8][0] and self.pts[0][0] > self.pts[4][0] and self.pts[0][0] > self.pts[12][0] and self.pts[0][0] > self.pts[16][0] and self.pts[0][0] > self.pts[20][0]) and self.pts[5][0] > self.pts[4][0]:
-                ch1 = 2
-
-        l = [[6, 0], [6, 6], [6, 2]]
-        if pl in l:
-            if self.distance(self.pts[8], self.pts[16]) < 52:
-                ch1 = 2
-
-        # condition for [gh][bdfikruvw]
-        l = [[1, 4], [1, 5], [1, 6], [1, 3], [1, 0]]
-        if pl in l:
-            if self.pts[6][1] > self.pts[8][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] < self.pts[20][1] and self.pts[0][0] < self.pts[8][0] and self.pts[0][0] < self.pts[12][0] and self.pts[0][0] < self.pts[16][0] and self.pts[0][0] < self.pts[20][0]:
-                ch1 = 3
-
-        # con for [gh][l]
-        l = [[4, 6], [4, 1], [4, 5], [4, 3], [4, 7]]
-        if pl in l:
-            if self.pts[4][0] > self.pts[0][0]:
-                ch1 = 3
-
-        # con for [gh][pqz]
-        l = [[5, 3], [5, 0], [5, 7], [5, 4], [5, 2], [5, 1], [5, 5]]
-        if pl in l:
-            if self.pts[2][1] + 15 < self.pts[16][1]:
-                ch1 = 3
-
-        # con for [l][x]
-        l = [[6, 4], [6, 1], [6, 2]]
-        if pl in l:
-            if self.distance(self.pts[4], self.pts[11]) > 55:
-                ch1 = 4
-
-        # con for [l][d]
-        l = [[1, 4], [1, 6], [1, 1]]
-        if pl in l:
-            if (self.distance(self.pts[4], self.pts[11]) > 50) and (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] < self.pts[20][1]):
-                ch1 = 4
-
-        # con for [l][gh]
-        l = [[3, 6], [3, 4]]
-        if pl in l:
-            if (self.pts[4][0] < self.pts[0][0]):
-                ch1 = 4
-
-        # con for [l][c0]
-        l = [[2, 2], [2, 5], [2, 4]]
-        if pl in l:
-            if (self.pts[1][0] < self.pts[12][0]):
-                ch1 = 4
-
-        # con for [gh][z]
-        l = [[3, 6], [3, 5], [3, 4]]
-        if pl in l:
-            if (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] < self.pts[20][1]) and self.pts[4][1] > self.pts[10][1]:
-                ch1 = 5
-
-        # con for [gh][pq]
-        l = [[3, 2], [3, 1], [3, 6]]
-        if pl in l:
-            if self.pts[4][1] + 17 > self.pts[8][1] and self.pts[4][1] + 17 > self.pts[12][1] and self.pts[4][1] + 17 > self.pts[16][1] and self.pts[4][1] + 17 > self.pts[20][1]:
-                ch1 = 5
-
-        # con for [l][pqz]
-        l = [[4, 4], [4, 5], [4, 2], [7, 5], [7, 6], [7, 0]]
-        if pl in l:
-            if self.pts[4][0] > self.pts[0][0]:
-                ch1 = 5
-
-        # con for [pqz][aemnst]
-        l = [[0, 2], [0, 6], [0, 1], [0, 5], [0, 0], [0, 7], [0, 4], [0, 3], [2, 7]]
-        if pl in l:
-            if self.pts[0][0] < self.pts[8][0] and self.pts[0][0] < self.pts[12][0] and self.pts[0][0] < self.pts[16][0] and self.pts[0][0] < self.pts[20][0]:
-                ch1 = 5
-
-        # con for [pqz][yj]
-        l = [[5, 7], [5, 2], [5, 6]]
-        if pl in l:
-            if self.pts[3][0] < self.pts[0][0]:
-                ch1 = 7
-
-        # con for [l][yj]
-        l = [[4, 6], [4, 2], [4, 4], [4, 1], [4, 5], [4, 7]]
-        if pl in l:
-            if self.pts[6][1] < self.pts[8][1]:
-                ch1 = 7
-
-        # con for [x][yj]
-        l = [[6, 7], [0, 7], [0, 1], [0, 0], [6, 4], [6, 6], [6, 5], [6, 1]]
-        if pl in l:
-            if self.pts[18][1] > self.pts[20][1]:
-                ch1 = 7
-
-        # condition for [x][aemnst]
-        l = [[0, 4], [0, 2], [0, 3], [0, 1], [0, 6]]
-        if pl in l:
-            if self.pts[5][0] > self.pts[16][0]:
-                ch1 = 6
-
-        # condition for [yj][x]
-        l = [[7, 2]]
-        if pl in l:
-            if self.pts[18][1] < self.pts[20][1] and self.pts[8][1] < self.pts[10][1]:
-                ch1 = 6
-
-        # condition for [c0][x]
-        l = [[2, 1], [2, 2], [2, 6], [2, 7], [2, 0]]
-        if pl in l:
-            if self.distance(self.pts[8], self.pts[16]) > 50:
-                ch1 = 6
-
-        # con for [l][x]
-        l = [[4, 6], [4, 2], [4, 1], [4, 4]]
-        if pl in l:
-            if self.distance(self.pts[4], self.pts[11]) < 60:
-                ch1 = 6
-
-        # con for [x][d]
-        l = [[1, 4], [1, 6], [1, 0], [1, 2]]
-        if pl in l:
-            if self.pts[5][0] - self.pts[4][0] - 15 > 0:
-                ch1 = 6
-
-        # con for [b][pqz]
-        l = [[5, 0], [5, 1], [5, 4], [5, 5], [5, 6], [6, 1], [7, 6], [0, 2], [7, 1], [7, 4], [6, 6], [7, 2], [5, 0], [6, 3], [6, 4], [7, 5], [7, 2]]
-        if pl in l:
-            if (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] > self.pts[16][1] and self.pts[18][1] > self.pts[20][1]):
-                ch1 = 1
-
-        # con for [f][pqz]
-        l = [[6, 1], [6, 0], [0, 3], [6, 4], [2, 2], [0, 6], [6, 2], [7, 6], [4, 6], [4, 1], [4, 2], [0, 2], [7, 1], [7, 4], [6, 6], [7, 2], [7, 5], [7, 2]]
-        if pl in l:
-            if (self.pts[6][1] < self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] > self.pts[16][1] and self.pts[18][1] > self.pts[20][1]):
-                ch1 = 1
-
-        l = [[6, 1], [6, 0], [4, 2], [4, 1], [4, 6], [4, 4]]
-        if pl in l:
-            if (self.pts[10][1] > self.pts[12][1] and self.pts[14][1] > self.pts[16][1] and self.pts[18][1] > self.pts[20][1]):
-                ch1 = 1
-
-        # con for [d][pqz]
-        l = [[5, 0], [3, 4], [3, 0], [3, 1], [3, 5], [5, 5], [5, 4], [5, 1], [7, 6]]
-        if pl in l:
-            if ((self.pts[6][1] > self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] < self.pts[20][1]) and (self.pts[2][0] < self.pts[0][0]) and self.pts[4][1] > self.pts[14][1]):
-                ch1 = 1
-
-        l = [[4, 1], [4, 2], [4, 4]]
-        if pl in l:
-            if (self.distance(self.pts[4], self.pts[11]) < 50) and (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] < self.pts[20][1]):
-                ch1 = 1
-
-        l = [[3, 4], [3, 0], [3, 1], [3, 5], [3, 6]]
-        if pl in l:
-            if ((self.pts[6][1] > self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] < self.pts[20][1]) and (self.pts[2][0] < self.pts[0][0]) and self.pts[14][1] < self.pts[4][1]):
-                ch1 = 1
-
-        l = [[6, 6], [6, 4], [6, 1], [6, 2]]
-        if pl in l:
-            if self.pts[5][0] - self.pts[4][0] - 15 < 0:
-                ch1 = 1
-
-        # con for [i][pqz]
-        l = [[5, 4], [5, 5], [5, 1], [0, 3], [0, 7], [5, 0], [0, 2], [6, 2], [7, 5], [7, 1], [7, 6], [7, 7]]
-        if pl in l:
-            if ((self.pts[6][1] < self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] > self.pts[20][1])):
-                ch1 = 1
-
-        # con for [yj][bfdi]
-        l = [[1, 5], [1, 7], [1, 1], [1, 6], [1, 3], [1, 0]]
-        if pl in l:
-            if (self.pts[4][0] < self.pts[5][0] + 15) and ((self.pts[6][1] < self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] > self.pts[20][1])):
-                ch1 = 7
-
-        # con for [uvr]
-        l = [[5, 5], [5, 0], [5, 4], [5, 1], [4, 6], [4, 1], [7, 6], [3, 0], [3, 5]]
-        if pl in l:
-            if ((self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] < self.pts[20][1])) and self.pts[4][1] > self.pts[14][1]:
-                ch1 = 1
-
-        # con for [w]
-        fg = 13
-        l = [[3, 5], [3, 0], [3, 6], [5, 1], [4, 1], [2, 0], [5, 0], [5, 5]]
-        if pl in l:
-            if not (self.pts[0][0] + fg < self.pts[8][0] and self.pts[0][0] + fg < self.pts[12][0] and self.pts[0][0] + fg < self.pts[16][0] and self.pts[0][0] + fg < self.pts[20][0]) and not (self.pts[0][0] > self.pts[8][0] and self.pts[0][0] > self.pts[12][0] and self.pts[0][0] > self.pts[16][0] and self.pts[0][0] > self.pts[20][0]) and self.distance(self.pts[4], self.pts[11]) < 50:
-                ch1 = 1
-
-        # con for [w]
-        l = [[5, 0], [5, 5], [0, 1]]
-        if pl in l:
-            if self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] > self.pts[16][1]:
-                ch1 = 1
-
-        # Subgroups
-        if ch1 == 0:
-            ch1 = 'S'
-            if self.pts[4][0] < self.pts[6][0] and self.pts[4][0] < self.pts[10][0] and self.pts[4][0] < self.pts[14][0] and self.pts[4][0] < self.pts[18][0]:
-                ch1 = 'A'
-            if self.pts[4][0] > self.pts[6][0] and self.pts[4][0] < self.pts[10][0] and self.pts[4][0] < self.pts[14][0] and self.pts[4][0] < self.pts[18][0] and self.pts[4][1] < self.pts[14][1] and self.pts[4][1] < self.pts[18][1]:
-                ch1 = 'T'
-            if self.pts[4][1] > self.pts[8][1] and self.pts[4][1] > self.pts[12][1] and self.pts[4][1] > self.pts[16][1] and self.pts[4][1] > self.pts[20][1]:
-                ch1 = 'E'
-            if self.pts[4][0] > self.pts[6][0] and self.pts[4][0] > self.pts[10][0] and self.pts[4][0] > self.pts[14][0] and self.pts[4][1] < self.pts[18][1]:
-                ch1 = 'M'
-            if self.pts[4][0] > self.pts[6][0] and self.pts[4][0] > self.pts[10][0] and self.pts[4][1] < self.pts[18][1] and self.pts[4][1] < self.pts[14][1]:
-                ch1 = 'N'
-
-        if ch1 == 2:
-            if self.distance(self.pts[12], self.pts[4]) > 42:
-                ch1 = 'C'
-            else:
-                ch1 = 'O'
-
-        if ch1 == 3:
-            if (self.distance(self.pts[8], self.pts[12])) > 72:
-                ch1 = 'G'
-            else:
-                ch1 = 'H'
-
-        if ch1 == 7:
-            if self.distance(self.pts[8], self.pts[4]) > 42:
-                ch1 = 'Y'
-            else:
-                ch1 = 'J'
-
-        if ch1 == 4:
-            ch1 = 'L'
+    def predict_landmarks(self, hand_landmarks, img_w, img_h):
+        """
+        Same label groups and rules as predict_cnn, but the groups come from the
+        landmark MLP instead of a rendered 400x400 skeleton image.
+        """
+        if self.model_landmarks is None:
+            return "Model Error"
+        self.primary = None
 
-        if ch1 == 6:
-            ch1 = 'X'
+        if self.rate_limited():
+            return self.signer().prev_char
 
-        if ch1 == 5:
-            if self.pts[4][0] > self.pts[12][0] and self.pts[4][0] > self.pts[16][0] and self.pts[4][0] > self.pts[20][0]:
-                if self.pts[8][1] < self.pts[5][1]:
-                    ch1 = 'Z'
-                else:
-                    ch1 = 'Q'
-            else:
-                ch1 = 'P'
-
-        if ch1 == 1:
-            if (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] > self.pts[16][1] and self.pts[18][1] > self.pts[20][1]):
-                ch1 = 'B'
-            if (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] < self.pts[20][1]):
-                ch1 = 'D'
-            if (self.pts[6][1] < self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] > self.pts[16][1] and self.pts[18][1] > self.pts[20][1]):
-                ch1 = 'F'
-            if (self.pts[6][1] < self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] > self.pts[20][1]):
-                ch1 = 'I'
-            if (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] > self.pts[16][1] and self.pts[18][1] < self.pts[20][1]):
-                ch1 = 'W'
-            if (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] < self.pts[20][1]) and self.pts[4][1] < self.pts[9][1]:
-                ch1 = 'K'
-            if ((self.distance(self.pts[8], self.pts[12]) - self.distance(self.pts[6], self.pts[10])) < 8) and (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] < self.pts[20][1]):
-                ch1 = 'U'
-            if ((self.distance(self.pts[8], self.pts[12]) - self.distance(self.pts[6], self.pts[10])) >= 8) and (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] < self.pts[20][1]) and (self.pts[4][1] > self.pts[9][1]):
-                ch1 = 'V'
-            if (self.pts[8][0] > self.pts[12][0]) and (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] < self.pts[20][1]):
-                ch1 = 'R'
-
-        if ch1 == 1 or ch1 =='E' or ch1 =='S' or ch1 =='X' or ch1 =='Y' or ch1 =='B':
-             if (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] < self.pts[12][1] and self.pts[14][1] < self.pts[16][1] and self.pts[18][1] > self.pts[20][1]):
-                ch1 = " "
-
-        if ch1 == 'E' or ch1=='Y' or ch1=='B':
-             if (self.pts[4][0] < self.pts[5][0]) and (self.pts[6][1] > self.pts[8][1] and self.pts[10][1] > self.pts[12][1] and self.pts[14][1] > self.pts[16][1] and self.pts[18][1] > self.pts[20][1]):
-                ch1 = "next"
-
-        if ch1 == 'Next' or 'B' or 'C' or 'H' or 'F' or 'X':
-            if (self.pts[0][0] > self.pts[8][0] and self.pts[0][0] > self.pts[12][0] and self.pts[0][0] > self.pts[16][0] and self.pts[0][0] > self.pts[20][0]) and (self.pts[4][1] < self.pts[8][1] and self.pts[4][1] < self.pts[12][1] and self.pts[4][1] < self.pts[16][1] and self.pts[4][1] < self.pts[20][1]) and (self.pts[4][1] < self.pts[6][1] and self.pts[4][1] < self.pts[10][1] and self.pts[4][1] < self.pts[14][1] and self.pts[4][1] < self.pts[18][1]):
-                ch1 = 'Backspace'
-
-        return ch1
-
-    def process_char(self, ch1):
-        # Accumulate string logic
-        if ch1 == "next" and self.prev_char != "next":
-            # Append last stable char
-            char_to_add = self.ten_prev_char[(self.count - 2) % 10]
-            if char_to_add != "next":
-                if char_to_add == "Backspace":
-                    self.current_str = self.current_str[:-1]
-                else:
-                    self.current_str += char_to_add
-            self.save_text() # Save on change
+        adj_pts = self.skeleton_points(hand_landmarks, img_w, img_h)
+        try:
+            prob = self.model_landmarks.predict_proba(landmark_features(adj_pts))[0]
+            return self.classify(prob, adj_pts)
+        except Exception as e:
+            return "Err"
 
-        if ch1 == " " and self.prev_char != " ":
-             self.current_str += " "
-             self.save_text()
+    def predict_batch(self, hands):
+        """
+        Several hands at once: both hands of a signer, several users or camera streams.
+        `hands` is a list of (key, hand_landmarks, img_w, img_h); every key (e.g. "Left",
+        or "cam1:Right") has its own text and rate limit. The hands that are due are
+        prepared together and classified in one model call. Returns one character per
+        hand. The primary signer (current_str, output.txt, speak_text) stays the same
+        while its key is in the batch, whatever the hand order; otherwise the first
+        hand's signer takes over.
+        """
+        if not hands:
+            return []
+        if self.model_landmarks is None and self.model_cnn is None:
+            return ["Model Error"] * len(hands)
+        if self.primary not in [key for key, _, _, _ in hands]:
+            self.primary = hands[0][0]
+
+        results, due = [], []
+        for key, hand_landmarks, img_w, img_h in hands:
+            state = self.signer(key)
+            if self.rate_limited(state):
+                results.append(state.prev_char)
+                continue
+            due.append((len(results), key, self.skeleton_points(hand_landmarks, img_w, img_h)))
+            results.append(None)
+        if not due:
+            return results
 
-        # Update history
-        self.prev_char = ch1
-        self.count += 1
-        self.ten_prev_char[self.count % 10] = ch1
-        
-    def save_text(self):
         try:
-            with open(os.path.join(self.text_dir, "output.txt"), "w") as f:
-                f.write(self.current_str)
+            if self.model_landmarks is not None:
+                probs = self.model_landmarks.predict_proba(np.concatenate([landmark_features(p) for _, _, p in due]))
+            else:
+                if len(self.batch_images) < len(due):
+                    self.batch_images = np.empty((len(due), 400, 400, 3), np.uint8)
+                images = self.batch_images[:len(due)]
+                for image, (_, _, adj_pts) in zip(images, due):
+                    self.render_skeleton(adj_pts, out=image)
+                probs = self.model_cnn.predict(images, verbose=0)
+            for (i, key, adj_pts), prob in zip(due, probs):
+                results[i] = self.classify(prob, adj_pts, key)
         except Exception as e:
-            print(f"Error saving text: {e}")
+            for i, _, _ in due:
+                results[i] = "Err"
+        return results
 
-    def speak_text(self):
-        # Speak the current word/string and save to audio
+    def apply_rules(self, ch1, ch2):
+        # Rules from final_pred.py, compiled into tables (see src/asl_rules.py)
+        return apply_rules(self.pts, ch1, ch2)
+
+    def process_char(self, ch1, key=None):
+        if self.signer(key).process_char(ch1):
+            self.save_text(key) # Save on change
+
+    def save_text(self, key=None):
+        """output.txt has the primary signer's text; other signers also get output_<key>.txt. Non-blocking."""
+        text = self.signer(key).current_str
+        if key == self.primary:
+            self.io.write_text(os.path.join(self.text_dir, "output.txt"), text)
+        if key is not None:
+            self.io.write_text(os.path.join(self.text_dir, f"output_{key}.txt"), text)
+
+    def speak_text(self, callback=None):
+        """
+        Queues the current string for speech.wav (Unity picks it up) and returns at once;
+        callback(status, path, text) runs on the I/O thread once the file is in place.
+        """
         if not self.current_str.strip():
             return
-            
-        try:
-            # Speak (optional to uncomment, blocking)
-            # if self.engine:
-            #     self.engine.say(self.current_str)
-            #     self.engine.runAndWait()
-            
-            # Save to file (Unity can pick this up)
-            out_path = os.path.join(self.audio_dir, "speech.wav")
-            if os.path.exists(out_path):
-                os.remove(out_path)
-            
-            if self.engine:
-                self.engine.save_to_file(self.current_str, out_path)
-                self.engine.runAndWait()
-                print(f"Audio saved to {out_path}")
-        except Exception as e:
-            print(f"Audio error: {e}")
\ No newline at end of file
+        self.io.speak(self.current_str, os.path.join(self.audio_dir, "speech.wav"), callback)
+
+    def close(self):
+        """Writes out whatever is still queued."""
+        self.io.stop()
@@ -0,0 +1,507 @@
+import math
+
+# Label groups of the skeleton CNN:
+# 0: Aemnst, 1: bdfikruvw, 2: c0, 3: gh, 4: l, 5: pqz, 6: x, 7: yj
+GROUPS = 8
+
+
+def distance(x, y):
+    return math.sqrt(((x[0] - y[0]) ** 2) + ((x[1] - y[1]) ** 2))
+
+
+class HandFeatures:
+    """
+    The comparisons the rules keep repeating, evaluated once per hand.
+    Fingers are index, middle, ring, pinky; a finger is `up` when its tip is
+    above its PIP joint and `down` when below (both False when level).
+    `pts` are the 21 skeleton points (canvas pixels, y pointing down).
+    """
+
+    __slots__ = ("p", "up", "down", "fist", "open", "index_only", "two_up", "pinky_only",
+                 "wrist_right", "wrist_left", "d_8_16", "d_4_11", "d_4_12", "d_8_12", "d_4_8", "d_6_10")
+
+    def __init__(self, pts):
+        p = self.p = pts
+        self.up = [p[j][1] > p[j + 2][1] for j in (6, 10, 14, 18)]
+        self.down = [p[j][1] < p[j + 2][1] for j in (6, 10, 14, 18)]
+        up, down = self.up, self.down
+        self.fist = down[0] and down[1] and down[2] and down[3]
+        self.open = up[0] and up[1] and up[2] and up[3]
+        self.index_only = up[0] and down[1] and down[2] and down[3]
+        self.two_up = up[0] and up[1] and down[2] and down[3]
+        self.pinky_only = down[0] and down[1] and down[2] and up[3]
+        tips_x = (p[8][0], p[12][0], p[16][0], p[20][0])
+        self.wrist_right = p[0][0] > max(tips_x)  # Wrist right of all fingertips
+        self.wrist_left = p[0][0] < min(tips_x)
+        self.d_8_16 = distance(p[8], p[16])
+        self.d_4_11 = distance(p[4], p[11])
+        self.d_4_12 = distance(p[4], p[12])
+        self.d_8_12 = distance(p[8], p[12])
+        self.d_4_8 = distance(p[4], p[8])
+        self.d_6_10 = distance(p[6], p[10])
+
+
+def _pairs(*pairs):
+    return frozenset(pairs)
+
+
+# Group corrections, in the order of the original if-chain:
+# (top-2 CNN groups, condition, corrected group). Every rule only depends on
+# the hand, so the last matching rule for a (ch1, ch2) pair decides.
+GROUP_RULES = [
+    # [Aemnst]
+    (_pairs((5, 2), (5, 3), (3, 5), (3, 6), (3, 0), (3, 2), (6, 4), (6, 1), (6, 2), (6, 6), (6, 7), (6, 0), (6, 5),
+            (4, 1), (1, 0), (1, 1), (6, 3), (1, 6), (5, 6), (5, 1), (4, 5), (1, 4), (1, 5), (2, 0), (2, 6), (4, 6),
+            (5, 7), (7, 6), (2, 5), (7, 1), (5, 4), (7, 0), (7, 5), (7, 2)),
+     lambda f: f.fist, 0),
+    # [o][s]
+    (_pairs((2, 2), (2, 1)), lambda f: f.p[5][0] < f.p[4][0], 0),
+    # [c0][aemnst]
+    (_pairs((0, 0), (0, 6), (0, 2), (0, 5), (0, 1), (0, 7), (5, 2), (7, 6), (7, 1)),
+     lambda f: f.wrist_right and f.p[0][0] > f.p[4][0] and f.p[5][0] > f.p[4][0], 2),
+    (_pairs((6, 0), (6, 6), (6, 2)), lambda f: f.d_8_16 < 52, 2),
+    # [gh][bdfikruvw]
+    (_pairs((1, 4), (1, 5), (1, 6), (1, 3), (1, 0)),
+     lambda f: f.up[0] and f.down[2] and f.down[3] and f.wrist_left, 3),
+    # [gh][l]
+    (_pairs((4, 6), (4, 1), (4, 5), (4, 3), (4, 7)), lambda f: f.p[4][0] > f.p[0][0], 3),
+    # [gh][pqz]
+    (_pairs((5, 3), (5, 0), (5, 7), (5, 4), (5, 2), (5, 1), (5, 5)), lambda f: f.p[2][1] + 15 < f.p[16][1], 3),
+    # [l][x]
+    (_pairs((6, 4), (6, 1), (6, 2)), lambda f: f.d_4_11 > 55, 4),
+    # [l][d]
+    (_pairs((1, 4), (1, 6), (1, 1)), lambda f: f.d_4_11 > 50 and f.index_only, 4),
+    # [l][gh]
+    (_pairs((3, 6), (3, 4)), lambda f: f.p[4][0] < f.p[0][0], 4),
+    # [l][c0]
+    (_pairs((2, 2), (2, 5), (2, 4)), lambda f: f.p[1][0] < f.p[12][0], 4),
+    # [gh][z]
+    (_pairs((3, 6), (3, 5), (3, 4)), lambda f: f.index_only and f.p[4][1] > f.p[10][1], 5),
+    # [gh][pq]
+    (_pairs((3, 2), (3, 1), (3, 6)),
+     lambda f: f.p[4][1] + 17 > max(f.p[8][1], f.p[12][1], f.p[16][1], f.p[20][1]), 5),
+    # [l][pqz]
+    (_pairs((4, 4), (4, 5), (4, 2), (7, 5), (7, 6), (7, 0)), lambda f: f.p[4][0] > f.p[0][0], 5),
+    # [pqz][aemnst]
+    (_pairs((0, 2), (0, 6), (0, 1), (0, 5), (0, 0), (0, 7), (0, 4), (0, 3), (2, 7)), lambda f: f.wrist_left, 5),
+    # [pqz][yj]
+    (_pairs((5, 7), (5, 2), (5, 6)), lambda f: f.p[3][0] < f.p[0][0], 7),
+    # [l][yj]
+    (_pairs((4, 6), (4, 2), (4, 4), (4, 1), (4, 5), (4, 7)), lambda f: f.down[0], 7),
+    # [x][yj]
+    (_pairs((6, 7), (0, 7), (0, 1), (0, 0), (6, 4), (6, 6), (6, 5), (6, 1)), lambda f: f.up[3], 7),
+    # [x][aemnst]
+    (_pairs((0, 4), (0, 2), (0, 3), (0, 1), (0, 6)), lambda f: f.p[5][0] > f.p[16][0], 6),
+    # [yj][x]
+    (_pairs((7, 2),), lambda f: f.down[3] and f.p[8][1] < f.p[10][1], 6),
+    # [c0][x]
+    (_pairs((2, 1), (2, 2), (2, 6), (2, 7), (2, 0)), lambda f: f.d_8_16 > 50, 6),
+    # [l][x]
+    (_pairs((4, 6), (4, 2), (4, 1), (4, 4)), lambda f: f.d_4_11 < 60, 6),
+    # [x][d]
+    (_pairs((1, 4), (1, 6), (1, 0), (1, 2)), lambda f: f.p[5][0] - f.p[4][0] - 15 > 0, 6),
+    # [b][pqz]
+    (_pairs((5, 0), (5, 1), (5, 4), (5, 5), (5, 6), (6, 1), (7, 6), (0, 2), (7, 1), (7, 4), (6, 6), (7, 2),
+            (6, 3), (6, 4), (7, 5)),
+     lambda f: f.open, 1),
+    # [f][pqz]
+    (_pairs((6, 1), (6, 0), (0, 3), (6, 4), (2, 2), (0, 6), (6, 2), (7, 6), (4, 6), (4, 1), (4, 2), (0, 2),
+            (7, 1), (7, 4), (6, 6), (7, 2), (7, 5)),
+     lambda f: f.down[0] and f.up[1] and f.up[2] and f.up[3], 1),
+    (_pairs((6, 1), (6, 0), (4, 2), (4, 1), (4, 6), (4, 4)), lambda f: f.up[1] and f.up[2] and f.up[3], 1),
+    # [d][pqz]
+    (_pairs((5, 0), (3, 4), (3, 0), (3, 1), (3, 5), (5, 5), (5, 4), (5, 1), (7, 6)),
+     lambda f: f.index_only and f.p[2][0] < f.p[0][0] and f.p[4][1] > f.p[14][1], 1),
+    (_pairs((4, 1), (4, 2), (4, 4)), lambda f: f.d_4_11 < 50 and f.index_only, 1),
+    (_pairs((3, 4), (3, 0), (3, 1), (3, 5), (3, 6)),
+     lambda f: f.index_only and f.p[2][0] < f.p[0][0] and f.p[14][1] < f.p[4][1], 1),
+    (_pairs((6, 6), (6, 4), (6, 1), (6, 2)), lambda f: f.p[5][0] - f.p[4][0] - 15 < 0, 1),
+    # [i][pqz]
+    (_pairs((5, 4), (5, 5), (5, 1), (0, 3), (0, 7), (5, 0), (0, 2), (6, 2), (7, 5), (7, 1), (7, 6), (7, 7)),
+     lambda f: f.pinky_only, 1),
+    # [yj][bfdi]
+    (_pairs((1, 5), (1, 7), (1, 1), (1, 6), (1, 3), (1, 0)),
+     lambda f: f.p[4][0] < f.p[5][0] + 15 and f.pinky_only, 7),
+    # [uvr]
+    (_pairs((5, 5), (5, 0), (5, 4), (5, 1), (4, 6), (4, 1), (7, 6), (3, 0), (3, 5)),
+     lambda f: f.two_up and f.p[4][1] > f.p[14][1], 1),
+    # [w]
+    (_pairs((3, 5), (3, 0), (3, 6), (5, 1), (4, 1), (2, 0), (5, 0), (5, 5)),
+     lambda f: not f.p[0][0] + 13 < min(f.p[8][0], f.p[12][0], f.p[16][0], f.p[20][0])
+     and not f.wrist_right and f.d_4_11 < 50, 1),
+    (_pairs((5, 0), (5, 5), (0, 1)), lambda f: f.up[0] and f.up[1] and f.up[2], 1),
+]
+
+# DISPATCH[ch1][ch2]: the group rules that apply to that pair, last one first
+DISPATCH = [[tuple((condition, group) for pairs, condition, group in reversed(GROUP_RULES) if (ch1, ch2) in pairs)
+             for ch2 in range(GROUPS)] for ch1 in range(GROUPS)]
+
+# Letters within each group: (default, [(letter, condition), ...]); the last
+# matching letter wins, None keeps the group number.
+SUBGROUPS = {
+    0: ("S", [
+        ("A", lambda f: f.p[4][0] < min(f.p[6][0], f.p[10][0], f.p[14][0], f.p[18][0])),
+        ("T", lambda f: f.p[6][0] < f.p[4][0] < min(f.p[10][0], f.p[14][0], f.p[18][0])
+         and f.p[4][1] < min(f.p[14][1], f.p[18][1])),
+        ("E", lambda f: f.p[4][1] > max(f.p[8][1], f.p[12][1], f.p[16][1], f.p[20][1])),
+        ("M", lambda f: f.p[4][0] > max(f.p[6][0], f.p[10][0], f.p[14][0]) and f.p[4][1] < f.p[18][1]),
+        ("N", lambda f: f.p[4][0] > max(f.p[6][0], f.p[10][0]) and f.p[4][1] < min(f.p[18][1], f.p[14][1])),
+    ]),
+    1: (None, [
+        ("B", lambda f: f.open),
+        ("D", lambda f: f.index_only),
+        ("F", lambda f: f.down[0] and f.up[1] and f.up[2] and f.up[3]),
+        ("I", lambda f: f.pinky_only),
+        ("W", lambda f: f.up[0] and f.up[1] and f.up[2] and f.down[3]),
+        ("K", lambda f: f.two_up and f.p[4][1] < f.p[9][1]),
+        ("U", lambda f: f.d_8_12 - f.d_6_10 < 8 and f.two_up),
+        ("V", lambda f: f.d_8_12 - f.d_6_10 >= 8 and f.two_up and f.p[4][1] > f.p[9][1]),
+        ("R", lambda f: f.p[8][0] > f.p[12][0] and f.two_up),
+    ]),
+    2: ("O", [("C", lambda f: f.d_4_12 > 42)]),
+    3: ("H", [("G", lambda f: f.d_8_12 > 72)]),
+    4: ("L", []),
+    5: ("P", [
+        ("Q", lambda f: f.p[4][0] > max(f.p[12][0], f.p[16][0], f.p[20][0])),
+        ("Z", lambda f: f.p[4][0] > max(f.p[12][0], f.p[16][0], f.p[20][0]) and f.p[8][1] < f.p[5][1]),
+    ]),
+    6: ("X", []),
+    7: ("J", [("Y", lambda f: f.d_4_8 > 42)]),
+}
+for _default, _letters in SUBGROUPS.values():
+    _letters.reverse()  # Evaluate last-wins lists from the end
+
+
+def apply_rules(pts, ch1, ch2):
+    """
+    Top-2 CNN label groups + skeleton points -> character (or " ", "next",
+    "Backspace"; the group number when no group-1 letter matches).
+    Table-driven equivalent of apply_rules_reference.
+    """
+    f = HandFeatures(pts)
+    for condition, group in DISPATCH[ch1][ch2]:
+        if condition(f):
+            ch1 = group
+            break
+
+    default, letters = SUBGROUPS[int(ch1)]
+    for letter, condition in letters:
+        if condition(f):
+            ch1 = letter
+            break
+    else:
+        if default is not None:
+            ch1 = default
+
+    if ch1 in (1, 'E', 'S', 'X', 'Y', 'B') and f.up[0] and f.down[1] and f.down[2] and f.up[3]:
+        ch1 = " "
+
+    if ch1 in ('E', 'Y', 'B') and f.p[4][0] < f.p[5][0] and f.open:
+        ch1 = "next"
+
+    p = f.p
+    if ch1 in ('next', 'B', 'C', 'H', 'F', 'X') and f.wrist_right \
+            and p[4][1] < min(p[8][1], p[12][1], p[16][1], p[20][1]) \
+            and p[4][1] < min(p[6][1], p[10][1], p[14][1], p[18][1]):
+        ch1 = 'Backspace'
+
+    return ch1
+
+
+def apply_rules_reference(pts, ch1, ch2):
+    """The original if-chain from ASLClassifier, kept to check apply_rules against."""
+    # Huge block of rules from final_pred.py
+    pl = [ch1, ch2]
+
+    # Mapping numeric class to logic group
+    # 0: Aemnst, 1: bdfikruvw, 2: c0, 3: gh, 4: l, 5: pqz, 6: x, 7: yj
+
+    # condition for [Aemnst] (Class 0)
+    l = [[5, 2], [5, 3], [3, 5], [3, 6], [3, 0], [3, 2], [6, 4], [6, 1], [6, 2], [6, 6], [6, 7], [6, 0], [6, 5],
+         [4, 1], [1, 0], [1, 1], [6, 3], [1, 6], [5, 6], [5, 1], [4, 5], [1, 4], [1, 5], [2, 0], [2, 6], [4, 6],
+         [1, 0], [5, 7], [1, 6], [6, 1], [7, 6], [2, 5], [7, 1], [5, 4], [7, 0], [7, 5], [7, 2]]
+    if pl in l:
+        if (pts[6][1] < pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][1]):
+            ch1 = 0
+
+    # condition for [o][s]
+    l = [[2, 2], [2, 1]]
+    if pl in l:
+        if (pts[5][0] < pts[4][0]):
+            ch1 = 0
+
+    # condition for [c0][aemnst]
+    l = [[0, 0], [0, 6], [0, 2], [0, 5], [0, 1], [0, 7], [5, 2], [7, 6], [7, 1]]
+    if pl in l:
+        if (pts[0][0] > pts[8][0] and pts[0][0] > pts[4][0] and pts[0][0] > pts[12][0] and pts[0][0] > pts[16][0] and pts[0][0] > pts[20][0]) and pts[5][0] > pts[4][0]:
+            ch1 = 2
+
+    l = [[6, 0], [6, 6], [6, 2]]
+    if pl in l:
+        if distance(pts[8], pts[16]) < 52:
+            ch1 = 2
+
+    # condition for [gh][bdfikruvw]
+    l = [[1, 4], [1, 5], [1, 6], [1, 3], [1, 0]]
+    if pl in l:
+        if pts[6][1] > pts[8][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][1] and pts[0][0] < pts[8][0] and pts[0][0] < pts[12][0] and pts[0][0] < pts[16][0] and pts[0][0] < pts[20][0]:
+            ch1 = 3
+
+    # con for [gh][l]
+    l = [[4, 6], [4, 1], [4, 5], [4, 3], [4, 7]]
+    if pl in l:
+        if pts[4][0] > pts[0][0]:
+            ch1 = 3
+
+    # con for [gh][pqz]
+    l = [[5, 3], [5, 0], [5, 7], [5, 4], [5, 2], [5, 1], [5, 5]]
+    if pl in l:
+        if pts[2][1] + 15 < pts[16][1]:
+            ch1 = 3
+
+    # con for [l][x]
+    l = [[6, 4], [6, 1], [6, 2]]
+    if pl in l:
+        if distance(pts[4], pts[11]) > 55:
+            ch1 = 4
+
+    # con for [l][d]
+    l = [[1, 4], [1, 6], [1, 1]]
+    if pl in l:
+        if (distance(pts[4], pts[11]) > 50) and (pts[6][1] > pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][1]):
+            ch1 = 4
+
+    # con for [l][gh]
+    l = [[3, 6], [3, 4]]
+    if pl in l:
+        if (pts[4][0] < pts[0][0]):
+            ch1 = 4
+
+    # con for [l][c0]
+    l = [[2, 2], [2, 5], [2, 4]]
+    if pl in l:
+        if (pts[1][0] < pts[12][0]):
+            ch1 = 4
+
+    # con for [gh][z]
+    l = [[3, 6], [3, 5], [3, 4]]
+    if pl in l:
+        if (pts[6][1] > pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][1]) and pts[4][1] > pts[10][1]:
+            ch1 = 5
+
+    # con for [gh][pq]
+    l = [[3, 2], [3, 1], [3, 6]]
+    if pl in l:
+        if pts[4][1] + 17 > pts[8][1] and pts[4][1] + 17 > pts[12][1] and pts[4][1] + 17 > pts[16][1] and pts[4][1] + 17 > pts[20][1]:
+            ch1 = 5
+
+    # con for [l][pqz]
+    l = [[4, 4], [4, 5], [4, 2], [7, 5], [7, 6], [7, 0]]
+    if pl in l:
+        if pts[4][0] > pts[0][0]:
+            ch1 = 5
+
+    # con for [pqz][aemnst]
+    l = [[0, 2], [0, 6], [0, 1], [0, 5], [0, 0], [0, 7], [0, 4], [0, 3], [2, 7]]
+    if pl in l:
+        if pts[0][0] < pts[8][0] and pts[0][0] < pts[12][0] and pts[0][0] < pts[16][0] and pts[0][0] < pts[20][0]:
+            ch1 = 5
+
+    # con for [pqz][yj]
+    l = [[5, 7], [5, 2], [5, 6]]
+    if pl in l:
+        if pts[3][0] < pts[0][0]:
+            ch1 = 7
+
+    # con for [l][yj]
+    l = [[4, 6], [4, 2], [4, 4], [4, 1], [4, 5], [4, 7]]
+    if pl in l:
+        if pts[6][1] < pts[8][1]:
+            ch1 = 7
+
+    # con for [x][yj]
+    l = [[6, 7], [0, 7], [0, 1], [0, 0], [6, 4], [6, 6], [6, 5], [6, 1]]
+    if pl in l:
+        if pts[18][1] > pts[20][1]:
+            ch1 = 7
+
+    # condition for [x][aemnst]
+    l = [[0, 4], [0, 2], [0, 3], [0, 1], [0, 6]]
+    if pl in l:
+        if pts[5][0] > pts[16][0]:
+            ch1 = 6
+
+    # condition for [yj][x]
+    l = [[7, 2]]
+    if pl in l:
+        if pts[18][1] < pts[20][1] and pts[8][1] < pts[10][1]:
+            ch1 = 6
+
+    # condition for [c0][x]
+    l = [[2, 1], [2, 2], [2, 6], [2, 7], [2, 0]]
+    if pl in l:
+        if distance(pts[8], pts[16]) > 50:
+            ch1 = 6
+
+    # con for [l][x]
+    l = [[4, 6], [4, 2], [4, 1], [4, 4]]
+    if pl in l:
+        if distance(pts[4], pts[11]) < 60:
+            ch1 = 6
+
+    # con for [x][d]
+    l = [[1, 4], [1, 6], [1, 0], [1, 2]]
+    if pl in l:
+        if pts[5][0] - pts[4][0] - 15 > 0:
+            ch1 = 6
+
+    # con for [b][pqz]
+    l = [[5, 0], [5, 1], [5, 4], [5, 5], [5, 6], [6, 1], [7, 6], [0, 2], [7, 1], [7, 4], [6, 6], [7, 2], [5, 0], [6, 3], [6, 4], [7, 5], [7, 2]]
+    if pl in l:
+        if (pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] > pts[16][1] and pts[18][1] > pts[20][1]):
+            ch1 = 1
+
+    # con for [f][pqz]
+    l = [[6, 1], [6, 0], [0, 3], [6, 4], [2, 2], [0, 6], [6, 2], [7, 6], [4, 6], [4, 1], [4, 2], [0, 2], [7, 1], [7, 4], [6, 6], [7, 2], [7, 5], [7, 2]]
+    if pl in l:
+        if (pts[6][1] < pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] > pts[16][1] and pts[18][1] > pts[20][1]):
+            ch1 = 1
+
+    l = [[6, 1], [6, 0], [4, 2], [4, 1], [4, 6], [4, 4]]
+    if pl in l:
+        if (pts[10][1] > pts[12][1] and pts[14][1] > pts[16][1] and pts[18][1] > pts[20][1]):
+            ch1 = 1
+
+    # con for [d][pqz]
+    l = [[5, 0], [3, 4], [3, 0], [3, 1], [3, 5], [5, 5], [5, 4], [5, 1], [7, 6]]
+    if pl in l:
+        if ((pts[6][1] > pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][1]) and (pts[2][0] < pts[0][0]) and pts[4][1] > pts[14][1]):
+            ch1 = 1
+
+    l = [[4, 1], [4, 2], [4, 4]]
+    if pl in l:
+        if (distance(pts[4], pts[11]) < 50) and (pts[6][1] > pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][1]):
+            ch1 = 1
+
+    l = [[3, 4], [3, 0], [3, 1], [3, 5], [3, 6]]
+    if pl in l:
+        if ((pts[6][1] > pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][1]) and (pts[2][0] < pts[0][0]) and pts[14][1] < pts[4][1]):
+            ch1 = 1
+
+    l = [[6, 6], [6, 4], [6, 1], [6, 2]]
+    if pl in l:
+        if pts[5][0] - pts[4][0] - 15 < 0:
+            ch1 = 1
+
+    # con for [i][pqz]
+    l = [[5, 4], [5, 5], [5, 1], [0, 3], [0, 7], [5, 0], [0, 2], [6, 2], [7, 5], [7, 1], [7, 6], [7, 7]]
+    if pl in l:
+        if ((pts[6][1] < pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] > pts[20][1])):
+            ch1 = 1
+
+    # con for [yj][bfdi]
+    l = [[1, 5], [1, 7], [1, 1], [1, 6], [1, 3], [1, 0]]
+    if pl in l:
+        if (pts[4][0] < pts[5][0] + 15) and ((pts[6][1] < pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] > pts[20][1])):
+            ch1 = 7
+
+    # con for [uvr]
+    l = [[5, 5], [5, 0], [5, 4], [5, 1], [4, 6], [4, 1], [7, 6], [3, 0], [3, 5]]
+    if pl in l:
+        if ((pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][1])) and pts[4][1] > pts[14][1]:
+            ch1 = 1
+
+    # con for [w]
+    fg = 13
+    l = [[3, 5], [3, 0], [3, 6], [5, 1], [4, 1], [2, 0], [5, 0], [5, 5]]
+    if pl in l:
+        if not (pts[0][0] + fg < pts[8][0] and pts[0][0] + fg < pts[12][0] and pts[0][0] + fg < pts[16][0] and pts[0][0] + fg < pts[20][0]) and not (pts[0][0] > pts[8][0] and pts[0][0] > pts[12][0] and pts[0][0] > pts[16][0] and pts[0][0] > pts[20][0]) and distance(pts[4], pts[11]) < 50:
+            ch1 = 1
+
+    # con for [w]
+    l = [[5, 0], [5, 5], [0, 1]]
+    if pl in l:
+        if pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] > pts[16][1]:
+            ch1 = 1
+
+    # Subgroups
+    if ch1 == 0:
+        ch1 = 'S'
+        if pts[4][0] < pts[6][0] and pts[4][0] < pts[10][0] and pts[4][0] < pts[14][0] and pts[4][0] < pts[18][0]:
+            ch1 = 'A'
+        if pts[4][0] > pts[6][0] and pts[4][0] < pts[10][0] and pts[4][0] < pts[14][0] and pts[4][0] < pts[18][0] and pts[4][1] < pts[14][1] and pts[4][1] < pts[18][1]:
+            ch1 = 'T'
+        if pts[4][1] > pts[8][1] and pts[4][1] > pts[12][1] and pts[4][1] > pts[16][1] and pts[4][1] > pts[20][1]:
+            ch1 = 'E'
+        if pts[4][0] > pts[6][0] and pts[4][0] > pts[10][0] and pts[4][0] > pts[14][0] and pts[4][1] < pts[18][1]:
+            ch1 = 'M'
+        if pts[4][0] > pts[6][0] and pts[4][0] > pts[10][0] and pts[4][1] < pts[18][1] and pts[4][1] < pts[14][1]:
+            ch1 = 'N'
+
+    if ch1 == 2:
+        if distance(pts[12], pts[4]) > 42:
+            ch1 = 'C'
+        else:
+            ch1 = 'O'
+
+    if ch1 == 3:
+        if (distance(pts[8], pts[12])) > 72:
+            ch1 = 'G'
+        else:
+            ch1 = 'H'
+
+    if ch1 == 7:
+        if distance(pts[8], pts[4]) > 42:
+            ch1 = 'Y'
+        else:
+            ch1 = 'J'
+
+    if ch1 == 4:
+        ch1 = 'L'
+
+    if ch1 == 6:
+        ch1 = 'X'
+
+    if ch1 == 5:
+        if pts[4][0] > pts[12][0] and pts[4][0] > pts[16][0] and pts[4][0] > pts[20][0]:
+            if pts[8][1] < pts[5][1]:
+                ch1 = 'Z'
+            else:
+                ch1 = 'Q'
+        else:
+            ch1 = 'P'
+
+    if ch1 == 1:
+        if (pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] > pts[16][1] and pts[18][1] > pts[20][1]):
+            ch1 = 'B'
+        if (pts[6][1] > pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][1]):
+            ch1 = 'D'
+        if (pts[6][1] < pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] > pts[16][1] and pts[18][1] > pts[20][1]):
+            ch1 = 'F'
+        if (pts[6][1] < pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] > pts[20][1]):
+            ch1 = 'I'
+        if (pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] > pts[16][1] and pts[18][1] < pts[20][1]):
+            ch1 = 'W'
+        if (pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][1]) and pts[4][1] < pts[9][1]:
+            ch1 = 'K'
+        if ((distance(pts[8], pts[12]) - distance(pts[6], pts[10])) < 8) and (pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][1]):
+            ch1 = 'U'
+        if ((distance(pts[8], pts[12]) - distance(pts[6], pts[10])) >= 8) and (pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][1]) and (pts[4][1] > pts[9][1]):
+            ch1 = 'V'
+        if (pts[8][0] > pts[12][0]) and (pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] < pts[20][1]):
+            ch1 = 'R'
+
+    if ch1 == 1 or ch1 =='E' or ch1 =='S' or ch1 =='X' or ch1 =='Y' or ch1 =='B':
+         if (pts[6][1] > pts[8][1] and pts[10][1] < pts[12][1] and pts[14][1] < pts[16][1] and pts[18][1] > pts[20][1]):
+            ch1 = " "
+
+    if ch1 == 'E' or ch1=='Y' or ch1=='B':
+         if (pts[4][0] < pts[5][0]) and (pts[6][1] > pts[8][1] and pts[10][1] > pts[12][1] and pts[14][1] > pts[16][1] and pts[18][1] > pts[20][1]):
+            ch1 = "next"
+
+    # Was `ch1 == 'Next' or 'B' or ...`, which is always true
+    if ch1 in ('next', 'B', 'C', 'H', 'F', 'X'):
+        if (pts[0][0] > pts[8][0] and pts[0][0] > pts[12][0] and pts[0][0] > pts[16][0] and pts[0][0] > pts[20][0]) and (pts[4][1] < pts[8][1] and pts[4][1] < pts[12][1] and pts[4][1] < pts[16][1] and pts[4][1] < pts[20][1]) and (pts[4][1] < pts[6][1] and pts[4][1] < pts[10][1] and pts[4][1] < pts[14][1] and pts[4][1] < pts[18][1]):
+            ch1 = 'Backspace'
+
+    return ch1
@@ -0,0 +1,120 @@
+import os
+
+import numpy as np
+
+from .utils.setup import is_stale
+
+# Lean runtimes for the ASL skeleton CNN; TensorFlow itself is only imported to
+# export the .h5 or when falling back to Keras
+try:
+    from ai_edge_litert.interpreter import Interpreter
+except ImportError:
+    try:
+        from tflite_runtime.interpreter import Interpreter
+    except ImportError:
+        Interpreter = None
+try:
+    import onnxruntime
+except ImportError:
+    onnxruntime = None
+
+RUNTIMES = ("auto", "tflite", "onnx", "keras")
+
+
+def lean_path(model_path, runtime):
+    """Exports are cached next to the .h5, e.g. models/cnn8grps_rad1_model.tflite."""
+    root, _ = os.path.splitext(model_path)
+    return root + (".tflite" if runtime == "tflite" else ".onnx")
+
+
+def export_tflite(model_path, path):
+    import tensorflow as tf
+    model = tf.keras.models.load_model(model_path, compile=False)
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    with open(path, "wb") as f:
+        f.write(converter.convert())
+
+
+def export_onnx(model_path, path):
+    import tensorflow as tf
+    import tf2onnx
+    model = tf.keras.models.load_model(model_path, compile=False)
+    spec = (tf.TensorSpec((None,) + tuple(model.input_shape[1:]), tf.float32, name="images"),)
+    tf2onnx.convert.from_keras(model, input_signature=spec, opset=17, output_path=path)
+
+
+class TFLiteModel:
+    """TFLite interpreter with Keras' predict(images, verbose=0) signature."""
+
+    def __init__(self, path):
+        if Interpreter is None:
+            import tensorflow as tf  # No standalone interpreter installed
+            interpreter = tf.lite.Interpreter(model_path=path)
+        else:
+            interpreter = Interpreter(model_path=path)
+        interpreter.allocate_tensors()
+        self.interpreter = interpreter
+        self.input = interpreter.get_input_details()[0]["index"]
+        self.output = interpreter.get_output_details()[0]["index"]
+        self.batch = 1
+
+    def predict(self, images, verbose=0):
+        if len(images) != self.batch:
+            self.interpreter.resize_tensor_input(self.input, (len(images),) + tuple(images.shape[1:]))
+            self.interpreter.allocate_tensors()
+            self.batch = len(images)
+        self.interpreter.set_tensor(self.input, np.asarray(images, dtype=np.float32))
+        self.interpreter.invoke()
+        return self.interpreter.get_tensor(self.output)
+
+
+class ONNXModel:
+    """ONNX Runtime session with Keras' predict(images, verbose=0) signature."""
+
+    def __init__(self, path):
+        if onnxruntime is None:
+            raise RuntimeError("onnxruntime is not installed")
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = onnxruntime.InferenceSession(path, options, providers=onnxruntime.get_available_providers())
+        self.input = self.session.get_inputs()[0].name
+
+    def predict(self, images, verbose=0):
+        return self.session.run(None, {self.input: np.asarray(images, dtype=np.float32)})[0]
+
+
+def available(runtime):
+    if runtime == "tflite":
+        return Interpreter is not None
+    return onnxruntime is not None
+
+
+def load_asl_cnn(model_path, runtime="auto"):
+    """
+    Loads the ASL CNN; returns (model, runtime name). Every model has predict(images, verbose=0).
+
+    - "auto": a cached .tflite / .onnx export that is newer than the .h5 and whose
+      runtime is installed, else Keras. Never exports (that needs TensorFlow).
+    - "tflite" / "onnx": (re)exports when the cache is missing or stale, then
+      loads it; falls back to Keras if that fails.
+    - "keras": the .h5 through Keras, as before.
+    """
+    if runtime not in RUNTIMES:
+        raise ValueError(f"unknown ASL CNN runtime: {runtime}")
+    candidates = [r for r in ("tflite", "onnx") if runtime in ("auto", r)]
+    for name in candidates:
+        path = lean_path(model_path, name)
+        try:
+            if is_stale(path, model_path):
+                if runtime == "auto":
+                    continue
+                (export_tflite if name == "tflite" else export_onnx)(model_path, path)
+                print(f"Exported ASL CNN to {path}")
+            elif runtime == "auto" and not available(name):
+                continue
+            return (TFLiteModel(path) if name == "tflite" else ONNXModel(path)), name
+        except Exception as e:
+            print(f"ASL CNN {name} runtime failed, using Keras: {e}")
+
+    from keras.models import load_model
+    return load_model(model_path), "keras"
@@ -0,0 +1,89 @@
+import hashlib
+import os
+import shutil
+from collections import OrderedDict
+
+from .text_io import replace
+
+
+class AudioCache:
+    """
+    Synthesised speech on disk, one <key>.wav per (text, voice, rate), bounded
+    to `max_bytes` by evicting the least recently used files.
+
+    Hits are served into place by hardlink (a copy across drives), so a repeated
+    phrase costs a file operation instead of a synthesis. Recency is kept in the
+    file mtimes, so the LRU order survives restarts.
+    """
+
+    def __init__(self, directory, max_bytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self.entries = OrderedDict()  # key -> size, least recently used first
+        files = []
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if name.endswith(".wav") and not name.endswith(".tmp.wav"):
+                files.append((os.path.getmtime(path), name[:-4], os.path.getsize(path)))
+        for _, key, size in sorted(files):
+            self.entries[key] = size
+        self.total = sum(self.entries.values())
+
+    @staticmethod
+    def key(text, voice=None, rate=None):
+        """Content address of one synthesis; whitespace differences don't change the audio."""
+        phrase = " ".join(text.split())
+        return hashlib.sha1(f"{voice}\0{rate}\0{phrase}".encode("utf-8")).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ".wav")
+
+    def temp_path(self, key):
+        """Where to synthesise a missing phrase before add()."""
+        return os.path.join(self.directory, key + ".tmp.wav")
+
+    def get(self, key):
+        """Path of the cached audio (now most recently used), or None."""
+        if key not in self.entries:
+            return None
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except OSError:  # Deleted behind our back
+            self.total -= self.entries.pop(key)
+            return None
+        self.entries.move_to_end(key)
+        return path
+
+    def add(self, key, src):
+        """Moves a freshly synthesised file into the cache and evicts down to max_bytes."""
+        path = self.path(key)
+        replace(src, path)
+        self.total -= self.entries.pop(key, 0)
+        self.entries[key] = os.path.getsize(path)
+        self.total += self.entries[key]
+        while self.total > self.max_bytes and len(self.entries) > 1:
+            old, size = self.entries.popitem(last=False)
+            self.total -= size
+            try:
+                os.remove(self.path(old))
+            except OSError:
+                pass
+        return path
+
+    def serve(self, key, target):
+        """Puts the cached audio at `target` atomically; False on a miss."""
+        path = self.get(key)
+        if path is None:
+            return False
+        root, ext = os.path.splitext(target)
+        tmp = f"{root}.tmp{ext}"
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        try:
+            os.link(path, tmp)
+        except OSError:  # Other drive, or no hardlinks on this filesystem
+            shutil.copyfile(path, tmp)
+        replace(tmp, target)
+        return True
@@ -0,0 +1,76 @@
+import socket
+import sys
+import threading
+
+from .telemetry import get_logger
+
+logger = get_logger("control")
+
+
+class ControlChannel:
+    """
+    Non-GUI command input for the server, so actions like "speak" work
+    without an OpenCV window. Commands are plain words, one per line (stdin)
+    or per datagram (local UDP), e.g.:
+
+        echo speak | nc -u -w0 127.0.0.1 5006
+
+    Each command is looked up in `handlers` (name -> callable) and run on the
+    channel's own thread, never on the vision threads.
+    """
+
+    def __init__(self, handlers, udp_ip="127.0.0.1", udp_port=None, use_stdin=False):
+        self.handlers = handlers
+        self.udp_ip = udp_ip
+        self.udp_port = udp_port
+        self.use_stdin = use_stdin
+        self.sock = None
+        self.running = False
+
+    def start(self):
+        self.running = True
+        if self.udp_port:
+            self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.sock.bind((self.udp_ip, self.udp_port))
+            self.sock.settimeout(0.2)
+            threading.Thread(target=self.run_udp, daemon=True).start()
+            logger.info("Control channel listening on %s:%s (%s)", self.udp_ip, self.udp_port, ", ".join(self.handlers))
+        if self.use_stdin:
+            threading.Thread(target=self.run_stdin, daemon=True).start()
+        return self
+
+    def dispatch(self, command):
+        command = command.strip().lower()
+        if not command:
+            return False
+        handler = self.handlers.get(command)
+        if handler is None:
+            logger.warning("Unknown control command: %s", command, extra={"key": "unknown_command"})
+            return False
+        try:
+            handler()
+        except Exception:
+            logger.exception("Control command '%s' failed", command, extra={"key": f"command:{command}"})
+        return True
+
+    def run_udp(self):
+        while self.running:
+            try:
+                data, _ = self.sock.recvfrom(1024)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            for line in data.decode(errors="ignore").splitlines():
+                self.dispatch(line)
+
+    def run_stdin(self):
+        for line in sys.stdin:
+            if not self.running:
+                break
+            self.dispatch(line)
+
+    def stop(self):
+        self.running = False
+        if self.sock is not None:
+            self.sock.close()
@@ -0,0 +1,134 @@
+import copy
+
+FIELDS = ["face_found", "hand_found", "head_pose", "expression", "gesture",
+          "asl_char", "sign_asl", "sign_conf", "current_text", "body_pose",
+          "speech", "speech_id"]
+# result_age is left out on purpose: it changes on every frame a result is carried over,
+# so it would turn every frame into a delta. Keyframes (full packets) carry it.
+
+
+class DeltaEncoder:
+    """
+    Keyframe + delta streaming for the data packet.
+
+    update(packet) compares the packet against the state the receivers hold
+    (the last keyframe plus every delta sent since) and returns:
+    - ("full", packet) for a keyframe: the first packet, every
+      `keyframe_interval` packets, and whenever a keyframe was requested;
+    - ("delta", changes, joints) with only the fields that changed, and only
+      the body joints that appeared, vanished or moved more than
+      `joint_epsilon` pixels;
+    - None when nothing changed beyond the quantisation epsilons, so nothing
+      needs to be sent.
+
+    Packets restricted to a subset of FIELDS (per-subscriber field sets) work
+    as long as the subset stays the same.
+
+    Comparing against the receivers' state (not the previous frame) means slow
+    drifts below epsilon still get sent once they add up.
+    """
+
+    def __init__(self, keyframe_interval=30, pose_epsilon=0.5, conf_epsilon=0.05, joint_epsilon=2):
+        self.keyframe_interval = keyframe_interval
+        self.pose_epsilon = pose_epsilon
+        self.conf_epsilon = conf_epsilon
+        self.joint_epsilon = joint_epsilon
+        self.reference = None
+        self.since_keyframe = 0
+        self.force_keyframe = True
+
+    def request_keyframe(self):
+        """Called when a receiver reports loss; the next update() sends a keyframe."""
+        self.force_keyframe = True
+
+    def update(self, packet):
+        self.since_keyframe += 1
+        if self.force_keyframe or self.reference is None or self.since_keyframe >= self.keyframe_interval:
+            self.force_keyframe = False
+            self.since_keyframe = 0
+            self.reference = copy.deepcopy(packet)
+            return ("full", packet)
+
+        changes = {}
+        for field in FIELDS:
+            if field == "body_pose" or field not in packet:
+                continue
+            old, new = self.reference[field], packet[field]
+            if field == "head_pose":
+                if any(abs(new[k] - old[k]) > self.pose_epsilon for k in ("pitch", "yaw", "roll")):
+                    changes[field] = new
+            elif field == "sign_conf":
+                if abs(new - old) > self.conf_epsilon:
+                    changes[field] = new
+            elif new != old:
+                changes[field] = new
+
+        joints = {}
+        old_body, new_body = self.reference.get("body_pose", []), packet.get("body_pose", [])
+        if len(old_body) != len(new_body):
+            changes["body_pose"] = new_body
+        else:
+            for i, (old, new) in enumerate(zip(old_body, new_body)):
+                if self.joint_moved(old, new):
+                    joints[i] = new
+
+        if not changes and not joints:
+            return None
+
+        for field, value in changes.items():
+            self.reference[field] = copy.deepcopy(value)
+        for i, joint in joints.items():
+            self.reference["body_pose"][i] = copy.deepcopy(joint)
+        return ("delta", changes, joints)
+
+    def joint_moved(self, old, new):
+        if (old is None) != (new is None):
+            return True
+        if old is None:
+            return False
+        return (abs(new["x"] - old["x"]) > self.joint_epsilon
+                or abs(new["y"] - old["y"]) > self.joint_epsilon
+                or abs(new["conf"] - old["conf"]) > self.conf_epsilon)
+
+
+class DeltaDecoder:
+    """
+    Reference receiver for delta streams. Feed it decoded messages (see
+    wire_format.decode_binary / decode_json) and it rebuilds the full packet.
+    Sequence gaps invalidate the state: apply() returns None until the next
+    keyframe arrives, and needs_keyframe tells the receiver to ask for one.
+    Keyframes are always taken, so a restarted server (seq back at 1) resyncs.
+    """
+
+    def __init__(self):
+        self.state = None
+        self.key_seq = None
+        self.last_seq = None
+        self.lost = 0
+        self.needs_keyframe = True
+
+    def apply(self, message):
+        seq = message["seq"]
+        keyframe = message["type"] == "full"
+        if self.last_seq is not None:
+            if seq <= self.last_seq and not keyframe:
+                return None  # duplicate or reordered delta
+            if seq > self.last_seq + 1:
+                self.lost += seq - self.last_seq - 1
+                self.needs_keyframe = True
+        self.last_seq = seq
+
+        if keyframe:
+            self.state = {field: copy.deepcopy(message[field]) for field in FIELDS if field in message}
+            self.key_seq = seq
+            self.needs_keyframe = False
+            return self.state
+
+        if self.needs_keyframe or message["key_seq"] != self.key_seq:
+            self.needs_keyframe = True
+            return None
+        for field, value in message["changes"].items():
+            self.state[field] = copy.deepcopy(value)
+        for i, joint in message["joints"].items():
+            self.state["body_pose"][i] = copy.deepcopy(joint)
+        return self.state
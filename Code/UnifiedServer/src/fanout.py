@@ -0,0 +1,250 @@
+import json
+import logging
+import socket
+import threading
+import time
+
+from .delta_stream import FIELDS, DeltaEncoder
+from .telemetry import get_logger, log_event
+from .wire_format import PacketEncoder
+
+logger = get_logger("fanout")
+
+
+class Subscriber:
+    """
+    One receiver of the packet stream: its address, the fields it wants, its
+    maximum rate (Hz, 0 = every new packet) and its own PacketEncoder, so
+    sequence numbers and delta state are per receiver.
+    Static targets have expires=None and never time out.
+    """
+
+    def __init__(self, address, encoder, fields=None, rate=0, expires=None, options=None):
+        self.address = address
+        self.encoder = encoder
+        # The binary layout is fixed, so field selection only applies to JSON
+        self.fields = fields if encoder.wire_format == "json" else None
+        self.interval = 1.0 / rate if rate else 0.0
+        self.expires = expires
+        self.options = options  # The hello options this subscriber was created from
+        self.next_send = 0.0
+        self.version = 0  # Last packet version sent to this subscriber
+        self.sent = 0
+
+    def project(self, packet):
+        if self.fields is None:
+            return packet
+        return {field: packet[field] for field in self.fields if field in packet}
+
+
+def parse_message(data):
+    """
+    Subscription datagrams are either a bare word ("hello", "bye", "keyframe")
+    or a JSON object with a "type" and hello options, e.g.
+    {"type": "hello", "fields": ["head_pose", "expression"], "rate": 60}.
+    """
+    text = data.decode(errors="ignore").strip()
+    if text.startswith("{"):
+        message = json.loads(text)
+        if not isinstance(message, dict):
+            raise ValueError("subscription message must be a JSON object")
+        message["type"] = str(message.get("type", "hello")).lower()
+        return message
+    words = text.split()
+    return {"type": words[0].lower() if words else ""}
+
+
+class FanoutSender:
+    """
+    Sends each published packet to every subscriber from a dedicated thread.
+
+    The vision pipeline only calls publish(), which stores the latest packet
+    and wakes the sender. On each tick the sender encodes and sends to every
+    subscriber that has not seen the packet yet and whose rate allows it;
+    a rate-limited subscriber that skipped a packet gets the latest one as
+    soon as its interval has passed.
+
+    Receivers subscribe by sending a hello datagram to `bind_ip`:`port`
+    (0 = static targets only; bind to "0.0.0.0" for viewers on the LAN).
+    The stream is sent back to the hello's source address, so one source
+    address is one subscription, and at most `max_subscribers` are served at
+    once (further hellos are dropped until one leaves or expires).
+    Subscribers repeat the hello to stay registered and expire after
+    `timeout` seconds of silence; "bye" removes them and "keyframe" requests
+    a keyframe for their delta stream.
+    The stream is sent from the same socket, so with port=0 it is bound to an
+    ephemeral port and static targets' "keyframe" requests (sent back to where
+    the stream comes from) still arrive; hellos are ignored then.
+    """
+
+    def __init__(self, classes=(), wire_format="json", keyframe_interval=0,
+                 bind_ip="127.0.0.1", port=0, timeout=5.0, max_subscribers=8):
+        self.classes = classes
+        self.wire_format = wire_format
+        self.keyframe_interval = keyframe_interval
+        self.bind_ip = bind_ip
+        self.port = port
+        self.timeout = timeout
+        self.max_subscribers = max_subscribers
+        self.subscribers = {}
+        self.packet = None
+        self.timestamp = None
+        self.version = 0
+        self.cond = threading.Condition()
+        self.sock = None
+        self.running = False
+        self.threads = []
+
+    def make_encoder(self, wire_format=None, keyframe_interval=None):
+        wire_format = wire_format or self.wire_format
+        interval = self.keyframe_interval if keyframe_interval is None else keyframe_interval
+        return PacketEncoder(wire_format, self.classes, DeltaEncoder(interval) if interval > 0 else None)
+
+    def add_target(self, address):
+        """Static receiver that never expires (the classic single UDP_IP/UDP_PORT target)."""
+        with self.cond:
+            self.subscribers[address] = Subscriber(address, self.make_encoder())
+
+    def start(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((self.bind_ip, self.port))
+        self.sock.settimeout(0.2)
+        self.running = True
+        self.threads = [threading.Thread(target=self.run_send, daemon=True),
+                        threading.Thread(target=self.run_receive, daemon=True)]
+        if self.port:
+            log_event(logger, logging.INFO, "listening", address=f"{self.bind_ip}:{self.port}",
+                      max_subscribers=self.max_subscribers)
+        for thread in self.threads:
+            thread.start()
+        return self
+
+    def publish(self, packet, timestamp=None):
+        """Called from the vision pipeline: O(1), never touches the socket."""
+        with self.cond:
+            self.packet = packet
+            self.timestamp = timestamp
+            self.version += 1
+            self.cond.notify()
+
+    def request_keyframe(self):
+        with self.cond:
+            for subscriber in self.subscribers.values():
+                subscriber.encoder.request_keyframe()
+
+    def subscribe(self, address, message):
+        fields = message.get("fields")
+        if fields is not None:
+            fields = [field for field in fields if field in FIELDS]
+        wire_format = message.get("format", self.wire_format)
+        if wire_format not in ("json", "binary"):
+            raise ValueError(f"unknown wire format: {wire_format}")
+        keyframe_interval = message.get("keyframe_interval")
+        options = (wire_format, tuple(fields) if fields is not None else None, float(message.get("rate", 0)),
+                   int(keyframe_interval) if keyframe_interval is not None else None)
+
+        with self.cond:
+            subscriber = self.subscribers.get(address)
+            if subscriber is not None and subscriber.expires is None:
+                return  # Static target
+            if subscriber is None and self.subscribed() >= self.max_subscribers:
+                log_event(logger, logging.WARNING, "Subscriber limit reached, hello dropped", key="subscriber_limit",
+                          address=f"{address[0]}:{address[1]}", max_subscribers=self.max_subscribers)
+                return
+            if subscriber is None or subscriber.options != options:
+                subscriber = Subscriber(address, self.make_encoder(wire_format, options[3]),
+                                        fields, options[2], options=options)
+                self.subscribers[address] = subscriber
+                log_event(logger, logging.INFO, "subscribed", address=f"{address[0]}:{address[1]}",
+                          format=wire_format, fields=",".join(fields) if fields is not None else "all",
+                          rate=options[2] or "max")
+            subscriber.expires = time.monotonic() + self.timeout
+            self.cond.notify()
+
+    def subscribed(self):
+        """Number of hello subscribers (static targets not included); call with self.cond held."""
+        return sum(subscriber.expires is not None for subscriber in self.subscribers.values())
+
+    def handle(self, data, address):
+        try:
+            message = parse_message(data)
+            if message["type"] == "hello":
+                if self.port:  # Subscribing is off without a subscribe port
+                    self.subscribe(address, message)
+                return
+            with self.cond:
+                subscriber = self.subscribers.get(address)
+                if message["type"] == "bye" and subscriber is not None and subscriber.expires is not None:
+                    del self.subscribers[address]
+                    log_event(logger, logging.INFO, "unsubscribed", address=f"{address[0]}:{address[1]}")
+                elif message["type"] == "keyframe" and subscriber is not None:
+                    subscriber.encoder.request_keyframe()
+        except (ValueError, TypeError, AttributeError) as e:
+            log_event(logger, logging.WARNING, f"Bad subscription message: {e}", key="bad_subscription")
+
+    def run_receive(self):
+        while self.running:
+            try:
+                data, address = self.sock.recvfrom(4096)
+            except socket.timeout:
+                continue
+            except OSError:
+                if self.running:
+                    continue  # e.g. Windows reports ICMP "port unreachable" from an earlier send here
+                break
+            self.handle(data, address)
+
+    def due(self, now):
+        """Subscribers to send to this tick, and how long to wait if there are none."""
+        batch, wait = [], 0.2
+        for address, subscriber in list(self.subscribers.items()):
+            if subscriber.expires is not None and now > subscriber.expires:
+                del self.subscribers[address]
+                log_event(logger, logging.INFO, "subscriber expired", address=f"{address[0]}:{address[1]}")
+                continue
+            if subscriber.version == self.version:
+                continue
+            if now >= subscriber.next_send:
+                batch.append(subscriber)
+            else:
+                wait = min(wait, subscriber.next_send - now)
+        return batch, wait
+
+    def encode(self, subscriber, packet, timestamp):
+        return subscriber.encoder.encode(subscriber.project(packet), timestamp)
+
+    def run_send(self):
+        while self.running:
+            with self.cond:
+                batch, wait = self.due(time.monotonic())
+                if not batch:
+                    self.cond.wait(wait)
+                    continue
+                packet, timestamp, version = self.packet, self.timestamp, self.version
+
+            now = time.monotonic()
+            for subscriber in batch:
+                subscriber.version = version
+                subscriber.next_send = now + subscriber.interval
+                try:
+                    payload = self.encode(subscriber, packet, timestamp)
+                    if payload is None:
+                        continue  # Delta mode: nothing changed for this subscriber
+                    self.sock.sendto(payload, subscriber.address)
+                    subscriber.sent += 1
+                except Exception as e:
+                    log_event(logger, logging.WARNING, f"Socket Error: {e}", key=f"send_error:{subscriber.address}",
+                              address=f"{subscriber.address[0]}:{subscriber.address[1]}")
+
+    def stats(self):
+        with self.cond:
+            return {f"{ip}:{port}": subscriber.sent for (ip, port), subscriber in self.subscribers.items()}
+
+    def stop(self):
+        self.running = False
+        with self.cond:
+            self.cond.notify_all()
+        for thread in self.threads:
+            thread.join(timeout=1.0)
+        if self.sock is not None:
+            self.sock.close()
@@ -0,0 +1,223 @@
+import math
+
+import numpy as np
+
+FILTERS = ("one_euro", "kalman", "none")
+
+
+class TemporalFilter:
+    """
+    Base for the per-element filters below: every element of the input array
+    (a joint coordinate, a pose angle) is filtered on its own, all at once.
+
+    update(x, t, mask) feeds one measurement at time t (seconds) and returns the
+    filtered array; elements where `mask` is False (e.g. joints not found this
+    frame) keep their state. An element that was masked out restarts from the
+    measurement when it comes back, the whole state when the shape changes or
+    time goes backwards.
+    predict(dt) extrapolates the state dt seconds ahead with its velocity, to
+    make up for pipeline latency.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.x = None
+        self.dx = None
+        self.t = None
+        self.valid = None  # Elements measured in the last update (True: all of them)
+
+    def update(self, x, t, mask=None):
+        x = np.asarray(x, dtype=np.float64)
+        if mask is not None:
+            mask = np.broadcast_to(mask, x.shape)
+            if mask.all():
+                mask = None  # Fast path: no masking
+        if self.x is None or self.x.shape != x.shape or t < self.t:
+            self.start(x)
+        elif t > self.t:
+            self.step(x, t - self.t, mask)
+            # Elements missing last time start again from the measurement
+            if self.valid is not True:
+                restart = ~self.valid if mask is None else mask & ~self.valid
+                if restart.any():
+                    self.restart(x, restart)
+        self.valid = True if mask is None else mask.copy()
+        self.t = t
+        return self.x
+
+    def start(self, x):
+        self.x = x.copy()
+        self.dx = np.zeros_like(x)
+
+    def restart(self, x, where):
+        self.x[where] = x[where]
+        self.dx[where] = 0.0
+
+    def predict(self, dt):
+        if self.x is None:
+            return None
+        return self.x + self.dx * dt
+
+
+class OneEuroFilter(TemporalFilter):
+    """
+    One Euro filter (Casiez et al., CHI 2012): a low-pass whose cutoff rises with
+    speed, so slow movements are smoothed hard and fast ones lag little.
+    `min_cutoff` (Hz) sets the smoothing at rest, `beta` how fast the cutoff
+    grows with speed (in the units of x per second).
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=0.01, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        super().__init__()
+
+    @staticmethod
+    def alpha(cutoff, dt):
+        return 1.0 / (1.0 + 1.0 / (2 * math.pi * cutoff * dt))
+
+    def step(self, x, dt, mask):
+        dx = self.dx + self.alpha(self.d_cutoff, dt) * ((x - self.x) / dt - self.dx)
+        a = self.alpha(self.min_cutoff + self.beta * np.abs(dx), dt)
+        if mask is None:
+            self.x, self.dx = self.x + a * (x - self.x), dx
+        else:
+            self.x = np.where(mask, self.x + a * (x - self.x), self.x)
+            self.dx = np.where(mask, dx, self.dx)
+
+
+class KalmanFilter(TemporalFilter):
+    """
+    Constant-velocity Kalman filter per element, with the 2x2 covariance kept as
+    three arrays. `process_noise` is the acceleration noise density (units of x
+    per s^2, squared, per Hz), `measurement_noise` the variance of one measurement.
+    """
+
+    def __init__(self, process_noise=1.0, measurement_noise=1.0):
+        self.q = process_noise
+        self.r = measurement_noise
+        super().__init__()
+
+    def start(self, x):
+        super().start(x)
+        self.p00 = np.full_like(x, self.r)
+        self.p01 = np.zeros_like(x)
+        self.p11 = np.full_like(x, self.q)
+
+    def restart(self, x, where):
+        super().restart(x, where)
+        self.p00[where], self.p01[where], self.p11[where] = self.r, 0.0, self.q
+
+    def step(self, z, dt, mask):
+        q = self.q
+        # Predict
+        x = self.x + self.dx * dt
+        p00 = self.p00 + dt * (2 * self.p01 + dt * self.p11) + q * dt ** 3 / 3
+        p01 = self.p01 + dt * self.p11 + q * dt ** 2 / 2
+        p11 = self.p11 + q * dt
+        # Correct (masked-out elements keep their state and only get the prediction's uncertainty)
+        k0 = p00 / (p00 + self.r)
+        k1 = p01 / (p00 + self.r)
+        residual = z - x
+        if mask is not None:
+            k0, k1, residual = k0 * mask, k1 * mask, residual * mask
+            x = np.where(mask, x, self.x)
+        self.x = x + k0 * residual
+        self.dx = self.dx + k1 * residual
+        self.p11 = p11 - k1 * p01
+        self.p00 = (1 - k0) * p00
+        self.p01 = (1 - k0) * p01
+
+
+class KeyedFilters:
+    """One filter per key (e.g. per tracked hand); keys not updated for `max_missing` updates are dropped."""
+
+    def __init__(self, factory, max_missing=3):
+        self.factory = factory
+        self.max_missing = max_missing
+        self.filters = {}
+        self.missing = {}
+
+    def update(self, keys, values, t):
+        for key in self.missing:
+            self.missing[key] += 1
+        out = []
+        for key, value in zip(keys, values):
+            if key not in self.filters:
+                self.filters[key] = self.factory()
+            self.missing[key] = 0
+            out.append(self.filters[key].update(value, t))
+        for key in [k for k, n in self.missing.items() if n > self.max_missing]:
+            del self.filters[key], self.missing[key]
+        return out
+
+    def predict(self, keys, dt):
+        return [self.filters[key].predict(dt) for key in keys]
+
+
+def make_filter(kind, **params):
+    """"one_euro" / "kalman" filter with the given parameters; None for "none"."""
+    if kind == "one_euro":
+        return OneEuroFilter(**params)
+    if kind == "kalman":
+        return KalmanFilter(**params)
+    if kind in ("none", None):
+        return None
+    raise ValueError(f"unknown filter: {kind}")
+
+
+class PacketSmoother:
+    """
+    Server-side smoothing of what the packet carries, so receivers get clean
+    data instead of each re-filtering jitter (and the delta stream stops
+    sending it): the head pose angles, the OpenPose joints and, optionally,
+    the hand landmarks (per hand key) before gestures and ASL see them.
+
+    Head pose and joints are also predicted `lead` seconds ahead (the measured
+    capture-to-send latency, capped at `max_prediction`) to hide the pipeline lag.
+    `params` maps "head_pose" / "body_pose" / "hands" to filter parameters.
+    """
+
+    def __init__(self, kind="one_euro", params=None, smooth_hands=False, max_prediction=0.1):
+        params = params or {}
+        self.head = make_filter(kind, **params.get("head_pose", {}))
+        self.body = make_filter(kind, **params.get("body_pose", {}))
+        self.hands = None
+        if smooth_hands and make_filter(kind) is not None:
+            self.hands = KeyedFilters(lambda: make_filter(kind, **params.get("hands", {})))
+        self.max_prediction = max_prediction
+
+    def smooth_hands(self, keys, hands, t):
+        """(hands, 21, 3) landmark array -> smoothed copy (the input when hand smoothing is off)."""
+        if self.hands is None or not len(hands):
+            return hands
+        return np.stack(self.hands.update(keys, hands, t)).astype(np.float32)
+
+    def smooth_packet(self, packet, t, lead=0.0):
+        lead = min(max(lead, 0.0), self.max_prediction)
+
+        if self.head is not None:
+            if packet["face_found"]:
+                pose = packet["head_pose"]
+                angles = self.head.update((pose["pitch"], pose["yaw"], pose["roll"]), t)
+                if lead:
+                    angles = self.head.predict(lead)
+                packet["head_pose"] = dict(zip(("pitch", "yaw", "roll"), angles.tolist()))
+            else:
+                self.head.reset()  # Start fresh when the face comes back
+
+        body = packet.get("body_pose")
+        if self.body is not None and body:
+            found = np.array([joint is not None for joint in body])
+            xy = np.array([(joint["x"], joint["y"]) if joint else (0, 0) for joint in body], dtype=np.float64)
+            xy = self.body.update(xy, t, found[:, None])
+            if lead:
+                xy = self.body.predict(lead)
+            packet["body_pose"] = [{**joint, "x": int(round(x)), "y": int(round(y))} if joint else None
+                                   for joint, (x, y) in zip(body, xy.tolist())]
+        elif self.body is not None:
+            self.body.reset()
+        return packet
@@ -0,0 +1,213 @@
+import abc
+import os
+import time
+
+import cv2
+import numpy as np
+
+from .telemetry import get_logger
+
+logger = get_logger("frame_source")
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+class FrameSource(abc.ABC):
+    """
+    Base class for frame sources. Mirrors the cv2.VideoCapture interface
+    (read / isOpened / release) so any source can be dropped into the pipeline.
+
+    Recorded sources run in one of two modes:
+    - as fast as possible (realtime=False): frames are returned immediately,
+      for throughput measurements;
+    - real-time paced (realtime=True): frames are released at `fps`, emulating
+      a live camera.
+    """
+
+    live = False  # True when frames arrive at wall-clock rate and may be dropped
+
+    def __init__(self, fps=30.0, realtime=False, loop=False):
+        self.fps = fps
+        self.realtime = realtime
+        self.loop = loop
+        self.frames_read = 0
+        self.started_at = None
+        self.live = self.live or realtime
+
+    def read(self):
+        frame = self.next_frame()
+        if frame is None and self.loop and self.rewind():
+            frame = self.next_frame()
+        if frame is None:
+            return False, None
+        self.pace()
+        self.frames_read += 1
+        return True, frame
+
+    def pace(self):
+        if not self.realtime or not self.fps:
+            return
+        if self.started_at is None:
+            self.started_at = time.perf_counter()
+        due = self.started_at + self.frames_read / self.fps
+        delay = due - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+    # --- Backend interface ---
+    @abc.abstractmethod
+    def next_frame(self):
+        """Return the next BGR frame, or None at the end of the stream."""
+
+    def rewind(self):
+        """Restart from the first frame. Returns False if the source cannot loop."""
+        return False
+
+    @abc.abstractmethod
+    def isOpened(self):
+        """False once a finite source has no more frames."""
+
+    def release(self):
+        pass
+
+
+class WebcamSource(FrameSource):
+    live = True
+
+    def __init__(self, index=0):
+        super().__init__(fps=None)
+        self.cap = cv2.VideoCapture(index)
+        # Only keep the newest frame in the driver; the capture thread reads continuously
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    def read(self):
+        # Empty reads from a live camera are transient, so pass them through
+        return self.cap.read()
+
+    def next_frame(self):
+        success, frame = self.cap.read()
+        return frame if success else None
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+
+class VideoFileSource(FrameSource):
+    def __init__(self, path, fps=None, realtime=False, loop=False):
+        self.path = path
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise IOError(f"Could not open video file: {path}")
+        fps = fps or self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        super().__init__(fps=fps, realtime=realtime, loop=loop)
+        self.finished = False
+
+    def next_frame(self):
+        success, frame = self.cap.read()
+        if not success:
+            self.finished = True
+            return None
+        return frame
+
+    def rewind(self):
+        self.finished = not self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        return not self.finished
+
+    def isOpened(self):
+        return self.cap.isOpened() and not self.finished
+
+    def release(self):
+        self.cap.release()
+
+
+class ImageDirectorySource(FrameSource):
+    """Plays back every image in a directory, in file name order."""
+
+    def __init__(self, path, fps=30.0, realtime=False, loop=False):
+        super().__init__(fps=fps, realtime=realtime, loop=loop)
+        self.paths = sorted(
+            os.path.join(path, name) for name in os.listdir(path)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        if not self.paths:
+            raise IOError(f"No images found in {path}")
+        self.index = 0
+
+    def next_frame(self):
+        while self.index < len(self.paths):
+            frame = cv2.imread(self.paths[self.index])
+            self.index += 1
+            if frame is not None:
+                return frame
+            logger.warning("Skipping unreadable image: %s", self.paths[self.index - 1],
+                           extra={"key": "unreadable_image"})
+        return None
+
+    def rewind(self):
+        self.index = 0
+        return True
+
+    def isOpened(self):
+        return self.loop or self.index < len(self.paths)
+
+
+class ArraySource(FrameSource):
+    """Plays back in-memory frames: a list of HxWx3 uint8 arrays or an (N, H, W, 3) array."""
+
+    def __init__(self, frames, fps=30.0, realtime=False, loop=False):
+        super().__init__(fps=fps, realtime=realtime, loop=loop)
+        self.frames = frames
+        self.index = 0
+
+    def next_frame(self):
+        if self.index >= len(self.frames):
+            return None
+        frame = self.frames[self.index]
+        self.index += 1
+        # Copy so downstream drawing never mutates the recording
+        return frame.copy()
+
+    def rewind(self):
+        self.index = 0
+        return len(self.frames) > 0
+
+    def isOpened(self):
+        return (self.loop and len(self.frames) > 0) or self.index < len(self.frames)
+
+
+def synthetic_frames(count, width=640, height=480, seed=0):
+    """
+    Deterministic synthetic clip for headless benchmarking: a noisy background
+    with a bright square drifting across it. Returns an (N, H, W, 3) uint8 array.
+    """
+    rng = np.random.default_rng(seed)
+    frames = rng.integers(0, 64, size=(count, height, width, 3), dtype=np.uint8)
+    size = max(min(width, height) // 6, 1)
+    for i in range(count):
+        x = int((width - size) * (i / max(count - 1, 1)))
+        y = (height - size) // 2
+        frames[i, y:y + size, x:x + size] = 220
+    return frames
+
+
+def open_source(spec="0", fps=None, realtime=False, loop=False):
+    """
+    Build a frame source from a command-line style spec:
+    - an integer ("0", "1", ...) opens that webcam,
+    - "synthetic" or "synthetic:N" generates N synthetic frames (default 300),
+    - a directory plays back its images,
+    - anything else is opened as a video file.
+    """
+    spec = str(spec)
+    if spec.isdigit():
+        return WebcamSource(int(spec))
+    if spec.startswith("synthetic"):
+        _, _, count = spec.partition(":")
+        frames = synthetic_frames(int(count) if count else 300)
+        return ArraySource(frames, fps=fps or 30.0, realtime=realtime, loop=loop)
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec, fps=fps or 30.0, realtime=realtime, loop=loop)
+    return VideoFileSource(spec, fps=fps, realtime=realtime, loop=loop)
@@ -0,0 +1,215 @@
+import collections
+import math
+
+import numpy as np
+
+from .landmark_arrays import WRIST
+
+INDEX_TIP = 8
+MIDDLE_MCP = 9
+CHANNELS = 4  # Wrist x, y, hand scale, index reach
+
+
+def motion_samples(hands):
+    """
+    (hands, 21, 2+) landmarks -> (hands, 4) float32 per-frame motion samples:
+    wrist x, y, hand scale (wrist to middle knuckle; grows as the hand comes
+    closer) and index reach (index tip to wrist, in hand scales; drops as the
+    finger curls).
+    """
+    samples = np.empty((len(hands), CHANNELS), np.float32)
+    samples[:, :2] = wrist = hands[:, WRIST, :2]
+    offsets = hands[:, [MIDDLE_MCP, INDEX_TIP], :2] - wrist[:, None]
+    lengths = np.hypot(offsets[..., 0], offsets[..., 1])
+    samples[:, 2] = lengths[:, 0]
+    samples[:, 3] = lengths[:, 1] / np.maximum(lengths[:, 0], 1e-6)
+    return samples
+
+
+class RunningExtreme:
+    """Sliding-window max (sign=1) or min (sign=-1) as a monotonic deque; amortised O(1) per push."""
+
+    def __init__(self, sign):
+        self.sign = sign
+        self.items = collections.deque()  # (sample number, value), values monotonic
+
+    def push(self, number, value, oldest):
+        while self.items and self.items[-1][1] * self.sign <= value * self.sign:
+            self.items.pop()
+        self.items.append((number, value))
+        while self.items[0][0] < oldest:
+            self.items.popleft()
+
+    @property
+    def value(self):
+        return self.items[0][1]
+
+
+class HandTrack:
+    """
+    Fixed-size history of one hand's motion samples in a numpy ring buffer.
+
+    Every sample is written twice (at i and i + size), so window() is always one
+    contiguous slice in time order without copying. The wrist x / y range and
+    path length over the window are updated incrementally on push().
+    """
+
+    def __init__(self, size=15):
+        self.size = size
+        self.buffer = np.zeros((2 * size, CHANNELS), np.float32)
+        self.times = np.zeros(2 * size)
+        self.steps = np.zeros(size)  # Wrist step length into each sample
+        self.count = 0  # Samples pushed in total
+        self.path_sum = 0.0  # Sum of self.steps
+        self.highs = [RunningExtreme(1), RunningExtreme(1)]
+        self.lows = [RunningExtreme(-1), RunningExtreme(-1)]
+        self.missing = 0  # Frames since this hand was last seen
+
+    def push(self, sample, timestamp):
+        i = self.count % self.size
+        step = 0.0
+        if self.count:
+            last = self.buffer[(self.count - 1) % self.size]
+            step = math.hypot(sample[0] - last[0], sample[1] - last[1])
+        self.path_sum += step - self.steps[i]
+        self.steps[i] = step
+        self.buffer[i] = self.buffer[i + self.size] = sample
+        self.times[i] = self.times[i + self.size] = timestamp
+        oldest = self.count + 1 - self.size
+        for axis in (0, 1):
+            self.highs[axis].push(self.count, float(sample[axis]), oldest)
+            self.lows[axis].push(self.count, float(sample[axis]), oldest)
+        self.count += 1
+        self.missing = 0
+
+    @property
+    def full(self):
+        return self.count >= self.size
+
+    def window(self):
+        """Samples in time order, oldest first: (min(count, size), 4)."""
+        if not self.full:
+            return self.buffer[:self.count]
+        start = self.count % self.size
+        return self.buffer[start:start + self.size]
+
+    @property
+    def x_range(self):
+        return self.highs[0].value - self.lows[0].value
+
+    @property
+    def y_range(self):
+        return self.highs[1].value - self.lows[1].value
+
+    @property
+    def path(self):
+        """Wrist path length over the window (the oldest sample's incoming step is not part of it)."""
+        if not self.full:
+            return self.path_sum
+        return self.path_sum - self.steps[self.count % self.size]
+
+    def velocity(self):
+        """Mean wrist velocity (x, y) over the window, per second."""
+        start = self.count % self.size if self.full else 0
+        end = (self.count - 1) % self.size
+        duration = self.times[end] - self.times[start]
+        if duration <= 0:
+            return 0.0, 0.0
+        return tuple(((self.buffer[end, :2] - self.buffer[start, :2]) / duration).tolist())
+
+    def direction(self):
+        """Direction of the net wrist motion in radians (image coordinates: y down)."""
+        vx, vy = self.velocity()
+        return math.atan2(vy, vx)
+
+
+class MotionFeatures:
+    """
+    Features of several hands' full windows, (hands, size, 4), computed together
+    in one vectorised pass; every attribute is a (hands,) array (`net`: (hands, 2)).
+    """
+
+    def __init__(self, windows, tracks):
+        self.x_range = np.array([t.x_range for t in tracks])
+        self.y_range = np.array([t.y_range for t in tracks])
+        self.path = np.array([t.path for t in tracks])
+
+        steps = windows[:, 1:] - windows[:, :-1]  # All channels at once
+        self.net = windows[:, -1, :2] - windows[:, 0, :2]
+        self.distance = np.hypot(self.net[:, 0], self.net[:, 1])
+        self.straightness = self.distance / np.maximum(self.path, 1e-6)
+
+        # Total signed turning of the wrist path; steps too small to have a heading are ignored
+        moving = np.hypot(steps[..., 0], steps[..., 1]) > 0.005
+        heading = np.arctan2(steps[..., 1], steps[..., 0])
+        turns = (heading[:, 1:] - heading[:, :-1] + np.pi) % (2 * np.pi) - np.pi
+        self.turning = (turns * (moving[:, 1:] & moving[:, :-1])).sum(axis=1)
+
+        self.scale_ratio = windows[:, -1, 2] / np.maximum(windows[:, 0, 2], 1e-6)
+
+        # Reach going down and up again: direction changes between clear moves, pauses skipped
+        reach_steps = steps[..., 3]
+        signs = np.sign(reach_steps) * (np.abs(reach_steps) > 0.08)
+        last = np.maximum.accumulate(np.where(signs != 0, np.arange(signs.shape[1]), 0), axis=1)
+        held = np.take_along_axis(signs, last, axis=1)  # Sign of the latest clear move
+        self.reach_reversals = (held[:, 1:] * held[:, :-1] < 0).sum(axis=1)
+
+
+# Motion gestures: (name, predicate over MotionFeatures -> (hands,) bool).
+# All are evaluated for all tracked hands at once; the first match in list order wins,
+# so the more specific gestures come first. Append to (or replace) the list for new ones.
+MOTION_GESTURES = [
+    ("circle", lambda f: (np.abs(f.turning) > 1.6 * np.pi) & (f.x_range > 0.06) & (f.y_range > 0.06)),
+    ("push", lambda f: (f.scale_ratio > 1.3) & (f.distance < 0.1)),
+    ("beckon", lambda f: (f.reach_reversals >= 3) & (f.x_range < 0.1) & (f.y_range < 0.1)),
+    ("swipe_right", lambda f: (f.net[:, 0] > 0.25) & (f.straightness > 0.8)),
+    ("swipe_left", lambda f: (f.net[:, 0] < -0.25) & (f.straightness > 0.8)),
+    ("swipe_up", lambda f: (f.net[:, 1] < -0.25) & (f.straightness > 0.8)),  # Y is inverted in image coordinates
+    ("swipe_down", lambda f: (f.net[:, 1] > 0.25) & (f.straightness > 0.8)),
+    ("wave_horizontal", lambda f: (f.x_range > 0.2) & (f.y_range < 0.1)),
+    ("wave_vertical", lambda f: (f.y_range > 0.2) & (f.x_range < 0.1)),
+]
+
+
+class GestureTracker:
+    """
+    Motion gestures per tracked hand: one HandTrack per key (e.g. MediaPipe
+    handedness), so different hands never share a history. A track is dropped
+    after `max_missing` frames without its hand; gestures are only reported
+    once a track has a full window.
+    """
+
+    def __init__(self, size=15, gestures=None, max_missing=3):
+        self.size = size
+        self.gestures = MOTION_GESTURES if gestures is None else gestures
+        self.max_missing = max_missing
+        self.tracks = {}
+
+    def update(self, keys, hands, timestamp):
+        """
+        Feeds one frame: `hands` is the frame's (hands, 21, 2+) landmark array,
+        `keys` one key per hand. Returns one gesture name (or "none") per hand.
+        """
+        for track in self.tracks.values():
+            track.missing += 1
+        samples = motion_samples(hands) if len(hands) else ()
+        for key, sample in zip(keys, samples):
+            track = self.tracks.get(key)
+            if track is None:
+                track = self.tracks[key] = HandTrack(self.size)
+            track.push(sample, timestamp)
+        for key in [k for k, t in self.tracks.items() if t.missing > self.max_missing]:
+            del self.tracks[key]
+
+        results = ["none"] * len(keys)
+        ready = [(i, self.tracks[key]) for i, key in enumerate(keys) if self.tracks[key].full]
+        if not ready or not self.gestures:
+            return results
+        tracks = [track for _, track in ready]
+        features = MotionFeatures(np.stack([track.window() for track in tracks]), tracks)
+        matches = np.stack([predicate(features) for _, predicate in self.gestures])  # (gestures, hands)
+        first = matches.argmax(axis=0)
+        for (i, _), gesture, matched in zip(ready, first.tolist(), matches.any(axis=0).tolist()):
+            if matched:
+                results[i] = self.gestures[gesture][0]
+        return results
@@ -0,0 +1,78 @@
+import numpy as np
+
+# MediaPipe hand indices
+WRIST = 0
+FINGER_TIPS = [4, 8, 12, 16, 20]  # Thumb .. pinky
+FINGER_PIPS = [2, 6, 10, 14, 18]
+_TIPS_PIPS = np.array(FINGER_TIPS + FINGER_PIPS)
+
+
+def landmark_array(landmarks, dims=3):
+    """
+    MediaPipe landmarks -> contiguous (n, dims) float32 array of x, y (, z);
+    arrays pass through. dims=2 for landmark-like objects without z.
+    """
+    if isinstance(landmarks, np.ndarray):
+        return np.ascontiguousarray(landmarks, dtype=np.float32)
+    if dims == 2:
+        return np.array([(lm.x, lm.y) for lm in landmarks], dtype=np.float32).reshape(-1, 2)
+    return np.array([(lm.x, lm.y, lm.z) for lm in landmarks], dtype=np.float32).reshape(-1, 3)
+
+
+def hands_array(hand_landmarks, dims=3):
+    """List of MediaPipe hands -> (hands, 21, dims) float32; arrays pass through."""
+    if isinstance(hand_landmarks, np.ndarray):
+        return np.ascontiguousarray(hand_landmarks, dtype=np.float32)
+    if not hand_landmarks:
+        return np.empty((0, 21, dims), np.float32)
+    if dims == 2:
+        flat = [(lm.x, lm.y) for hand in hand_landmarks for lm in hand]
+    else:
+        flat = [(lm.x, lm.y, lm.z) for hand in hand_landmarks for lm in hand]
+    return np.array(flat, dtype=np.float32).reshape(len(hand_landmarks), -1, dims)
+
+
+def distances(points, a, b):
+    """2D distance between landmarks a and b (indices or index lists) of (..., n, 2+) points."""
+    return np.linalg.norm(points[..., a, :2] - points[..., b, :2], axis=-1)
+
+
+def fingers_extended(hands):
+    """(..., 5) bool, thumb .. pinky: the tip is further from the wrist than the PIP joint."""
+    offsets = hands[..., _TIPS_PIPS, :2] - hands[..., WRIST:WRIST + 1, :2]
+    squared = np.einsum("...i,...i->...", offsets, offsets)  # Same order as the distances, without the sqrt
+    return squared[..., :5] > squared[..., 5:]
+
+
+def bounding_boxes(points):
+    """(..., 4) x_min, y_min, x_max, y_max of (..., n, 2+) points."""
+    xy = points[..., :2]
+    return np.concatenate([xy.min(axis=-2), xy.max(axis=-2)], axis=-1)
+
+
+def pixel_points(points, img_w, img_h):
+    """(..., 2) int32 pixels, truncated like int(lm.x * img_w) (the product is taken in float64)."""
+    return (points[..., :2].astype(np.float64) * (img_w, img_h)).astype(np.int32)
+
+
+class FrameLandmarks:
+    """
+    One frame's MediaPipe results as arrays, converted once so every gesture /
+    pose helper works on numpy instead of landmark attribute reads:
+    `face` (468+, 3) or None for the first face, `hands` (hands, 21, 3) and
+    `extended` (hands, 5), the finger flags every hand-shape check starts from.
+    """
+    __slots__ = ("face", "hands", "extended")
+
+    def __init__(self, face=None, hands=None):
+        self.face = face
+        self.hands = hands if hands is not None else hands_array(None)
+        self.extended = fingers_extended(self.hands)
+
+    @classmethod
+    def from_results(cls, face_results, hand_results):
+        face = None
+        if face_results is not None and face_results.face_landmarks:
+            face = landmark_array(face_results.face_landmarks[0])
+        hands = hands_array(hand_results.hand_landmarks if hand_results is not None else None)
+        return cls(face, hands)
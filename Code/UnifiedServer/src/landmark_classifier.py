@@ -0,0 +1,59 @@
+import pickle
+
+import numpy as np
+
+# Same label groups as the skeleton CNN (cnn8grps_rad1_model.h5), so apply_rules works unchanged:
+# 0: Aemnst, 1: bdfikruvw, 2: c0, 3: gh, 4: l, 5: pqz, 6: x, 7: yj
+GROUPS = 8
+CANVAS_SIZE = 400
+
+
+def landmark_features(points):
+    """
+    21 skeleton points (on the CNN's 400x400 canvas, see ASLClassifier.skeleton_points)
+    -> (1, 42) float32: offsets from the wrist divided by the canvas size. The hand's
+    pixel size is kept on purpose; the CNN sees it too and apply_rules depends on it.
+    """
+    pts = np.asarray(points, dtype=np.float32).reshape(21, 2)
+    return ((pts - pts[0]) / CANVAS_SIZE).reshape(1, 42)
+
+
+class LandmarkClassifier:
+    """
+    Small MLP over landmark_features() that predicts the same 8 label groups as the
+    skeleton CNN, without rendering an image. Trained (distilled from the CNN) with
+    scikit-learn by tests/distill_asl_landmarks.py; only the weights are stored, and
+    the forward pass is plain numpy.
+    """
+
+    def __init__(self, coefs, intercepts, classes):
+        self.coefs = [np.asarray(c, dtype=np.float32) for c in coefs]
+        self.intercepts = [np.asarray(b, dtype=np.float32) for b in intercepts]
+        self.classes = np.asarray(classes, dtype=np.int64)
+
+    @classmethod
+    def from_sklearn(cls, mlp):
+        """From a fitted sklearn MLPClassifier (relu hidden layers, softmax output)."""
+        if mlp.activation != "relu" or len(mlp.classes_) < 3:
+            raise ValueError("expected a relu MLPClassifier trained on at least 3 groups")
+        return cls(mlp.coefs_, mlp.intercepts_, mlp.classes_)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls(**pickle.load(f))
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            pickle.dump({"coefs": self.coefs, "intercepts": self.intercepts, "classes": self.classes}, f)
+
+    def predict_proba(self, features):
+        """(n, 42) features -> (n, GROUPS) probabilities; groups missing from training get 0."""
+        x = np.asarray(features, dtype=np.float32)
+        for weight, bias in zip(self.coefs[:-1], self.intercepts[:-1]):
+            x = np.maximum(x @ weight + bias, 0)
+        logits = x @ self.coefs[-1] + self.intercepts[-1]
+        logits = np.exp(logits - logits.max(axis=1, keepdims=True))
+        probs = np.zeros((len(x), GROUPS), dtype=np.float32)
+        probs[:, self.classes] = logits / logits.sum(axis=1, keepdims=True)
+        return probs
@@ -0,0 +1,278 @@
+import collections
+import threading
+import time
+
+from .telemetry import get_logger
+from .utils.queues import DropOldestQueue
+
+logger = get_logger("pipeline")
+
+
+class FrameTask:
+    """One captured frame travelling through the pipeline, plus the output of every stage."""
+
+    def __init__(self, frame_id, timestamp, image):
+        self.frame_id = frame_id
+        self.timestamp = timestamp  # time.time() at capture
+        self.image = image          # BGR frame as read from the source
+        self.image_rgb = None
+        self.results = {}           # stage name -> stage output
+        self.timings = {}           # stage name -> latency in ms
+        self.result_age = {}        # stage name -> age in ms of a carried-over result (0 = fresh)
+        self.skipped = []           # scheduled stages that did not run on this frame
+        self.deferred = []          # stages waiting for the stages they run `after`
+        self.packet = None
+
+
+class Stage:
+    """
+    A model stage: `workers` threads pull frames from a bounded drop-oldest queue,
+    run fn(task) and store the return value in task.results[name].
+    fn must be safe to call from several threads when workers > 1.
+    With a `schedule` (src/scheduler.py) frames it skips never enter the queue;
+    they get the schedule's carried-over result, resolved at aggregation time
+    (in frame order, so every earlier run has finished by then).
+    A stage with `after` (names of other stages) only receives a frame once
+    those stages have stored their results for it.
+    """
+
+    def __init__(self, name, fn, workers=1, queue_size=2, schedule=None, after=()):
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.queue = DropOldestQueue(queue_size)
+        self.schedule = schedule
+        self.after = tuple(after)
+
+
+class Pipeline:
+    """
+    Streaming pipeline: capture -> model stages -> aggregation -> output.
+
+    - A capture thread reads frames continuously (so the driver buffer never
+      fills up), runs the cheap `prepare(task)` hook (e.g. colour conversion)
+      and fans every frame out to all model stages.
+    - Model stages run concurrently, each with its own worker threads.
+    - Finished frames are re-ordered by frame id and passed to `aggregate(task)`
+      on a single thread; it returns the packet and may keep state across frames.
+    - `emit(task, packet)` runs on a dedicated sender thread.
+
+    Every hand-off goes through a bounded drop-oldest queue, so throughput is
+    limited by the slowest stage and a slow stage skips frames instead of
+    building up latency. With drop_frames=False every hand-off waits for room
+    instead (capture for the model stages, the stages for aggregation,
+    aggregation for the sender), so every frame of a recorded source is processed.
+
+    The most recent emitted task is published on `outputs` (for display on the
+    caller's thread) and kept in `latest` (for low-rate observers like a preview).
+    """
+
+    def __init__(self, capture, stages, aggregate, emit, prepare=None, queue_size=2,
+                 drop_frames=True):
+        self.capture = capture
+        self.drop_frames = drop_frames
+        self.prepare = prepare
+        self.stages = stages
+        self.aggregate = aggregate
+        self.emit = emit
+        self.ready = DropOldestQueue(queue_size)
+        self.sending = DropOldestQueue(queue_size)
+        self.outputs = DropOldestQueue(1)
+        self.latest = None  # most recently emitted task
+        self.inflight = collections.OrderedDict()  # frame_id -> [task, stages remaining]
+        self.lock = threading.Lock()
+        self.release_lock = threading.Lock()  # One release() at a time, so frames stay in order
+        self.threads = []
+        self.running = False
+        self.capture_done = False
+        self.active = 0  # frames captured but not yet emitted or dropped
+        self.captured = 0
+        self.emitted = 0
+        self.started_at = None
+
+    # --- Lifecycle ---
+    def start(self):
+        self.running = True
+        self.started_at = time.time()
+        self.spawn(self.run_capture)
+        for stage in self.stages:
+            for _ in range(stage.workers):
+                self.spawn(self.run_stage, stage)
+        self.spawn(self.run_aggregate)
+        self.spawn(self.run_sender)
+        return self
+
+    def spawn(self, target, *args):
+        thread = threading.Thread(target=target, args=args, daemon=True)
+        thread.start()
+        self.threads.append(thread)
+
+    def finished(self):
+        """True once a finite source is exhausted and every frame has left the pipeline."""
+        with self.lock:
+            return self.capture_done and self.active == 0
+
+    def stop(self):
+        self.running = False
+        for q in [stage.queue for stage in self.stages] + [self.ready, self.sending, self.outputs]:
+            q.close()
+        for thread in self.threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=1.0)
+
+    # --- Threads ---
+    def run_capture(self):
+        frame_id = 0
+        while self.running and self.capture.isOpened():
+            success, image = self.capture.read()
+            if not success:
+                logger.warning("Ignoring empty camera frame.", extra={"key": "empty_frame"})
+                continue
+
+            task = FrameTask(frame_id, time.time(), image)
+            frame_id += 1
+            if self.prepare is not None:
+                self.prepare(task)
+            self.captured += 1
+            with self.lock:
+                self.active += 1
+                self.inflight[task.frame_id] = [task, len(self.stages)]
+            if not self.stages:
+                self.release()
+            for stage in self.stages:
+                if stage.schedule is not None and not stage.schedule.should_run(task):
+                    task.skipped.append(stage)
+                    self.complete(task)
+                    continue
+                if stage.after:
+                    with self.lock:
+                        task.deferred.append(stage)
+                    continue
+                self.enqueue(stage, task)
+            self.dispatch_deferred(task)  # in case everything it waits for was skipped
+        # Finite sources end here; the remaining frames still drain through
+        self.capture_done = True
+
+    def run_stage(self, stage):
+        while self.running:
+            task = stage.queue.get(timeout=0.1)
+            if task is None:
+                continue
+            start = time.perf_counter()
+            try:
+                task.results[stage.name] = stage.fn(task)
+            except Exception:
+                logger.exception("Stage %s failed", stage.name, extra={"key": f"stage:{stage.name}"})
+                task.results[stage.name] = None
+            task.timings[stage.name] = (time.perf_counter() - start) * 1000
+            if stage.schedule is not None:
+                stage.schedule.record(task, task.results[stage.name])
+                task.result_age[stage.name] = 0.0
+            self.dispatch_deferred(task)
+            self.complete(task)
+
+    def enqueue(self, stage, task):
+        evicted = stage.queue.put(task, block=not self.drop_frames)
+        if evicted is not None:
+            self.discard(evicted)
+
+    def dispatch_deferred(self, task):
+        """Hand the frame to deferred stages whose `after` stages are all done (or skipped)."""
+        if not task.deferred:
+            return
+        skipped = {stage.name for stage in task.skipped}
+        with self.lock:
+            ready = [stage for stage in task.deferred
+                     if all(name in task.results or name in skipped for name in stage.after)]
+            for stage in ready:
+                task.deferred.remove(stage)
+        for stage in ready:
+            self.enqueue(stage, task)
+
+    def run_aggregate(self):
+        while self.running:
+            task = self.ready.get(timeout=0.1)
+            if task is None:
+                continue
+            start = time.perf_counter()
+            for stage in task.skipped:
+                result, age = stage.schedule.carry(task)
+                task.results[stage.name] = result
+                if age is not None:
+                    task.result_age[stage.name] = age
+            try:
+                task.packet = self.aggregate(task)
+            except Exception:
+                logger.exception("Aggregation failed", extra={"key": "aggregate"})
+                self.retire()
+                continue
+            task.timings["aggregate"] = (time.perf_counter() - start) * 1000
+            if self.sending.put(task, block=not self.drop_frames) is not None:
+                self.retire()
+
+    def run_sender(self):
+        while self.running:
+            task = self.sending.get(timeout=0.1)
+            if task is None:
+                continue
+            start = time.perf_counter()
+            try:
+                self.emit(task, task.packet)
+            except Exception:
+                logger.exception("Emit failed", extra={"key": "emit"})
+            task.timings["emit"] = (time.perf_counter() - start) * 1000
+            self.emitted += 1
+            self.latest = task
+            self.outputs.put(task)
+            self.retire()
+
+    # --- Re-ordering ---
+    def complete(self, task):
+        with self.lock:
+            entry = self.inflight.get(task.frame_id)
+            if entry is None:
+                return  # dropped by another stage
+            entry[1] -= 1
+        self.release()
+
+    def discard(self, task):
+        with self.lock:
+            if self.inflight.pop(task.frame_id, None) is not None:
+                self.active -= 1
+        self.release()
+
+    def retire(self):
+        with self.lock:
+            self.active -= 1
+
+    def release(self):
+        """Forward finished frames to aggregation, strictly in frame order."""
+        # The put may wait for the aggregation thread, which needs self.lock to retire
+        # frames, so it happens outside it; release_lock keeps concurrent callers in order
+        with self.release_lock:
+            finished = []
+            with self.lock:
+                while self.inflight:
+                    frame_id, (task, remaining) = next(iter(self.inflight.items()))
+                    if remaining > 0:
+                        break
+                    del self.inflight[frame_id]
+                    finished.append(task)
+            for task in finished:
+                if self.ready.put(task, block=not self.drop_frames) is not None:
+                    self.retire()
+
+    # --- Introspection ---
+    def stats(self):
+        elapsed = max(time.time() - self.started_at, 1e-6) if self.started_at else 0.0
+        return {
+            "captured": self.captured,
+            "emitted": self.emitted,
+            "fps": self.emitted / elapsed if elapsed else 0.0,
+            "scheduled": {stage.name: stage.schedule.stats() for stage in self.stages if stage.schedule is not None},
+            "dropped": {
+                **{stage.name: stage.queue.dropped for stage in self.stages},
+                "aggregate": self.ready.dropped,
+                "emit": self.sending.dropped,
+            },
+        }
@@ -0,0 +1,54 @@
+import threading
+import time
+
+import cv2
+
+from .telemetry import get_logger
+
+logger = get_logger("preview")
+
+
+class PreviewThread:
+    """
+    Low-rate debug preview for headless runs: every 1/fps seconds it takes the
+    most recently emitted frame from the pipeline, renders the overlay and
+    shows it. The vision threads never touch OpenCV's GUI.
+    Key presses in the preview window are forwarded to on_key(key).
+    """
+
+    def __init__(self, pipeline, render, fps=5.0, window_name="Unified CV Server (preview)", on_key=None):
+        self.pipeline = pipeline
+        self.render = render
+        self.interval = 1.0 / fps
+        self.window_name = window_name
+        self.on_key = on_key
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        return self
+
+    def run(self):
+        last_frame_id = None
+        while self.running:
+            start = time.perf_counter()
+            task = self.pipeline.latest
+            if task is not None and task.frame_id != last_frame_id:
+                last_frame_id = task.frame_id
+                try:
+                    cv2.imshow(self.window_name, self.render(task))
+                except Exception:
+                    logger.exception("Preview rendering failed", extra={"key": "preview"})
+            key = cv2.waitKey(1) & 0xFF
+            if key != 0xFF and self.on_key is not None:
+                self.on_key(key)
+            time.sleep(max(0.0, self.interval - (time.perf_counter() - start)))
+        cv2.destroyWindow(self.window_name)
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(timeout=1.0)
@@ -0,0 +1,132 @@
+import threading
+
+import cv2
+import numpy as np
+
+from .landmark_arrays import hands_array
+
+THUMBNAIL_SIZE = (32, 24)
+
+
+def thumbnail(task):
+    """Small grayscale copy of the frame for cheap frame differencing; computed once per task."""
+    thumb = getattr(task, "thumbnail", None)
+    if thumb is None:
+        gray = cv2.cvtColor(task.image, cv2.COLOR_BGR2GRAY)
+        thumb = task.thumbnail = cv2.resize(gray, THUMBNAIL_SIZE, interpolation=cv2.INTER_AREA).astype(np.int16)
+    return thumb
+
+
+class HandMotion:
+    """
+    Tracks how far the hands moved between consecutive frames (max landmark
+    displacement in normalised image coordinates). Fed from the aggregation
+    step with the frame's (hands, 21, 3) landmark array (or MediaPipe hand
+    landmarks); read by schedules as a trigger.
+    """
+
+    def __init__(self):
+        self.previous = None
+        self.value = 0.0
+
+    def update(self, hand_landmarks):
+        if hand_landmarks is None or len(hand_landmarks) == 0:
+            # Hands appearing or disappearing counts as motion
+            self.value = float("inf") if self.previous is not None else 0.0
+            self.previous = None
+            return self.value
+        points = hands_array(hand_landmarks, dims=2)[..., :2]
+        if self.previous is None or self.previous.shape != points.shape:
+            self.value = float("inf")
+        else:
+            self.value = float(np.abs(points - self.previous).max())
+        self.previous = points
+        return self.value
+
+
+def extrapolate_body_pose(previous, last, factor):
+    """Constant-velocity extrapolation of OpenPose joints; joints missing in either result are kept as-is."""
+    if not previous or not last or len(previous) != len(last):
+        return last
+    parts = []
+    for old, new in zip(previous, last):
+        if old is None or new is None:
+            parts.append(new)
+            continue
+        parts.append({**new,
+                      "x": int(round(new["x"] + (new["x"] - old["x"]) * factor)),
+                      "y": int(round(new["y"] + (new["y"] - old["y"]) * factor))})
+    return parts
+
+
+class Schedule:
+    """
+    Decides per frame whether a model stage runs, and what it reports when it doesn't.
+
+    - Fixed cadence: the model runs at least every `every` frames.
+    - Adaptive: it also runs early when the frame changed by more than
+      `diff_threshold` (mean absolute grayscale difference, 0-255) since its
+      last run, or when `hand_motion` reports hands moving more than
+      `hand_threshold`.
+
+    Skipped frames reuse the newest result, or extrapolate it from the last
+    two results with `extrapolate(previous, last, factor)` (at most one run
+    interval ahead); carry() also returns how old that result is.
+    """
+
+    def __init__(self, every=1, diff_threshold=None, hand_motion=None, hand_threshold=None, extrapolate=None):
+        self.every = max(1, every)
+        self.diff_threshold = diff_threshold
+        self.hand_motion = hand_motion
+        self.hand_threshold = hand_threshold
+        self.extrapolate = extrapolate
+        self.last_run = None        # frame id of the last scheduled run
+        self.reference = None       # thumbnail of that frame
+        self.results = []           # newest few (frame_id, timestamp, result), oldest first
+        self.runs = 0
+        self.skips = 0
+        self.lock = threading.Lock()
+
+    def should_run(self, task):
+        """Called on the capture thread for every frame."""
+        run = self.last_run is None or task.frame_id - self.last_run >= self.every
+        if not run and self.diff_threshold is not None and self.reference is not None:
+            run = np.abs(thumbnail(task) - self.reference).mean() > self.diff_threshold
+        if not run and self.hand_motion is not None and self.hand_threshold is not None:
+            run = self.hand_motion.value > self.hand_threshold
+        if run:
+            self.last_run = task.frame_id
+            if self.diff_threshold is not None:
+                self.reference = thumbnail(task)
+            self.runs += 1
+        else:
+            self.skips += 1
+        return run
+
+    def record(self, task, result):
+        """Called by the stage worker after the model ran on `task`."""
+        with self.lock:
+            if self.results and task.frame_id <= self.results[-1][0]:
+                return  # An older frame finished late (several workers)
+            self.results = self.results[-2:] + [(task.frame_id, task.timestamp, result)]
+
+    def carry(self, task):
+        """
+        Result for a skipped frame: the newest one from a frame at or before it,
+        and its age in ms (None, None before the first run finished).
+        """
+        with self.lock:
+            results = [entry for entry in self.results if entry[0] <= task.frame_id]
+        if not results:
+            return None, None
+        last_id, last_time, last = results[-1]
+        age = (task.timestamp - last_time) * 1000
+        if self.extrapolate is not None and len(results) >= 2 and task.frame_id > last_id:
+            previous_id, _, previous = results[-2]
+            factor = min((task.frame_id - last_id) / max(last_id - previous_id, 1), 1.0)
+            return self.extrapolate(previous, last, factor), age
+        return last, age
+
+    def stats(self):
+        total = self.runs + self.skips
+        return {"runs": self.runs, "skipped": self.skips, "run_ratio": self.runs / total if total else 0.0}
@@ -0,0 +1,300 @@
+import os
+import threading
+import time
+from concurrent.futures import Future
+
+import cv2
+import numpy as np
+import torch
+from torch import nn
+
+from .landmark_arrays import bounding_boxes, hands_array
+from .signdetr_model import build_2d_sincos_position_embedding
+from .telemetry import get_logger
+from .utils.boxes import box_xyxy_to_cxcywh, rescale_bboxes
+from .utils.queues import DropOldestQueue
+from .utils.setup import is_stale
+
+try:
+    import onnxruntime
+except ImportError:
+    onnxruntime = None
+
+INPUT_SIZE = 224
+MEAN = (0.485, 0.456, 0.406)
+STD = (0.229, 0.224, 0.225)
+QUANTIZED_BACKENDS = ("int8", "dynamic", "fp16")  # See src/signdetr_quant.py
+BACKENDS = ("eager", "torchscript", "onnx") + QUANTIZED_BACKENDS
+
+logger = get_logger("signdetr")
+
+_MEAN_255 = torch.tensor(MEAN).view(3, 1, 1) * 255.0
+_STD_255 = torch.tensor(STD).view(3, 1, 1) * 255.0
+
+
+def preprocess(image_rgb, out=None):
+    """
+    Resize + normalise one RGB uint8 frame into `out` (3, 224, 224) float32,
+    matching the albumentations Resize/Normalize/ToTensorV2 transform.
+    """
+    if out is None:
+        out = torch.empty(3, INPUT_SIZE, INPUT_SIZE)
+    resized = cv2.resize(image_rgb, (INPUT_SIZE, INPUT_SIZE), interpolation=cv2.INTER_LINEAR)
+    out.copy_(torch.from_numpy(np.ascontiguousarray(resized)).permute(2, 0, 1))
+    out.sub_(_MEAN_255).div_(_STD_255)
+    return out
+
+
+def hand_rois(hand_landmarks, width, height, padding=0.25, min_size=64):
+    """
+    One square crop (x1, y1, x2, y2) in pixels per hand (MediaPipe hands or a
+    (hands, 21, 2+) landmark array): the landmark bounding box grown by `padding`
+    of its longest side on every side, at least `min_size` pixels, shifted /
+    clipped to stay inside the frame. Square so the 224x224 resize keeps the
+    hand's aspect ratio.
+    """
+    rois = []
+    boxes = bounding_boxes(hands_array(hand_landmarks, dims=2)).astype(np.float64) * (width, height, width, height)
+    for x_min, y_min, x_max, y_max in boxes.tolist():
+        side = max(x_max - x_min, y_max - y_min) * (1 + 2 * padding)
+        side = int(min(max(side, min_size), width, height))
+        cx, cy = (x_min + x_max) / 2, (y_min + y_max) / 2
+        x1 = int(min(max(cx - side / 2, 0), width - side))
+        y1 = int(min(max(cy - side / 2, 0), height - side))
+        rois.append((x1, y1, x1 + side, y1 + side))
+    return rois
+
+
+def merge_roi_outputs(outputs, rois, width, height):
+    """
+    Maps per-crop DETR outputs back onto the full frame: boxes go from crop-relative
+    cxcywh through rescale_bboxes (crop pixels) plus the crop offset to cxcywh
+    normalised by the frame size, and the queries of all crops are concatenated,
+    so the result reads like a full-frame DETR output.
+    """
+    logits, boxes = [], []
+    for output, (x1, y1, x2, y2) in zip(outputs, rois):
+        frame_boxes = rescale_bboxes(output["pred_boxes"][0], (x2 - x1, y2 - y1))
+        frame_boxes = (frame_boxes + torch.tensor([x1, y1, x1, y1], dtype=torch.float32)) / \
+            torch.tensor([width, height, width, height], dtype=torch.float32)
+        logits.append(output["pred_logits"][0])
+        boxes.append(box_xyxy_to_cxcywh(frame_boxes))
+    return {"pred_logits": torch.cat(logits)[None], "pred_boxes": torch.cat(boxes)[None], "rois": rois}
+
+
+class CachedDETR(nn.Module):
+    """
+    Inference-only forward of a trained DETR with the per-call constants hoisted out:
+    the 2D sin-cos positional embedding is cached per feature-map shape, and the
+    decoder target norm_tgt(0 + query_pos) is computed once (it only depends on
+    weights). Shares all weights with `model`; the result matches model.forward.
+    """
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+        self.pos_cache = {}
+        with torch.no_grad():
+            tgt = model.norm_tgt(model.query_pos).unsqueeze(0)  # (1, num_queries, d)
+        self.register_buffer("tgt", tgt, persistent=False)
+
+    def position_embedding(self, height, width, dim, device):
+        key = (height, width, dim, str(device))
+        pos = self.pos_cache.get(key)
+        if pos is None:
+            pos = self.pos_cache[key] = build_2d_sincos_position_embedding(height, width, dim, device=device)
+        return pos
+
+    def features(self, inputs):
+        """ResNet-50 trunk + 1x1 conv: (b, 3, H, W) -> (b, d, Hf, Wf)."""
+        m = self.model
+        x = m.backbone.maxpool(m.backbone.relu(m.backbone.bn1(m.backbone.conv1(inputs))))
+        x = m.backbone.layer4(m.backbone.layer3(m.backbone.layer2(m.backbone.layer1(x))))
+        return m.conv(x)
+
+    def forward(self, inputs):
+        m = self.model
+        feat = self.features(inputs)
+        bsz, d_model, Hf, Wf = feat.shape
+        src = feat.flatten(2).permute(0, 2, 1)
+        src = m.norm_src(src + self.position_embedding(Hf, Wf, d_model, feat.device))
+
+        hs = m.transformer(src=src, tgt=self.tgt.expand(bsz, -1, -1))
+        return m.linear_class(hs), m.linear_bbox(hs).sigmoid()
+
+
+def artifact_path(model_path, backend):
+    """Exported graphs are cached next to the checkpoint, e.g. models/signdetr.torchscript.pt."""
+    root, _ = os.path.splitext(model_path)
+    return root + (".onnx" if backend == "onnx" else f".{backend}.pt")
+
+
+def export_torchscript(cached, path, device, batch=1, optimize=True):
+    """Trace, freeze and optimise the cached forward (conv+bn folding and other graph fusions)."""
+    example = torch.zeros(batch, 3, INPUT_SIZE, INPUT_SIZE, device=device)
+    with torch.no_grad():
+        traced = torch.jit.trace(cached, example, check_trace=False)
+        frozen = torch.jit.freeze(traced.eval())
+        if optimize:
+            frozen = torch.jit.optimize_for_inference(frozen)
+    if path is not None:
+        torch.jit.save(frozen, path)
+    return frozen
+
+
+def export_onnx(cached, path, device):
+    example = torch.zeros(1, 3, INPUT_SIZE, INPUT_SIZE, device=device)
+    with torch.no_grad():
+        torch.onnx.export(cached, example, path, input_names=["images"],
+                          output_names=["pred_logits", "pred_boxes"],
+                          dynamic_axes={"images": {0: "batch"}, "pred_logits": {0: "batch"}, "pred_boxes": {0: "batch"}},
+                          opset_version=17, dynamo=False)
+
+
+class SignDETREngine:
+    """
+    Optimised SignDETR inference.
+
+    - Preprocessing (resize to 224 + ImageNet normalisation, same result as the
+      albumentations transform in main.py) writes straight into a preallocated
+      (max_batch, 3, 224, 224) input buffer, pinned when running on CUDA.
+    - The forward runs through CachedDETR, optionally exported to TorchScript
+      (frozen and fused) or ONNX Runtime with full graph optimisation, or
+      quantised for CPU (see src/signdetr_quant.py; "int8" calibrates on
+      `calibration` frames, for the `quantized_engine` kernels). Exported
+      graphs are cached next to the checkpoint and rebuilt when it changes.
+    - infer_rois() runs only the hand crops of a frame (see hand_rois), batched.
+    - infer_batch() runs several frames (e.g. one per camera) in one forward;
+      with batch_wait_ms > 0, concurrent infer() calls from different threads
+      are micro-batched the same way by a background thread.
+
+    Outputs are returned on the CPU in the shape of DETR.forward, so the
+    existing post-processing in main.py works unchanged. Create the engine
+    after loading the checkpoint: the cached query target is taken from the
+    weights at construction time.
+    """
+
+    def __init__(self, model, device="cpu", backend="eager", model_path=None,
+                 max_batch=4, batch_wait_ms=0.0, calibration=None, quantized_engine=None):
+        if backend not in BACKENDS:
+            raise ValueError(f"unknown SignDETR backend: {backend}")
+        self.device = torch.device(device)
+        self.max_batch = max_batch
+        self.batch_wait = batch_wait_ms / 1000.0
+        self.cached = CachedDETR(model.eval()).to(self.device).eval()
+
+        pin = self.device.type == "cuda"
+        self.buffer = torch.empty(max_batch, 3, INPUT_SIZE, INPUT_SIZE, pin_memory=pin)
+        self.lock = threading.Lock()
+
+        self.backend = "eager"
+        self.forward = self.cached
+        if backend != "eager":
+            self.load_backend(backend, model_path, calibration, quantized_engine)
+
+        self.requests = None
+        if self.batch_wait > 0:
+            self.requests = DropOldestQueue(maxsize=4 * max_batch)
+            threading.Thread(target=self.run_batcher, daemon=True).start()
+
+    def load_backend(self, backend, model_path, calibration=None, quantized_engine=None):
+        """
+        Switches the forward to `backend`, exporting it if the cached artifact is stale.
+
+        Quantised backends run on the process-wide torch.backends.quantized.engine
+        ("x86", "fbgemm", "qnnpack", ...; default: the current one). It is set here,
+        once, when a quantised backend is selected: the int8 calibration's qconfig and
+        the kernels at inference must use the same engine, and every other quantised
+        module in the process shares the setting.
+        """
+        path = artifact_path(model_path, backend) if model_path else None
+        try:
+            if backend in QUANTIZED_BACKENDS:
+                from .signdetr_quant import QuantizedDETR
+                if self.device.type != "cpu":
+                    raise RuntimeError("quantised SignDETR only runs on the CPU")
+                if quantized_engine is not None:
+                    torch.backends.quantized.engine = quantized_engine
+                if path is not None and not is_stale(path, model_path):
+                    self.forward = torch.jit.load(path)
+                else:
+                    quantized = QuantizedDETR(self.cached.model, backend, calibration)
+                    self.forward = export_torchscript(quantized, path, self.device, optimize=False)
+            elif backend == "onnx":
+                if onnxruntime is None:
+                    raise RuntimeError("onnxruntime is not installed")
+                if path is None:
+                    raise RuntimeError("the ONNX backend needs model_path to cache the export")
+                if is_stale(path, model_path):
+                    export_onnx(self.cached, path, self.device)
+                options = onnxruntime.SessionOptions()
+                options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+                session = onnxruntime.InferenceSession(path, options, providers=onnxruntime.get_available_providers())
+                self.forward = lambda images: tuple(
+                    torch.from_numpy(out) for out in session.run(None, {"images": images.cpu().numpy()}))
+            elif path is not None and not is_stale(path, model_path):
+                self.forward = torch.jit.load(path, map_location=self.device)
+            else:
+                self.forward = export_torchscript(self.cached, path, self.device)
+            self.backend = backend
+            logger.info("SignDETR engine using %s%s", backend, f" ({path})" if path else "")
+        except Exception as e:
+            logger.warning("SignDETR %s export failed, using eager PyTorch: %s", backend, e)
+
+    def infer_batch(self, images):
+        """Runs up to max_batch RGB frames in one forward; returns one DETR-style output dict per frame."""
+        results = []
+        for start in range(0, len(images), self.max_batch):
+            chunk = images[start:start + self.max_batch]
+            with self.lock:  # The input buffer is shared
+                for i, image in enumerate(chunk):
+                    preprocess(image, self.buffer[i])
+                batch = self.buffer[:len(chunk)].to(self.device, non_blocking=True)
+                with torch.no_grad():
+                    logits, boxes = self.forward(batch)
+                logits, boxes = logits.cpu(), boxes.cpu()
+            results.extend({"pred_logits": logits[i:i + 1], "pred_boxes": boxes[i:i + 1]}
+                           for i in range(len(chunk)))
+        return results
+
+    def infer_rois(self, image_rgb, rois):
+        """Runs the hand crops of one frame in a single forward; outputs are in frame coordinates (see merge_roi_outputs)."""
+        if not rois:
+            return None
+        height, width = image_rgb.shape[:2]
+        crops = [image_rgb[y1:y2, x1:x2] for x1, y1, x2, y2 in rois]
+        return merge_roi_outputs(self.infer_batch(crops), rois, width, height)
+
+    def infer(self, image_rgb):
+        """Single frame. With micro-batching enabled, waits for the shared batch it was put in."""
+        if self.requests is None or self.requests.closed:
+            return self.infer_batch([image_rgb])[0]
+        future = Future()
+        dropped = self.requests.put((image_rgb, future))
+        if dropped is not None:
+            dropped[1].set_result(None)  # Queue overflow: the oldest frame gets no detections
+        return future.result()
+
+    def run_batcher(self):
+        while True:
+            request = self.requests.get()
+            if request is None:
+                return
+            batch = [request]
+            deadline = time.monotonic() + self.batch_wait
+            while len(batch) < self.max_batch:
+                request = self.requests.get(timeout=max(0.0, deadline - time.monotonic()))
+                if request is None:
+                    break
+                batch.append(request)
+            try:
+                outputs = self.infer_batch([image for image, _ in batch])
+                for (_, future), output in zip(batch, outputs):
+                    future.set_result(output)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+
+    def close(self):
+        if self.requests is not None:
+            self.requests.close()
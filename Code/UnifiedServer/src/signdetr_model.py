@@ -33,13 +33,15 @@ def build_2d_sincos_position_embedding(height: int, width: int, dim: int, device
 
 class DETR(nn.Module):
     def __init__(self, num_classes, hidden_dim=256, nheads=8,
-                 num_encoder_layers=1, num_decoder_layers=1, num_queries=25):
+                 num_encoder_layers=1, num_decoder_layers=1, num_queries=25,
+                 pretrained_backbone=True):
         super().__init__()
         
         # Removed logging for simplified integration
 
-        # create ResNet-50 backbone
-        self.backbone = resnet50(weights=ResNet50_Weights.IMAGENET1K_V1)
+        # create ResNet-50 backbone (ImageNet weights are only needed for training;
+        # skip the download when a full checkpoint is loaded afterwards)
+        self.backbone = resnet50(weights=ResNet50_Weights.IMAGENET1K_V1 if pretrained_backbone else None)
         self.backbone.fc = nn.Identity()
 
         # create conversion layer
@@ -0,0 +1,150 @@
+import copy
+
+import torch
+from torch import nn
+from torch.ao.quantization import DeQuantStub, QuantStub, convert, get_default_qconfig, prepare, quantize_dynamic
+from torchvision.models.quantization import resnet50 as quantizable_resnet50
+
+from .frame_source import open_source, synthetic_frames
+from .signdetr_engine import CachedDETR, preprocess
+from .telemetry import get_logger
+from .utils.boxes import box_cxcywh_to_xyxy, box_iou
+
+logger = get_logger("signdetr")
+
+MODES = ("int8", "dynamic", "fp16")
+
+
+class QuantizedBackbone(nn.Module):
+    """
+    Statically quantised int8 ResNet-50 trunk + 1x1 conv. Uses torchvision's
+    quantisable ResNet (same parameter names as the float one, residual adds
+    via FloatFunctional) so the trained backbone weights load directly.
+    """
+
+    def __init__(self, backbone, conv):
+        super().__init__()
+        trunk = quantizable_resnet50(weights=None, quantize=False)
+        trunk.fc = nn.Identity()
+        trunk.load_state_dict(backbone.state_dict())
+        self.trunk = trunk
+        self.conv = copy.deepcopy(conv)
+        self.quant = QuantStub()
+        self.dequant = DeQuantStub()
+
+    def forward(self, inputs):
+        t = self.trunk
+        x = t.maxpool(t.relu(t.bn1(t.conv1(self.quant(inputs)))))
+        x = t.layer4(t.layer3(t.layer2(t.layer1(x))))
+        return self.dequant(self.conv(x))
+
+    def fuse(self):
+        self.trunk.fuse_model(is_qat=False)
+
+
+class QuantizedDETR(CachedDETR):
+    """
+    CPU-quantised copy of a DETR (the float model is left untouched):
+
+    - "dynamic": transformer feed-forward layers and the class/box heads
+      become dynamic int8 Linear layers (weights int8, activations quantised
+      on the fly); the backbone stays float.
+    - "int8": as "dynamic", plus a static int8 backbone whose activation
+      ranges are calibrated on `calibration` (RGB frames, or a callable that
+      returns them; ideally real camera frames, synthetic noise is used if
+      none are given).
+    - "fp16": dynamic Linear layers with float16 weights.
+
+    The int8 backbone is calibrated for the current torch.backends.quantized.engine,
+    which it must also run on; building the model never changes that process-wide
+    setting (SignDETREngine.load_backend selects it).
+    """
+
+    def __init__(self, model, mode="int8", calibration=None):
+        if mode not in MODES:
+            raise ValueError(f"unknown quantisation mode: {mode}")
+        model = copy.deepcopy(model).cpu().eval()
+        super().__init__(model)
+        self.mode = mode
+
+        dtype = torch.float16 if mode == "fp16" else torch.qint8
+        for name in ("transformer", "linear_class", "linear_bbox"):
+            setattr(model, name, quantize_dynamic(getattr(model, name), {nn.Linear}, dtype=dtype))
+        # The encoder's native fast path reads Linear .weight tensors directly, which
+        # dynamic quantised layers don't have; this flag makes it take the regular path
+        for layer in model.transformer.encoder.layers:
+            layer.activation_relu_or_gelu = False
+
+        self.backbone = None
+        if mode == "int8":
+            backbone = QuantizedBackbone(model.backbone, model.conv).eval()
+            backbone.fuse()
+            backbone.qconfig = get_default_qconfig(torch.backends.quantized.engine)
+            prepare(backbone, inplace=True)
+            if callable(calibration):
+                calibration = calibration()
+            if not calibration:
+                logger.warning("No SignDETR calibration frames given, calibrating on synthetic frames")
+                calibration = synthetic_frames(16)
+            with torch.no_grad():
+                for image in calibration:
+                    backbone(preprocess(image).unsqueeze(0))
+            self.backbone = convert(backbone, inplace=True)
+            model.backbone = model.conv = nn.Identity()  # Float copies are no longer used
+
+    def features(self, inputs):
+        if self.backbone is None:
+            return super().features(inputs)
+        return self.backbone(inputs)
+
+
+def load_frames(spec, count=64):
+    """Up to `count` RGB frames from a frame source spec (image directory, video, 'synthetic:N')."""
+    source = open_source(spec)
+    frames = []
+    while len(frames) < count:
+        ok, frame = source.read()
+        if not ok:
+            break
+        frames.append(frame[:, :, ::-1].copy())  # Sources return BGR like cv2.VideoCapture
+    source.release()
+    return frames
+
+
+def top_detection(output, threshold):
+    """Best query of one frame, as main.py picks it: (class_id or None, confidence, cxcywh box)."""
+    probas = output["pred_logits"].softmax(-1)[0, :, :-1]
+    scores, labels = probas.max(-1)
+    best = scores.argmax()
+    class_id = int(labels[best]) if scores[best] > threshold else None
+    return class_id, float(scores[best]), output["pred_boxes"][0, best]
+
+
+def accuracy_delta(reference, outputs, threshold=0.7):
+    """
+    Compares a quantised model's per-frame outputs with the float model's:
+    how often the detect / no-detect decision and the detected class agree,
+    how much the top confidence moves, and the IoU of the top boxes.
+    """
+    decision = label = both = 0
+    conf_error = iou_sum = logit_error = 0.0
+    for ref, out in zip(reference, outputs):
+        ref_class, ref_conf, ref_box = top_detection(ref, threshold)
+        class_id, conf, box = top_detection(out, threshold)
+        decision += (ref_class is None) == (class_id is None)
+        label += ref_class == class_id
+        conf_error += abs(conf - ref_conf)
+        logit_error = max(logit_error, float((out["pred_logits"] - ref["pred_logits"]).abs().max()))
+        if ref_class is not None and class_id is not None:
+            both += 1
+            iou, _ = box_iou(box_cxcywh_to_xyxy(ref_box[None]), box_cxcywh_to_xyxy(box[None]))
+            iou_sum += float(iou[0, 0])
+    frames = max(len(reference), 1)
+    return {
+        "frames": len(reference),
+        "decision_agreement": decision / frames,
+        "label_agreement": label / frames,
+        "conf_mae": conf_error / frames,
+        "box_iou": iou_sum / both if both else None,
+        "max_logit_diff": logit_error,
+    }
@@ -0,0 +1,112 @@
+import cv2
+import numpy as np
+
+from .landmark_arrays import landmark_array, pixel_points
+
+CANVAS_SIZE = 400
+CROP_OFFSET = 29  # Margin around the hand (simulating the crop offset from the original training code)
+
+# Skeleton connections (MediaPipe indices)
+CONNECTIONS = [
+    (0,1), (1,2), (2,3), (3,4),
+    (5,6), (6,7), (7,8),
+    (9,10), (10,11), (11,12),
+    (13,14), (14,15), (15,16),
+    (17,18), (18,19), (19,20),
+    (5,9), (9,13), (13,17), (0,5), (0,17)
+]
+_SEGMENTS = np.array(CONNECTIONS)
+
+
+def skeleton_points(hand_landmarks, img_w, img_h):
+    """
+    Landmarks -> 21 points on the 400x400 canvas the CNN was trained on
+    (the hand centred, in image pixels). Reference implementation.
+    """
+    # Convert normalized landmarks to pixel coordinates
+    pts = []
+    x_vals = []
+    y_vals = []
+    for x, y in landmark_array(hand_landmarks, dims=2)[:, :2].tolist():
+        px = int(x * img_w)
+        py = int(y * img_h)
+        pts.append([px, py])
+        x_vals.append(px)
+        y_vals.append(py)
+
+    # Calculate Bounding Box
+    x_min, x_max = min(x_vals), max(x_vals)
+    y_min, y_max = min(y_vals), max(y_vals)
+    w = x_max - x_min
+    h = y_max - y_min
+
+    # Add offset
+    offset = CROP_OFFSET
+    crop_w = w + 2 * offset
+    crop_h = h + 2 * offset
+
+    # Center the skeleton
+    os_x = ((CANVAS_SIZE - crop_w) // 2) - 15
+    os_y = ((CANVAS_SIZE - crop_h) // 2) - 15
+
+    crop_x = x_min - offset
+    crop_y = y_min - offset
+
+    # Adjust points
+    adj_pts = []
+    for p in pts:
+        # Rel to crop
+        rel_x = p[0] - crop_x
+        rel_y = p[1] - crop_y
+
+        # Rel to white image center
+        fin_x = rel_x + os_x
+        fin_y = rel_y + os_y
+        adj_pts.append([fin_x, fin_y])
+    return adj_pts
+
+
+def render_skeleton(adj_pts):
+    """Draws the skeleton the way the CNN saw it during training. Reference implementation."""
+    # Setup White Image (400x400)
+    white = np.ones((CANVAS_SIZE, CANVAS_SIZE, 3), np.uint8) * 255
+
+    # Draw Skeleton
+    for p1, p2 in CONNECTIONS:
+        cv2.line(white, tuple(adj_pts[p1]), tuple(adj_pts[p2]), (0, 255, 0), 3)
+
+    for p in adj_pts:
+        cv2.circle(white, tuple(p), 2, (0, 0, 255), 1)
+    return white
+
+
+class SkeletonCanvas:
+    """
+    Same points and pixels as skeleton_points / render_skeleton, with less work
+    per call: the 21 points are computed in one numpy expression, the canvas is
+    allocated once and reset in place, and all connections go to a single
+    cv2.polylines call (the circles still need one call each).
+
+    render() returns the shared canvas, valid until the next call; the CNN
+    input stays byte-identical to the reference (tests/bench_skeleton_render.py).
+    """
+
+    def __init__(self):
+        self.canvas = np.empty((CANVAS_SIZE, CANVAS_SIZE, 3), np.uint8)
+
+    @staticmethod
+    def points(hand_landmarks, img_w, img_h):
+        """(21, 2) int32 canvas points; int() truncation and // flooring as in skeleton_points."""
+        pts = pixel_points(landmark_array(hand_landmarks, dims=2), img_w, img_h)
+        low = pts.min(axis=0)
+        return pts - low + CROP_OFFSET + (CANVAS_SIZE - (pts.max(axis=0) - low + 2 * CROP_OFFSET)) // 2 - 15
+
+    def render(self, adj_pts, out=None):
+        """Draws into `out` (a 400x400x3 uint8 array, e.g. one slot of a batch) or the shared canvas."""
+        canvas = self.canvas if out is None else out
+        canvas.fill(255)
+        pts = np.asarray(adj_pts, dtype=np.int32)
+        cv2.polylines(canvas, list(pts[_SEGMENTS]), False, (0, 255, 0), 3)
+        for x, y in pts.tolist():
+            cv2.circle(canvas, (x, y), 2, (0, 0, 255), 1)
+        return canvas
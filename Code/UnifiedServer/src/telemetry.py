@@ -0,0 +1,144 @@
+import atexit
+import collections
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+
+ROOT_LOGGER = "unified"
+
+_listener = None
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Per-key rate limiting. Records logged with extra={"key": ...} are emitted
+    at most once per `interval` seconds per key (override per record with
+    extra={"interval": seconds}); the number of records suppressed in between
+    is attached to the next emitted record. Records without a key pass through.
+    """
+
+    def __init__(self, interval=1.0):
+        super().__init__()
+        self.interval = interval
+        self.last = {}
+        self.suppressed = collections.Counter()
+        self.lock = threading.Lock()
+
+    def filter(self, record):
+        key = getattr(record, "key", None)
+        if key is None:
+            return True
+        interval = getattr(record, "interval", self.interval)
+        now = time.monotonic()
+        with self.lock:
+            last = self.last.get(key)
+            if last is not None and now - last < interval:
+                self.suppressed[key] += 1
+                return False
+            self.last[key] = now
+            record.suppressed = self.suppressed.pop(key, 0)
+        return True
+
+
+class StructuredFormatter(logging.Formatter):
+    """Renders extra={"fields": {...}} as key=value pairs, or the whole record as one JSON object."""
+
+    def __init__(self, json_output=False):
+        super().__init__()
+        self.json_output = json_output
+
+    def format(self, record):
+        fields = getattr(record, "fields", None) or {}
+        suppressed = getattr(record, "suppressed", 0)
+        message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+
+        if self.json_output:
+            entry = {"ts": record.created, "level": record.levelname,
+                     "logger": record.name, "msg": message, **fields}
+            if suppressed:
+                entry["suppressed"] = suppressed
+            if record.exc_text:
+                entry["exc"] = record.exc_text
+            return json.dumps(entry, default=str)
+
+        line = f"{self.formatTime(record, '%H:%M:%S')} {record.levelname:<7} {record.name}: {message}"
+        if fields:
+            line += " " + " ".join(f"{k}={v}" for k, v in fields.items())
+        if suppressed:
+            line += f" (+{suppressed} suppressed)"
+        if record.exc_text:
+            line += "\n" + record.exc_text
+        return line
+
+
+class Sampler:
+    """Opt-in sampling for expensive debug output: tick() is True once every `every` calls, never if every <= 0."""
+
+    def __init__(self, every=0):
+        self.every = every
+        self.count = 0
+
+    def tick(self):
+        if self.every <= 0:
+            return False
+        self.count += 1
+        return self.count % self.every == 0
+
+
+def get_logger(name):
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def log_event(logger, level, msg, key=None, interval=None, **fields):
+    """Log a structured event. Nothing is built or queued if `level` is disabled."""
+    if not logger.isEnabledFor(level):
+        return
+    extra = {"fields": fields}
+    if key is not None:
+        extra["key"] = key
+    if interval is not None:
+        extra["interval"] = interval
+    logger.log(level, msg, extra=extra)
+
+
+def setup_logging(level="INFO", json_output=False, rate_limit=1.0, stream=None):
+    """
+    Route the server's loggers through an asynchronous handler: the calling
+    (vision) thread only filters and enqueues the record, a background
+    listener thread does the formatting and the actual I/O.
+    """
+    global _listener
+    shutdown_logging()
+
+    handler = logging.StreamHandler(stream or sys.stdout)
+    handler.setFormatter(StructuredFormatter(json_output))
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter(rate_limit))
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.handlers[:] = [queue_handler]
+    root.setLevel(level)
+    root.propagate = False
+
+    _listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+    return root
+
+
+def shutdown_logging():
+    """Flush and stop the background listener."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
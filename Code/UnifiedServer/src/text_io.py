@@ -0,0 +1,212 @@
+import os
+import threading
+import time
+from collections import deque
+
+from .telemetry import get_logger
+
+try:
+    import pyttsx3
+except ImportError:
+    pyttsx3 = None
+
+logger = get_logger("speech")
+
+
+def atomic_write(path, text):
+    """Write to a temp file next to `path`, then rename it over, so readers never see half a file."""
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+    replace(tmp, path)
+
+
+def replace(src, dst, attempts=5):
+    # On Windows the rename fails while a reader (Unity) has the target open; retry briefly
+    for attempt in range(attempts):
+        try:
+            os.replace(src, dst)
+            return
+        except PermissionError:
+            if attempt == attempts - 1:
+                raise
+            time.sleep(0.05)
+
+
+def make_tts_engine(rate=100):
+    if pyttsx3 is None:
+        raise RuntimeError("pyttsx3 is not installed")
+    engine = pyttsx3.init()
+    engine.setProperty("rate", rate)
+    return engine
+
+
+class TextIOWorker:
+    """
+    Background thread that owns the TTS engine and the text / audio files Unity
+    reads, so the vision threads never block on disk or speech synthesis.
+
+    - write_text() is coalesced: only the newest text per file is written, however
+      often it changed since the last write.
+    - speak() synthesises to a temp file and renames it over the target; a newer
+      request for the same file replaces a queued one. The callback gets
+      (status, path, text) with status "ready", "error" or "skipped".
+    - status() ("idle" / "speaking" / "error" and the number of finished syntheses)
+      goes into the UDP packet, so receivers know when a new speech.wav is there.
+
+    `engine_factory` builds the pyttsx3 engine (on the worker thread, as pyttsx3
+    wants). With an AudioCache (src/audio_cache.py) repeated phrases are served
+    from disk instead of synthesised again; warm_up() fills it in idle time.
+    """
+
+    def __init__(self, engine_factory=make_tts_engine, cache=None):
+        self.engine_factory = engine_factory
+        self.engine = None
+        self.cache = cache
+        self.pending_text = {}   # path -> newest text
+        self.pending_speech = {}  # path -> (text, callback)
+        self.pending_warm = deque()  # Phrases to pre-synthesise into the cache
+        self.state = "idle"
+        self.speech_id = 0
+        self.busy = False
+        self.running = False
+        self.cond = threading.Condition()
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        return self
+
+    def write_text(self, path, text):
+        with self.cond:
+            self.pending_text[path] = text
+            self.cond.notify()
+
+    def speak(self, text, path, callback=None):
+        with self.cond:
+            replaced = self.pending_speech.get(path)
+            self.pending_speech[path] = (text, callback)
+            self.cond.notify()
+        if replaced is not None and replaced[1] is not None:
+            replaced[1]("skipped", path, replaced[0])
+
+    def warm_up(self, phrases):
+        """Queues phrases to synthesise into the cache ahead of time (after any real requests)."""
+        if self.cache is None:
+            return
+        with self.cond:
+            self.pending_warm.extend(phrases)
+            self.cond.notify()
+
+    def status(self):
+        return {"speech": self.state, "speech_id": self.speech_id}
+
+    def run(self):
+        try:
+            self.engine = self.engine_factory()
+        except Exception:
+            logger.exception("TTS init failed")
+        while True:
+            with self.cond:
+                while self.running and not self.has_work():
+                    self.busy = False
+                    self.cond.notify_all()
+                    self.cond.wait()
+                if not self.has_work():
+                    self.busy = False
+                    self.cond.notify_all()
+                    return
+                self.busy = True
+                texts, self.pending_text = self.pending_text, {}
+                speech = warm = None
+                if self.pending_speech:
+                    path = next(iter(self.pending_speech))
+                    speech = (path,) + self.pending_speech.pop(path)
+                    self.state = "speaking"
+                elif not texts:
+                    warm = self.pending_warm.popleft()
+
+            # Text first: it is small, and Unity shows it live
+            for path, text in texts.items():
+                try:
+                    atomic_write(path, text)
+                except Exception:
+                    logger.exception("Saving text to %s failed", path, extra={"key": f"text:{path}"})
+            if speech is not None:
+                self.synthesize(*speech)
+            elif warm is not None:
+                self.warm(warm)
+
+    def has_work(self):
+        return bool(self.pending_text or self.pending_speech or self.pending_warm)
+
+    def phrase_key(self, text):
+        voice = rate = None
+        if hasattr(self.engine, "getProperty"):
+            voice, rate = self.engine.getProperty("voice"), self.engine.getProperty("rate")
+        return self.cache.key(text, voice, rate)
+
+    def render(self, text, tmp):
+        if self.engine is None:
+            raise RuntimeError("no TTS engine")
+        self.engine.save_to_file(text, tmp)
+        self.engine.runAndWait()
+
+    def warm(self, text):
+        try:
+            key = self.phrase_key(text)
+            if self.cache.get(key) is None:
+                self.render(text, self.cache.temp_path(key))
+                self.cache.add(key, self.cache.temp_path(key))
+        except Exception:
+            logger.exception("Audio warm-up failed for %r", text, extra={"key": "warm_up"})
+
+    def synthesize(self, path, text, callback):
+        status = "ready"
+        try:
+            if self.cache is None:
+                root, ext = os.path.splitext(path)
+                tmp = f"{root}.tmp{ext}"  # Drivers pick the audio format from the extension
+                self.render(text, tmp)
+                replace(tmp, path)
+                logger.debug("Audio saved to %s", path)
+            else:
+                key = self.phrase_key(text)
+                if self.cache.serve(key, path):
+                    logger.debug("Audio served from cache to %s", path)
+                else:
+                    self.render(text, self.cache.temp_path(key))
+                    self.cache.add(key, self.cache.temp_path(key))
+                    self.cache.serve(key, path)
+                    logger.debug("Audio saved to %s", path)
+        except Exception:
+            logger.exception("Synthesising audio to %s failed", path, extra={"key": f"speech:{path}"})
+            status = "error"
+        with self.cond:
+            self.state = "idle" if status == "ready" else "error"
+            if status == "ready":
+                self.speech_id += 1
+        if callback is not None:
+            callback(status, path, text)
+
+    def flush(self, timeout=None):
+        """Waits until everything queued so far is on disk; False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.cond:
+            while self.busy or self.has_work():
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.cond.wait(remaining)
+        return True
+
+    def stop(self, timeout=5.0):
+        """Finishes the queued writes and speech, then stops the thread; pending warm-up is dropped."""
+        with self.cond:
+            self.pending_warm.clear()
+            self.running = False
+            self.cond.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout)
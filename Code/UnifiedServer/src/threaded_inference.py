@@ -1,38 +1,198 @@
+import collections
+import queue
 import threading
-import cv2
-import mediapipe as mp
 import time
 
+import mediapipe as mp
+
+from .utils.queues import DropOldestQueue
+
+# Result of one MediaPipe pass, tagged with the frame it was computed from
+# timings holds the per-stage latency breakdown in ms: face_ms, hand_ms, total_ms
+InferenceResult = collections.namedtuple(
+    "InferenceResult", ["frame_id", "timestamp_ms", "face_results", "hand_results", "timings"])
+
+STAGES = ("face", "hand")
+
+
 class ThreadedInference:
-    def __init__(self, face_landmarker, hand_landmarker):
+    """
+    Runs the face and hand landmarkers on a long-lived worker thread.
+
+    Frames are handed over through a bounded latest-frame queue: if the worker
+    falls behind, the oldest waiting frame is dropped rather than queued up.
+    Every result carries the frame id and timestamp it was computed from, so
+    callers can match it to the right image.
+
+    With parallel=True the face and hand landmarkers each run on their own
+    dedicated thread (which is the only caller of that landmarker instance).
+    Both share the mp.Image built once per frame and their outputs are joined
+    per frame id, so latency is max(face, hand) instead of face + hand.
+    """
+
+    def __init__(self, face_landmarker, hand_landmarker, queue_size=1, history=8,
+                 parallel=False, latency_window=100):
         self.face_landmarker = face_landmarker
         self.hand_landmarker = hand_landmarker
-        self.face_results = None
-        self.hand_results = None
+        self.parallel = parallel
+        self.frames = DropOldestQueue(queue_size)
+        self.history = history
+        self.results = collections.OrderedDict()  # frame_id -> InferenceResult
+        self.dropped_ids = collections.deque(maxlen=history)
+        self.latest = None
+        self.next_frame_id = 0
+        self.last_timestamp_ms = -1
+        self.cond = threading.Condition()
         self.thread = None
-        self.lock = threading.Lock()
-        self.stopped = False
+        self.stopped = True
+        # Parallel mode: one blocking hand-off queue and thread per landmarker,
+        # plus partially joined frames (frame_id -> {"start": t0, stage: (results, ms)})
+        self.stage_queues = {}
+        self.stage_threads = []
+        self.partial = {}
+        self.latencies = collections.deque(maxlen=latency_window)
 
-    def start(self, image_rgb):
+    def start(self):
+        if self.thread is not None and self.thread.is_alive():
+            return self
         self.stopped = False
-        self.thread = threading.Thread(target=self.run, args=(image_rgb,))
-        self.thread.daemon = True
+        if self.parallel:
+            landmarkers = {"face": self.face_landmarker, "hand": self.hand_landmarker}
+            self.stage_queues = {stage: queue.Queue(maxsize=1) for stage in STAGES}
+            self.stage_threads = [
+                threading.Thread(target=self.run_stage,
+                                 args=(stage, landmarkers[stage], self.stage_queues[stage]),
+                                 daemon=True)
+                for stage in STAGES
+            ]
+            for thread in self.stage_threads:
+                thread.start()
+        self.thread = threading.Thread(target=self.run, daemon=True)
         self.thread.start()
+        return self
+
+    def submit(self, image_rgb, timestamp_ms=None):
+        """Queue an RGB frame for inference and return its frame id."""
+        if timestamp_ms is None:
+            timestamp_ms = int(time.time() * 1000)
+        with self.cond:
+            # VIDEO running mode rejects timestamps that do not strictly increase
+            timestamp_ms = max(int(timestamp_ms), self.last_timestamp_ms + 1)
+            self.last_timestamp_ms = timestamp_ms
+            frame_id = self.next_frame_id
+            self.next_frame_id += 1
+
+        evicted = self.frames.put((frame_id, timestamp_ms, image_rgb))
+        if evicted is not None:
+            with self.cond:
+                self.dropped_ids.append(evicted[0])
+                self.cond.notify_all()
+        return frame_id
+
+    def run(self):
+        while not self.stopped:
+            item = self.frames.get(timeout=0.1)
+            if item is None:
+                continue
+            frame_id, timestamp_ms, image_rgb = item
+            start = time.perf_counter()
+            mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=image_rgb)
+
+            if self.parallel:
+                with self.cond:
+                    self.partial[frame_id] = {"start": start}
+                for stage_queue in self.stage_queues.values():
+                    self.hand_off(stage_queue, (frame_id, timestamp_ms, mp_image))
+                continue
+
+            face_results, face_ms = self.detect(self.face_landmarker, mp_image, timestamp_ms)
+            hand_results, hand_ms = self.detect(self.hand_landmarker, mp_image, timestamp_ms)
+            timings = {"face_ms": face_ms, "hand_ms": hand_ms,
+                       "total_ms": (time.perf_counter() - start) * 1000}
+            self.publish(InferenceResult(frame_id, timestamp_ms, face_results, hand_results, timings))
+
+    def run_stage(self, stage, landmarker, stage_queue):
+        while not self.stopped:
+            try:
+                frame_id, timestamp_ms, mp_image = stage_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            results, elapsed_ms = self.detect(landmarker, mp_image, timestamp_ms)
+
+            with self.cond:
+                partial = self.partial.get(frame_id)
+                if partial is None:
+                    continue
+                partial[stage] = (results, elapsed_ms)
+                if any(s not in partial for s in STAGES):
+                    continue
+                del self.partial[frame_id]
+
+            (face_results, face_ms), (hand_results, hand_ms) = partial["face"], partial["hand"]
+            timings = {"face_ms": face_ms, "hand_ms": hand_ms,
+                       "total_ms": (time.perf_counter() - partial["start"]) * 1000}
+            self.publish(InferenceResult(frame_id, timestamp_ms, face_results, hand_results, timings))
+
+    def hand_off(self, stage_queue, item):
+        # Blocking put so both stages always see the same frames; dropping only
+        # happens at the latest-frame queue in front of the dispatcher.
+        while not self.stopped:
+            try:
+                stage_queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    @staticmethod
+    def detect(landmarker, mp_image, timestamp_ms):
+        start = time.perf_counter()
+        results = landmarker.detect_for_video(mp_image, timestamp_ms)
+        return results, (time.perf_counter() - start) * 1000
+
+    def publish(self, result):
+        with self.cond:
+            self.latencies.append(result.timings)
+            self.results[result.frame_id] = result
+            while len(self.results) > self.history:
+                self.results.popitem(last=False)
+            if self.latest is None or result.frame_id > self.latest.frame_id:
+                self.latest = result
+            self.cond.notify_all()
 
-    def run(self, image_rgb):
-        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=image_rgb)
-        timestamp_ms = int(time.time() * 1000)
+    def get_results(self, frame_id=None, timeout=None):
+        """
+        Without frame_id, return the most recent InferenceResult (or None) immediately.
+        With frame_id, block up to timeout seconds for that frame's result; returns
+        None on timeout or if the frame was dropped from the queue.
+        """
+        with self.cond:
+            if frame_id is None:
+                return self.latest
 
-        face_results = self.face_landmarker.detect_for_video(mp_image, timestamp_ms)
-        hand_results = self.hand_landmarker.detect_for_video(mp_image, timestamp_ms)
+            def ready():
+                return (frame_id in self.results or frame_id in self.dropped_ids
+                        or self.stopped)
 
-        with self.lock:
-            self.face_results = face_results
-            self.hand_results = hand_results
+            self.cond.wait_for(ready, timeout)
+            return self.results.get(frame_id)
 
-    def get_results(self):
-        with self.lock:
-            return self.face_results, self.hand_results
+    def latency_summary(self):
+        """Mean and max of each stage's latency (ms) over the recent window of results."""
+        with self.cond:
+            samples = list(self.latencies)
+        if not samples:
+            return {}
+        return {
+            key: {"mean": sum(s[key] for s in samples) / len(samples),
+                  "max": max(s[key] for s in samples)}
+            for key in samples[0]
+        }
 
     def stop(self):
         self.stopped = True
+        self.frames.close()
+        with self.cond:
+            self.cond.notify_all()
+        for thread in [self.thread] + self.stage_threads:
+            if thread is not None and thread is not threading.current_thread():
+                thread.join(timeout=1.0)
@@ -1,32 +1,32 @@
-import math
+import numpy as np
+
+from .landmark_arrays import FINGER_TIPS, WRIST, distances, fingers_extended, hands_array, landmark_array
 
 def get_dist(p1, p2):
-    return math.sqrt((p1.x - p2.x)**2 + (p1.y - p2.y)**2)
+    """2D distance between two landmark rows (or arrays of them)."""
+    return np.linalg.norm(np.asarray(p1)[..., :2] - np.asarray(p2)[..., :2], axis=-1)
 
 def is_ext(landmarks, tip, pip):
-    wrist = landmarks[0]
-    return get_dist(landmarks[tip], wrist) > get_dist(landmarks[pip], wrist)
+    points = landmark_array(landmarks, dims=2)
+    return bool(distances(points, tip, WRIST) > distances(points, pip, WRIST))
 
-def detect_two_handed_gestures(hands_landmarks):
-    if len(hands_landmarks) != 2:
+def detect_two_handed_gestures(hands_landmarks, extended=None):
+    """
+    `hands_landmarks`: (hands, 21, 2+) array (see landmark_arrays) or MediaPipe hands;
+    `extended`: their fingers_extended() flags, if already computed for the frame.
+    """
+    hands = hands_array(hands_landmarks, dims=2)
+    if len(hands) != 2:
         return None
+    if extended is None:
+        extended = fingers_extended(hands)
 
     # Thank You: Both palms face up
-    is_thank_you = True
-    for hand_landmarks in hands_landmarks:
-        # Check if hand is open
-        if not (is_ext(hand_landmarks, 8, 6) and is_ext(hand_landmarks, 12, 10) and is_ext(hand_landmarks, 16, 14) and is_ext(hand_landmarks, 20, 18)):
-            is_thank_you = False
-            break
-        
-        # Check if palm is facing up
-        wrist_y = hand_landmarks[0].y
-        fingertip_y_avg = (hand_landmarks[8].y + hand_landmarks[12].y + hand_landmarks[16].y + hand_landmarks[20].y) / 4
-        if fingertip_y_avg > wrist_y: # Y is inverted in image coordinates
-            is_thank_you = False
-            break
-    
-    if is_thank_you:
+    # Hands open (all four fingers extended) ...
+    is_open = extended[:, 1:].all(axis=1)
+    # ... and palms facing up: fingertips above the wrist (Y is inverted in image coordinates)
+    is_up = hands[:, FINGER_TIPS[1:], 1].mean(axis=1) <= hands[:, WRIST, 1]
+    if (is_open & is_up).all():
         return "thank_you"
-        
-    return None
\ No newline at end of file
+
+    return None
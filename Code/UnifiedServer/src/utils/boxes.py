@@ -1,5 +1,9 @@
+import numpy as np
 import torch 
 
+DETECTION_DTYPE = np.dtype([("class_id", np.int32), ("conf", np.float32),
+                            ("x1", np.int32), ("y1", np.int32), ("x2", np.int32), ("y2", np.int32)])
+
 def box_cxcywh_to_xyxy(x):
     """Converts box coordinates from center x, center y, width height to top left, bottom right xy xy."""
     x_c, y_c, w, h = x.unbind(-1)
@@ -18,7 +22,7 @@ def rescale_bboxes(out_bbox, size):
     """Scales boxes to output size"""
     img_w, img_h = size
     b = box_cxcywh_to_xyxy(out_bbox)
-    b = b * torch.tensor([img_w, img_h, img_w, img_h], dtype=torch.float32)
+    b = b * torch.tensor([img_w, img_h, img_w, img_h], dtype=torch.float32, device=b.device)
     return b
 
 def box_area(boxes):
@@ -40,3 +44,36 @@ def box_iou(boxes1, boxes2):
     eps = 1e-7
     iou = inter / (union + eps)
     return iou, union
+
+def postprocess_detections(outputs, size, threshold, nms_iou=None):
+    """
+    Turns one frame of DETR outputs into detections without a per-query Python loop:
+    softmax (no-object class dropped), per-query class argmax, confidence filter,
+    optional class-aware NMS and rescaling to pixels run as tensor ops on the
+    output's device, followed by a single host transfer.
+
+    NMS is the parallel "fast NMS" variant: a box is dropped when a higher-scoring
+    box of the same class overlaps it by more than `nms_iou`.
+
+    Returns a DETECTION_DTYPE structured array sorted by confidence (best first);
+    pixel coordinates are truncated like int().
+    """
+    probas = outputs["pred_logits"][0].softmax(-1)[:, :-1]
+    scores, labels = probas.max(-1)
+    keep = scores > threshold
+    scores, labels, boxes = scores[keep], labels[keep], outputs["pred_boxes"][0][keep]
+
+    order = scores.argsort(descending=True)
+    scores, labels, boxes = scores[order], labels[order], rescale_bboxes(boxes[order], size)
+    if nms_iou is not None and len(scores) > 1:
+        iou, _ = box_iou(boxes, boxes)
+        same_class = labels[:, None] == labels[None, :]
+        overlaps = (iou > nms_iou) & same_class
+        suppressed = overlaps.triu(diagonal=1).any(0)
+        scores, labels, boxes = scores[~suppressed], labels[~suppressed], boxes[~suppressed]
+
+    table = torch.cat([labels[:, None].float(), scores[:, None], boxes.trunc()], dim=1).cpu().numpy()
+    detections = np.empty(len(table), dtype=DETECTION_DTYPE)
+    for column, name in enumerate(DETECTION_DTYPE.names):
+        detections[name] = table[:, column]
+    return detections
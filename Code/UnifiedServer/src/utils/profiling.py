@@ -0,0 +1,136 @@
+import collections
+import functools
+import math
+import os
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def percentile(values, q):
+    """Linear-interpolated percentile (q in 0..100) of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100.0
+    lo, hi = math.floor(rank), math.ceil(rank)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (rank - lo)
+
+
+def summarize(values):
+    if not values:
+        return {"count": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values),
+    }
+
+
+class LatencyRecorder:
+    """Thread-safe collection of per-stage latency samples (ms)."""
+
+    def __init__(self):
+        self.samples = collections.defaultdict(list)
+        self.lock = threading.Lock()
+
+    def record(self, name, elapsed_ms):
+        with self.lock:
+            self.samples[name].append(elapsed_ms)
+
+    def timed(self, name, fn):
+        """Wrap fn so every call records its latency under `name`."""
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.record(name, (time.perf_counter() - start) * 1000)
+        return wrapper
+
+    def reset(self):
+        with self.lock:
+            self.samples.clear()
+
+    def summary(self):
+        with self.lock:
+            return {name: summarize(values) for name, values in sorted(self.samples.items())}
+
+
+class ResourceMonitor:
+    """Measures CPU utilisation (in cores) and peak RSS of this process over a run."""
+
+    def start(self):
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        return self
+
+    def stop(self):
+        wall = time.perf_counter() - self.wall_start
+        cpu = time.process_time() - self.cpu_start
+        return {
+            "wall_s": wall,
+            "cpu_s": cpu,
+            "cpu_utilisation": cpu / wall if wall > 0 else 0.0,
+            "cpu_count": os.cpu_count(),
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+
+def peak_rss_mb():
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        peak = getattr(info, "peak_wset", None)  # only reported on Windows
+        if peak:
+            return peak / (1024 * 1024)
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in KiB on Linux and bytes on macOS
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    return None
+
+
+def compare_reports(report, baseline, threshold=0.15, metric="p95"):
+    """
+    Compare a benchmark report against a stored baseline.
+    Returns a list of human-readable regressions: stages whose `metric`
+    latency grew, or an overall FPS that fell, by more than `threshold`, and
+    baseline stages the report no longer has (e.g. an instrumented call that
+    the pipeline stopped making).
+    """
+    regressions = []
+    for name, base in baseline.get("stages", {}).items():
+        if base.get("count") and name not in report.get("stages", {}):
+            regressions.append(f"{name}: in the baseline but not measured in this run")
+    for name, stats in report.get("stages", {}).items():
+        base = baseline.get("stages", {}).get(name)
+        if not base or not base.get(metric) or not stats.get("count"):
+            continue
+        ratio = stats[metric] / base[metric]
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{name}: {metric} {stats[metric]:.2f} ms vs baseline {base[metric]:.2f} ms (+{(ratio - 1) * 100:.0f}%)")
+
+    fps, base_fps = report.get("fps"), baseline.get("fps")
+    if fps is not None and base_fps:
+        ratio = fps / base_fps
+        if ratio < 1 - threshold:
+            regressions.append(
+                f"fps: {fps:.1f} vs baseline {base_fps:.1f} ({(ratio - 1) * 100:.0f}%)")
+    return regressions
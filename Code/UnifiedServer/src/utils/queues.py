@@ -0,0 +1,54 @@
+import collections
+import threading
+
+
+class DropOldestQueue:
+    """Bounded FIFO that discards the oldest item instead of blocking the producer.
+
+    Used to hand frames between threads: a slow consumer always sees the most
+    recent frames and the producer (e.g. the webcam loop) never stalls.
+    """
+
+    def __init__(self, maxsize=1):
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.items = collections.deque(maxlen=maxsize)
+        self.cond = threading.Condition()
+        self.dropped = 0
+        self.closed = False
+
+    def put(self, item, block=False):
+        """
+        Enqueue item. Returns the item that was evicted to make room, or None.
+        With block=True, waits for free space instead of evicting (back-pressure).
+        """
+        evicted = None
+        with self.cond:
+            if block:
+                self.cond.wait_for(lambda: len(self.items) < self.items.maxlen or self.closed)
+            if len(self.items) == self.items.maxlen:
+                evicted = self.items[0]
+                self.dropped += 1
+            self.items.append(item)
+            self.cond.notify_all()
+        return evicted
+
+    def get(self, timeout=None):
+        """Dequeue the oldest item. Returns None on timeout or once the queue is closed and empty."""
+        with self.cond:
+            self.cond.wait_for(lambda: self.items or self.closed, timeout)
+            if self.items:
+                item = self.items.popleft()
+                self.cond.notify_all()
+                return item
+            return None
+
+    def close(self):
+        """Wake up all waiting consumers; get() returns None once drained."""
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+    def __len__(self):
+        with self.cond:
+            return len(self.items)
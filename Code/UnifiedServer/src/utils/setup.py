@@ -28,3 +28,10 @@ def get_colors():
     except Exception as e: 
         print(f'Something went wrong loading your config file: {e}')
         return []
+
+def is_stale(artifact, model_path):
+    """True if a cached export is missing or older than the model it was built from."""
+    if not os.path.exists(artifact):
+        return True
+    return model_path is not None and os.path.exists(model_path) and \
+        os.path.getmtime(model_path) > os.path.getmtime(artifact)
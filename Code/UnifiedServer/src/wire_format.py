@@ -0,0 +1,404 @@
+"""
+Wire formats for the UDP data packet.
+
+JSON (the original format) stays the default and the fallback. The binary
+format is a versioned, fixed-layout little-endian encoding of the same packet:
+
+    header   magic "CV" | version u8 | type u8 | seq u32 | timestamp f64 (s)
+    flags    u8  bit0 face_found, bit1 hand_found, bit2 body_pose present
+    head     pitch, yaw, roll  f32 x3
+    labels   expression, gesture, asl_char, sign_asl  u8 x4 (enum ids, see ENUMS)
+    sign     sign_conf f32
+    body     joint count u8 | valid-joint bitmask u32 | x,y int16 x2N | conf f32 xN
+    text     length u16 | current_text UTF-8
+    ages     count u8 | (model u8, result_age ms f32) xN   (enum ids, see SCHEDULED_MODELS)
+    speech   speech u8 (enum id) | speech_id u16 (wraps around)
+
+A packet with 18 body joints and a short text is ~190 bytes, far below the
+UDP MTU. describe_schema() returns the enum tables for receivers (see
+CVReceiver.cs for the Unity decoder).
+
+In delta streams (see src/delta_stream.py) full packets double as keyframes
+and are followed by delta packets (type 1):
+
+    header   as above, type = 1
+    delta    key_seq u32 | field mask u16 | fields whose bit is set, in DELTA_FIELDS order
+
+where body_pose carries the whole joint block as above and "joints" carries
+only moved joints: count u8, then per joint index u8 | present u8 | x,y int16 | conf f32.
+
+result_age (how old each scheduled model's carried-over result is, 0 = fresh)
+is in every full packet, so keyframes carry it; deltas don't in either format
+(see src/delta_stream.py FIELDS), since it changes on every carried-over frame.
+"""
+import json
+import struct
+import time
+
+MAGIC = b"CV"
+VERSION = 3  # 2: result_age section, 3: speech section
+TYPE_FULL = 0   # complete packet; doubles as the keyframe of a delta stream
+TYPE_DELTA = 1  # changed fields only, relative to the state after key_seq
+
+UNKNOWN = 255  # enum id for labels missing from the tables
+
+EXPRESSIONS = ["neutral", "happy", "sad", "surprised", "angry", "blink", "tongue", "cute"]
+GESTURES = ["none", "hello", "i_love_you", "gun", "punch", "wave_horizontal", "wave_vertical", "thank_you",
+            "circle", "push", "beckon", "swipe_left", "swipe_right", "swipe_up", "swipe_down"]
+SPEECH_STATES = ["idle", "speaking", "error"]  # src/text_io.py TextIOWorker.status()
+ASL_CHARS = (["none", "", " ", "next", "Backspace", "Model Error", "Err"]
+             + [chr(c) for c in range(ord("A"), ord("Z") + 1)])
+
+# Models whose results the scheduler carries over (src/scheduler.py), for result_age
+SCHEDULED_MODELS = ["signdetr", "body_pose"]
+
+FLAG_FACE = 1
+FLAG_HAND = 2
+FLAG_BODY = 4
+
+MAX_TEXT_BYTES = 512
+
+HEADER = struct.Struct("<2sBBId")
+FIXED = struct.Struct("<B3f4BfB")
+JOINT_MASK = struct.Struct("<I")
+TEXT_LEN = struct.Struct("<H")
+DELTA_HEADER = struct.Struct("<IH")
+AGE = struct.Struct("<Bf")
+SPEECH = struct.Struct("<BH")
+JOINT = struct.Struct("<BBhhf")
+
+# Order of the optional sections of a delta packet; bit i of the mask = DELTA_FIELDS[i]
+DELTA_FIELDS = ["face_found", "hand_found", "head_pose", "expression", "gesture",
+                "asl_char", "sign_asl", "sign_conf", "current_text", "body_pose", "joints",
+                "speech", "speech_id"]
+
+
+class EnumTable:
+    """Bidirectional label <-> id mapping; unknown labels encode as UNKNOWN."""
+
+    def __init__(self, labels):
+        self.labels = list(labels)
+        self.ids = {label: i for i, label in enumerate(self.labels)}
+
+    def encode(self, label):
+        return self.ids.get(label, UNKNOWN)
+
+    def decode(self, value):
+        return self.labels[value] if value < len(self.labels) else "unknown"
+
+
+def sign_table(classes):
+    return EnumTable(["none"] + list(classes))
+
+
+ENUMS = {
+    "expression": EnumTable(EXPRESSIONS),
+    "gesture": EnumTable(GESTURES),
+    "asl_char": EnumTable(ASL_CHARS),
+    "speech": EnumTable(SPEECH_STATES),
+}
+MODELS = EnumTable(SCHEDULED_MODELS)
+
+
+def describe_schema(classes):
+    return {
+        "magic": MAGIC.decode(),
+        "version": VERSION,
+        "enums": {name: table.labels for name, table in ENUMS.items()}
+                 | {"sign_asl": sign_table(classes).labels, "result_age": MODELS.labels},
+    }
+
+
+def encode_binary(packet, seq, timestamp, signs):
+    """Pack a data packet dict into the fixed binary layout. `signs` is sign_table(classes)."""
+    body = packet.get("body_pose") or []
+    flags = ((FLAG_FACE if packet["face_found"] else 0)
+             | (FLAG_HAND if packet["hand_found"] else 0)
+             | (FLAG_BODY if body else 0))
+    pose = packet["head_pose"]
+
+    parts = [
+        HEADER.pack(MAGIC, VERSION, TYPE_FULL, seq & 0xFFFFFFFF, timestamp),
+        FIXED.pack(flags, pose["pitch"], pose["yaw"], pose["roll"],
+                   ENUMS["expression"].encode(packet["expression"]),
+                   ENUMS["gesture"].encode(packet["gesture"]),
+                   ENUMS["asl_char"].encode(packet["asl_char"]),
+                   signs.encode(packet["sign_asl"]),
+                   packet["sign_conf"], len(body)),
+    ]
+
+    if body:
+        parts.append(pack_joints(body))
+    parts.append(pack_text(packet.get("current_text", "")))
+    parts.append(pack_ages(packet.get("result_age", {})))
+    parts.append(SPEECH.pack(ENUMS["speech"].encode(packet.get("speech", "idle")), packet.get("speech_id", 0) & 0xFFFF))
+    return b"".join(parts)
+
+
+def pack_joints(body):
+    """Valid-joint bitmask + packed int16 x/y + float32 conf (count not included)."""
+    mask = 0
+    coords = [0] * (2 * len(body))
+    confs = [0.0] * len(body)
+    for i, joint in enumerate(body):
+        if joint:
+            mask |= 1 << i
+            coords[2 * i] = joint["x"]
+            coords[2 * i + 1] = joint["y"]
+            confs[i] = joint["conf"]
+    return JOINT_MASK.pack(mask) + struct.pack(f"<{2 * len(body)}h{len(body)}f", *coords, *confs)
+
+
+def unpack_joints(data, offset, joint_count):
+    (mask,) = JOINT_MASK.unpack_from(data, offset)
+    offset += JOINT_MASK.size
+    layout = struct.Struct(f"<{2 * joint_count}h{joint_count}f")
+    values = layout.unpack_from(data, offset)
+    offset += layout.size
+    coords, confs = values[:2 * joint_count], values[2 * joint_count:]
+    body = []
+    for i in range(joint_count):
+        if mask & (1 << i):
+            body.append({"id": i, "x": coords[2 * i], "y": coords[2 * i + 1], "conf": confs[i]})
+        else:
+            body.append(None)
+    return body, offset
+
+
+def pack_text(text):
+    # Keep the tail of long texts, like the overlay does
+    data = text.encode("utf-8")[-MAX_TEXT_BYTES:]
+    return TEXT_LEN.pack(len(data)) + data
+
+
+def unpack_text(data, offset):
+    (text_len,) = TEXT_LEN.unpack_from(data, offset)
+    offset += TEXT_LEN.size
+    return data[offset:offset + text_len].decode("utf-8", errors="replace"), offset + text_len
+
+
+def pack_ages(ages):
+    ages = [(MODELS.encode(name), age) for name, age in ages.items()]
+    return struct.pack("<B", len(ages)) + b"".join(AGE.pack(model, age) for model, age in ages)
+
+
+def unpack_ages(data, offset):
+    count = data[offset]
+    offset += 1
+    ages = {}
+    for _ in range(count):
+        model, age = AGE.unpack_from(data, offset)
+        ages[MODELS.decode(model)] = age
+        offset += AGE.size
+    return ages, offset
+
+
+def encode_binary_delta(changes, joints, seq, key_seq, timestamp, signs):
+    """
+    Pack a delta: `changes` maps packet fields to their new values,
+    `joints` maps body joint index -> new joint dict (or None if it vanished).
+    """
+    mask = 0
+    parts = []
+    for bit, field in enumerate(DELTA_FIELDS):
+        if field == "joints":
+            if not joints:
+                continue
+            parts.append(struct.pack("<B", len(joints)))
+            for i, joint in sorted(joints.items()):
+                if joint:
+                    parts.append(JOINT.pack(i, 1, joint["x"], joint["y"], joint["conf"]))
+                else:
+                    parts.append(JOINT.pack(i, 0, 0, 0, 0.0))
+        elif field not in changes:
+            continue
+        else:
+            value = changes[field]
+            if field in ("face_found", "hand_found"):
+                parts.append(struct.pack("<B", 1 if value else 0))
+            elif field == "head_pose":
+                parts.append(struct.pack("<3f", value["pitch"], value["yaw"], value["roll"]))
+            elif field in ENUMS:
+                parts.append(struct.pack("<B", ENUMS[field].encode(value)))
+            elif field == "sign_asl":
+                parts.append(struct.pack("<B", signs.encode(value)))
+            elif field == "sign_conf":
+                parts.append(struct.pack("<f", value))
+            elif field == "speech_id":
+                parts.append(struct.pack("<H", value & 0xFFFF))
+            elif field == "current_text":
+                parts.append(pack_text(value))
+            elif field == "body_pose":
+                parts.append(struct.pack("<B", len(value)))
+                if value:
+                    parts.append(pack_joints(value))
+        mask |= 1 << bit
+
+    header = HEADER.pack(MAGIC, VERSION, TYPE_DELTA, seq & 0xFFFFFFFF, timestamp)
+    return header + DELTA_HEADER.pack(key_seq & 0xFFFFFFFF, mask) + b"".join(parts)
+
+
+def decode_binary_delta(data, offset, signs):
+    key_seq, mask = DELTA_HEADER.unpack_from(data, offset)
+    offset += DELTA_HEADER.size
+    changes = {}
+    joints = {}
+    for bit, field in enumerate(DELTA_FIELDS):
+        if not mask & (1 << bit):
+            continue
+        if field in ("face_found", "hand_found"):
+            changes[field] = bool(data[offset])
+            offset += 1
+        elif field == "head_pose":
+            pitch, yaw, roll = struct.unpack_from("<3f", data, offset)
+            changes[field] = {"pitch": pitch, "yaw": yaw, "roll": roll}
+            offset += 12
+        elif field in ENUMS:
+            changes[field] = ENUMS[field].decode(data[offset])
+            offset += 1
+        elif field == "sign_asl":
+            changes[field] = signs.decode(data[offset])
+            offset += 1
+        elif field == "sign_conf":
+            (changes[field],) = struct.unpack_from("<f", data, offset)
+            offset += 4
+        elif field == "speech_id":
+            (changes[field],) = struct.unpack_from("<H", data, offset)
+            offset += 2
+        elif field == "current_text":
+            changes[field], offset = unpack_text(data, offset)
+        elif field == "body_pose":
+            count = data[offset]
+            offset += 1
+            changes[field] = []
+            if count:
+                changes[field], offset = unpack_joints(data, offset, count)
+        elif field == "joints":
+            count = data[offset]
+            offset += 1
+            for _ in range(count):
+                i, present, x, y, conf = JOINT.unpack_from(data, offset)
+                offset += JOINT.size
+                joints[i] = {"id": i, "x": x, "y": y, "conf": conf} if present else None
+    return key_seq, changes, joints
+
+
+def decode_binary(data, signs):
+    """
+    Reference decoder. Full packets decode to the packet dict plus "type",
+    "seq" and "timestamp"; delta packets to {"type": "delta", "seq",
+    "timestamp", "key_seq", "changes", "joints"}.
+    """
+    magic, version, msg_type, seq, timestamp = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("not a binary CV packet")
+    if version != VERSION:
+        raise ValueError(f"unsupported packet version {version}")
+    offset = HEADER.size
+
+    if msg_type == TYPE_DELTA:
+        key_seq, changes, joints = decode_binary_delta(data, offset, signs)
+        return {"type": "delta", "seq": seq, "timestamp": timestamp, "key_seq": key_seq,
+                "changes": changes, "joints": joints}
+
+    (flags, pitch, yaw, roll, expression, gesture, asl_char, sign,
+     sign_conf, joint_count) = FIXED.unpack_from(data, offset)
+    offset += FIXED.size
+
+    body = []
+    if joint_count:
+        body, offset = unpack_joints(data, offset, joint_count)
+    text, offset = unpack_text(data, offset)
+    ages, offset = unpack_ages(data, offset)
+    speech, speech_id = SPEECH.unpack_from(data, offset)
+    offset += SPEECH.size
+
+    return {
+        "type": "full",
+        "seq": seq,
+        "timestamp": timestamp,
+        "face_found": bool(flags & FLAG_FACE),
+        "head_pose": {"pitch": pitch, "yaw": yaw, "roll": roll},
+        "expression": ENUMS["expression"].decode(expression),
+        "hand_found": bool(flags & FLAG_HAND),
+        "gesture": ENUMS["gesture"].decode(gesture),
+        "sign_asl": signs.decode(sign),
+        "sign_conf": sign_conf,
+        "asl_char": ENUMS["asl_char"].decode(asl_char),
+        "current_text": text,
+        "body_pose": body,
+        "result_age": ages,
+        "speech": ENUMS["speech"].decode(speech),
+        "speech_id": speech_id,
+    }
+
+
+def is_binary(data):
+    return data[:2] == MAGIC
+
+
+def decode_json(data):
+    """
+    Decode a JSON datagram into the same message shape as decode_binary().
+    Plain (non-delta) JSON packets have no "type" and are treated as full packets.
+    """
+    message = json.loads(data)
+    msg_type = message.get("type", "full")
+    if msg_type != "delta":
+        message["type"] = "full"
+        return message
+    joints = {int(i): joint for i, joint in message.pop("joints", {}).items()}
+    header = {key: message.pop(key) for key in ("type", "seq", "timestamp", "key_seq") if key in message}
+    return {**header, "changes": message, "joints": joints}
+
+
+class PacketEncoder:
+    """
+    Encodes packets in the configured wire format ("json" or "binary") and numbers them.
+
+    With a DeltaEncoder (src/delta_stream.py) the stream switches to keyframes
+    plus deltas: encode() returns None when there is nothing to send, and JSON
+    packets gain "type", "seq" and (for deltas) "key_seq" fields, with moved
+    body joints under "joints" as {index: joint}.
+    """
+
+    def __init__(self, wire_format="json", classes=(), delta=None):
+        if wire_format not in ("json", "binary"):
+            raise ValueError(f"unknown wire format: {wire_format}")
+        self.wire_format = wire_format
+        self.signs = sign_table(classes)
+        self.delta = delta
+        self.seq = 0
+        self.key_seq = 0
+
+    def request_keyframe(self):
+        if self.delta is not None:
+            self.delta.request_keyframe()
+
+    def encode(self, packet, timestamp=None):
+        timestamp = time.time() if timestamp is None else timestamp
+        if self.delta is None:
+            self.seq += 1
+            if self.wire_format == "json":
+                return json.dumps(packet).encode()
+            return encode_binary(packet, self.seq, timestamp, self.signs)
+
+        update = self.delta.update(packet)
+        if update is None:
+            return None
+        self.seq += 1
+
+        if update[0] == "full":
+            self.key_seq = self.seq
+            if self.wire_format == "json":
+                return json.dumps({"type": "full", "seq": self.seq, "timestamp": timestamp, **packet}).encode()
+            return encode_binary(packet, self.seq, timestamp, self.signs)
+
+        _, changes, joints = update
+        if self.wire_format == "json":
+            message = {"type": "delta", "seq": self.seq, "timestamp": timestamp,
+                       "key_seq": self.key_seq, **changes}
+            if joints:
+                message["joints"] = {str(i): joint for i, joint in joints.items()}
+            return json.dumps(message).encode()
+        return encode_binary_delta(changes, joints, self.seq, self.key_seq, timestamp, self.signs)
@@ -0,0 +1,85 @@
+"""
+Side-by-side latency / agreement of the two ASL letter backends:
+the skeleton CNN (render a 400x400 image, Keras forward) and the landmark
+MLP distilled from it (tests/distill_asl_landmarks.py).
+
+Runs both on every hand of a landmark set (saved by the distillation tool)
+and reports per-hand latency plus how often the MLP picks the same label
+group and, after apply_rules, the same character as the CNN.
+
+Usage (from Code/UnifiedServer):
+    python ../tests/bench_asl_classifier.py --landmarks data/asl_landmarks.npz
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+SERVER_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'UnifiedServer'))
+sys.path.append(SERVER_DIR)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ASL CNN vs landmark MLP benchmark")
+    parser.add_argument("--landmarks", required=True, help="Landmark set (.npz) from distill_asl_landmarks.py")
+    parser.add_argument("--cnn", default=os.path.join(SERVER_DIR, "models", "cnn8grps_rad1_model.h5"))
+    parser.add_argument("--mlp", default=os.path.join(SERVER_DIR, "models", "asl_landmark_mlp.p"))
+    parser.add_argument("--hands", type=int, default=500)
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    args = parser.parse_args(argv)
+
+    from distill_asl_landmarks import as_landmarks, final_chars
+    from src.asl_classifier import ASLClassifier
+    from src.landmark_classifier import landmark_features
+    from src.utils.profiling import summarize
+
+    data = np.load(args.landmarks)
+    hands = list(zip(data["landmarks"], data["sizes"]))[:args.hands]
+    asl = ASLClassifier(args.cnn, None, output_dir=tempfile.mkdtemp(), landmark_model_path=args.mlp)
+    if asl.model_cnn is None or asl.model_landmarks is None:
+        return 1
+
+    def run(predict):
+        probs, points, latency = [], [], []
+        for row, (w, h) in hands:
+            landmarks = as_landmarks(row)
+            start = time.perf_counter()
+            pts = asl.skeleton_points(landmarks, w, h)
+            probs.append(predict(pts))
+            latency.append((time.perf_counter() - start) * 1000)
+            points.append(pts)
+        return np.array(probs), points, summarize(latency)
+
+    cnn_probs, points, cnn_latency = run(
+        lambda pts: asl.model_cnn.predict(asl.render_skeleton(pts)[None], verbose=0)[0])
+    mlp_probs, _, mlp_latency = run(
+        lambda pts: asl.model_landmarks.predict_proba(landmark_features(pts))[0])
+
+    report = {
+        "hands": len(hands),
+        "cnn": {"latency_ms": cnn_latency},
+        "mlp": {"latency_ms": mlp_latency},
+        "group_agreement": float(np.mean(cnn_probs.argmax(1) == mlp_probs.argmax(1))),
+        "char_agreement": float(np.mean([a == b for a, b in zip(final_chars(asl, cnn_probs, points),
+                                                                 final_chars(asl, mlp_probs, points))])),
+    }
+    print(f"{'backend':<8}{'p50 ms':>9}{'p95 ms':>9}")
+    for name in ("cnn", "mlp"):
+        latency = report[name]["latency_ms"]
+        print(f"{name:<8}{latency['p50']:>9.3f}{latency['p95']:>9.3f}")
+    print(f"Agreement with the CNN over {len(hands)} hands: group {report['group_agreement']:.3f}, "
+          f"character {report['char_agreement']:.3f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
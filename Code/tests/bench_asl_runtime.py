@@ -0,0 +1,92 @@
+"""
+Startup time and per-call latency of the ASL CNN runtimes: Keras (.h5)
+against the cached TFLite / ONNX exports (src/asl_runtime.py).
+
+Exports the .h5 first where needed (needs TensorFlow; tf2onnx for ONNX).
+Startup is measured in a fresh interpreter per runtime (import + load);
+latency on rendered skeletons of random hands, single images, plus the
+largest output difference from Keras.
+
+Usage (from anywhere):
+    python tests/bench_asl_runtime.py --runtimes keras,tflite,onnx --calls 200
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+SERVER_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'UnifiedServer'))
+sys.path.append(SERVER_DIR)
+
+STARTUP = """
+import sys, time
+start = time.perf_counter()
+from src.asl_runtime import load_asl_cnn
+model, runtime = load_asl_cnn(sys.argv[1], sys.argv[2])
+print(runtime, time.perf_counter() - start)
+"""
+
+
+def startup_seconds(model_path, runtime):
+    out = subprocess.check_output([sys.executable, "-c", STARTUP, model_path, runtime], cwd=SERVER_DIR, text=True)
+    loaded, seconds = out.strip().splitlines()[-1].split()
+    return loaded, float(seconds)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ASL CNN runtime benchmark")
+    parser.add_argument("--model", default=os.path.join(SERVER_DIR, "models", "cnn8grps_rad1_model.h5"))
+    parser.add_argument("--runtimes", default="keras,tflite,onnx")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    args = parser.parse_args(argv)
+
+    from src.asl_runtime import load_asl_cnn
+    from src.skeleton_render import SkeletonCanvas
+    from src.utils.profiling import summarize
+
+    rng = np.random.default_rng(0)
+    canvas = SkeletonCanvas()
+    images = []
+    for _ in range(min(args.calls, 50)):
+        hand = [SimpleNamespace(x=x, y=y) for x, y in rng.uniform(0.3, 0.7, 2) + rng.normal(0, 0.05, (21, 2))]
+        images.append(canvas.render(canvas.points(hand, 640, 480)).copy())
+
+    report, reference = {}, None
+    for runtime in args.runtimes.split(","):
+        model, loaded = load_asl_cnn(args.model, runtime)  # Exports on the first run
+        if loaded != runtime:
+            print(f"{runtime}: not available, skipped")
+            continue
+        outputs = np.concatenate([model.predict(image[None], verbose=0) for image in images])
+        latency = []
+        for i in range(args.calls):
+            start = time.perf_counter()
+            model.predict(images[i % len(images)][None], verbose=0)
+            latency.append((time.perf_counter() - start) * 1000)
+        entry = {"latency_ms": summarize(latency), "startup_s": startup_seconds(args.model, runtime)[1]}
+        if reference is None:
+            reference = outputs
+        else:
+            entry["max_diff"] = float(np.abs(outputs - reference).max())
+            entry["top1_agreement"] = float(np.mean(outputs.argmax(1) == reference.argmax(1)))
+        report[runtime] = entry
+
+    print(f"{'runtime':<8}{'startup s':>11}{'p50 ms':>9}{'p95 ms':>9}{'max diff':>10}")
+    for runtime, entry in report.items():
+        print(f"{runtime:<8}{entry['startup_s']:>11.2f}{entry['latency_ms']['p50']:>9.2f}"
+              f"{entry['latency_ms']['p95']:>9.2f}{entry.get('max_diff', 0.0):>10.2e}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""
+Latency vs jitter of the server-side smoothing filters (src/filters.py) on
+head pose and body joint traces.
+
+A trace is what `main.py --record-trace trace.jsonl` writes: one JSON line per
+packet with the raw (unfiltered) "t", "head_pose" and "body_pose". Without
+--trace a synthetic one is used (smooth motion with quick turns plus noise),
+where the true signal is known.
+
+Per filter (and with latency prediction at --lead seconds):
+- jitter: RMS frame-to-frame acceleration of the output (lower = smoother)
+- error:  RMS distance to the true signal (synthetic) or to a centred,
+          zero-lag moving average of the raw trace (recorded); with
+          prediction, to that reference --lead seconds later
+- lag:    delay against the same reference from cross-correlation, in ms
+- us:     time per update
+
+Usage (from anywhere):
+    python tests/bench_filters.py [--trace trace.jsonl] [--lead 0.05]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'UnifiedServer'))
+
+from src.filters import make_filter
+
+# Same parameters as main.py's SMOOTHING_PARAMS
+PARAMS = {
+    "one_euro": {"head_pose": {"min_cutoff": 1.0, "beta": 0.1}, "body_pose": {"min_cutoff": 1.0, "beta": 0.05}},
+    "kalman": {"head_pose": {"process_noise": 1e3, "measurement_noise": 1.0},
+               "body_pose": {"process_noise": 1e4, "measurement_noise": 9.0}},
+}
+
+
+def synthetic_trace(seconds=60, fps=30, seed=0):
+    """(t, head (n, 3) noisy, head true, body (n, 18, 2) noisy, body true)."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * fps)) / fps
+    # Slow drift plus a quick 40 degree turn every few seconds
+    head = np.stack([10 * np.sin(t * 0.7), 25 * np.sin(t * 0.4) + 40 * np.tanh(4 * np.sin(t * 0.9)), 5 * np.sin(t * 1.3)], 1)
+    base = rng.uniform(100, 500, (1, 18, 2))
+    body = base + 60 * np.sin(t[:, None, None] * rng.uniform(0.5, 3, (1, 18, 2)))
+    return t, head + rng.normal(0, 1.0, head.shape), head, body + rng.normal(0, 3.0, body.shape), body
+
+
+def load_trace(path):
+    t, head, body = [], [], []
+    with open(path) as f:
+        for line in f:
+            record = json.loads(line)
+            pose = record.get("head_pose")
+            joints = record.get("body_pose") or []
+            if not pose or len(joints) != 18 or any(j is None for j in joints):
+                continue  # Only frames with everything found, so every series is complete
+            t.append(record["t"])
+            head.append((pose["pitch"], pose["yaw"], pose["roll"]))
+            body.append([(j["x"], j["y"]) for j in joints])
+    if len(t) < 30:
+        raise SystemExit(f"{path}: not enough complete frames ({len(t)})")
+    return np.array(t), np.array(head, float), None, np.array(body, float), None
+
+
+def centred_average(x, width=5):
+    kernel = np.ones(width) / width
+    flat = x.reshape(len(x), -1)
+    out = np.stack([np.convolve(np.pad(c, width // 2, mode="edge"), kernel, mode="valid") for c in flat.T], 1)
+    return out.reshape(x.shape)
+
+
+def shifted(reference, t, lead):
+    """The reference `lead` seconds later: what a predicting filter should output."""
+    flat = reference.reshape(len(reference), -1)
+    out = np.stack([np.interp(t + lead, t, c) for c in flat.T], 1)
+    return out.reshape(reference.shape)
+
+
+def lag_ms(output, reference, t, max_shift=10):
+    """Shift (in frames, converted to ms) that best aligns output with reference."""
+    dt = np.median(np.diff(t)) * 1000
+    a = (output - output.mean(0)).reshape(len(output), -1)
+    b = (reference - reference.mean(0)).reshape(len(reference), -1)
+    scores = [np.sum(a[s:] * b[:len(b) - s]) if s >= 0 else np.sum(a[:s] * b[-s:]) for s in range(-max_shift, max_shift + 1)]
+    return (int(np.argmax(scores)) - max_shift) * dt
+
+
+def run(kind, params, t, x, lead):
+    f = make_filter(kind, **params) if kind != "none" else None
+    out = np.empty_like(x)
+    start = time.perf_counter()
+    for i, (ti, xi) in enumerate(zip(t, x)):
+        if f is None:
+            out[i] = xi
+            continue
+        f.update(xi, ti)
+        out[i] = f.predict(lead) if lead else f.x
+    return out, (time.perf_counter() - start) / len(t) * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Smoothing filter latency vs jitter benchmark")
+    parser.add_argument("--trace", help="JSON lines from main.py --record-trace (default: synthetic)")
+    parser.add_argument("--lead", type=float, default=0.05, help="Latency to predict forward, seconds")
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    args = parser.parse_args(argv)
+
+    t, head, head_true, body, body_true = load_trace(args.trace) if args.trace else synthetic_trace()
+    report = {}
+    for signal, x, truth in (("head_pose", head, head_true), ("body_pose", body, body_true)):
+        reference = truth if truth is not None else centred_average(x)
+        print(f"\n{signal} ({len(t)} frames, {'true signal' if truth is not None else 'centred average'} as reference)")
+        print(f"{'filter':<16}{'jitter':>9}{'error':>9}{'lag ms':>9}{'us':>8}")
+        for kind in ("none", "one_euro", "kalman"):
+            for lead in (0.0, args.lead):  # "none" at the lead: how far the raw data is behind by then
+                out, us = run(kind, PARAMS.get(kind, {}).get(signal, {}), t, x, lead)
+                target = shifted(reference, t, lead) if lead else reference
+                entry = {
+                    "jitter": float(np.sqrt(np.mean(np.diff(out, n=2, axis=0) ** 2))),
+                    "error": float(np.sqrt(np.mean((out - target) ** 2))),
+                    "lag_ms": lag_ms(out, target, t),
+                    "us": us,
+                }
+                name = kind + (f"+{lead * 1000:.0f}ms" if lead else "")
+                report.setdefault(signal, {})[name] = entry
+                print(f"{name:<16}{entry['jitter']:>9.3f}{entry['error']:>9.3f}{entry['lag_ms']:>9.1f}{entry['us']:>8.1f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""
+End-to-end benchmark of the UnifiedServer processing path.
+
+Drives the real pipeline from main.py (MediaPipe, OpenPose, SignDETR,
+packet building, UDP send) over a recorded clip or synthetic frames and
+writes a JSON report with per-stage p50/p95/p99 latency, overall FPS,
+CPU utilisation and peak RSS.
+
+Usage (from anywhere):
+    python tests/bench_pipeline.py --source synthetic:300 --output report.json
+    python tests/bench_pipeline.py --source session.mp4 --save-baseline
+    python tests/bench_pipeline.py --source session.mp4 --check          # exit 1 on regression
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+SERVER_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'UnifiedServer'))
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks', 'baseline.json')
+
+sys.path.append(SERVER_DIR)
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       cwd=SERVER_DIR, text=True).strip()
+    except Exception:
+        return None
+
+
+def instrument(server, recorder):
+    """Wrap the stage functions of main.py so each call is timed."""
+    server.get_head_pose = recorder.timed("head_pose", server.get_head_pose)
+    server.get_body_pose = recorder.timed("body_pose", server.get_body_pose)
+    server.fanout.encode = recorder.timed("encode", server.fanout.encode)
+    server.signdetr_engine.infer_batch = recorder.timed("signdetr", server.signdetr_engine.infer_batch)
+    # build_packet classifies all hands of a frame in one predict_batch call
+    server.asl_classifier.predict_batch = recorder.timed("asl", server.asl_classifier.predict_batch)
+
+
+def run(args):
+    # main.py resolves its model paths relative to the server directory
+    if os.path.exists(args.source):
+        args.source = os.path.abspath(args.source)
+    os.chdir(SERVER_DIR)
+    import main as server
+    from src.frame_source import open_source
+    from src.threaded_inference import ThreadedInference
+    from src.utils.profiling import LatencyRecorder, ResourceMonitor
+
+    if args.detr_backend != server.signdetr_engine.backend:
+        server.signdetr_engine = server.make_signdetr_engine(args.detr_backend)
+
+    schedules = {} if args.no_schedule else server.MODEL_SCHEDULES
+    recorder = LatencyRecorder()
+    # Default target only; don't take the subscribe port of a running server
+    server.fanout = server.make_fanout(subscribe_port=0)
+    instrument(server, recorder)
+    server.fanout.start()
+
+    threaded_inference = ThreadedInference(
+        server.face_landmarker, server.hand_landmarker, parallel=server.PARALLEL_LANDMARKERS).start()
+    get_results = threaded_inference.get_results
+
+    def get_results_timed(frame_id=None, timeout=None):
+        result = get_results(frame_id, timeout)
+        if result is not None and frame_id is not None:
+            recorder.record("mediapipe_face", result.timings["face_ms"])
+            recorder.record("mediapipe_hand", result.timings["hand_ms"])
+        return result
+    threaded_inference.get_results = get_results_timed
+
+    # Warm-up frames are processed but not measured
+    if args.warmup:
+        warm_source = open_source(args.source, fps=args.fps)
+        warm = server.build_pipeline(warm_source, threaded_inference, schedules).start()
+        while not warm.finished() and warm.emitted < args.warmup:
+            time.sleep(0.01)
+        warm.stop()
+        recorder.reset()
+
+    source = open_source(args.source, fps=args.fps, realtime=args.realtime, loop=args.frames is not None)
+    pipeline = server.build_pipeline(source, threaded_inference, schedules)
+    monitor = ResourceMonitor().start()
+    pipeline.start()
+    while not pipeline.finished():
+        if args.frames is not None and pipeline.emitted >= args.frames:
+            break
+        time.sleep(0.01)
+    resources = monitor.stop()
+    emitted = pipeline.emitted
+    pipeline.stop()
+    server.fanout.stop()
+    threaded_inference.stop()
+    source.release()
+
+    return {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "device": str(server.DEVICE),
+        "detr_backend": server.signdetr_engine.backend,
+        "source": args.source,
+        "frames": emitted,
+        "dropped": pipeline.stats()["dropped"],
+        "scheduled": pipeline.stats()["scheduled"],
+        "fps": emitted / resources["wall_s"] if resources["wall_s"] else 0.0,
+        "resources": resources,
+        "stages": recorder.summary(),
+    }
+
+
+def print_report(report):
+    print(f"Frames: {report['frames']}  FPS: {report['fps']:.1f}  "
+          f"CPU: {report['resources']['cpu_utilisation']:.2f} cores  "
+          f"Peak RSS: {report['resources']['peak_rss_mb'] or 0:.0f} MB")
+    print(f"{'stage':<16}{'count':>7}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for name, stats in report["stages"].items():
+        print(f"{name:<16}{stats['count']:>7}{stats['p50']:>9.2f}{stats['p95']:>9.2f}{stats['p99']:>9.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="UnifiedServer end-to-end benchmark")
+    parser.add_argument("--source", default="synthetic:300",
+                        help="Video file, image directory or 'synthetic[:N]' (see main.py --source)")
+    parser.add_argument("--frames", type=int, default=None, help="Stop after N frames (loops the source)")
+    parser.add_argument("--warmup", type=int, default=10, help="Unmeasured warm-up frames")
+    parser.add_argument("--fps", type=float, default=None)
+    parser.add_argument("--realtime", action="store_true", help="Pace the source instead of running flat out")
+    parser.add_argument("--detr-backend", default="eager",
+                        choices=["eager", "torchscript", "onnx", "int8", "dynamic", "fp16"],
+                        help="SignDETR inference backend (see main.py --detr-backend)")
+    parser.add_argument("--no-schedule", action="store_true", help="Run every model on every frame")
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline report for --check/--save-baseline")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 if the run regresses vs the baseline")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed relative regression (default 15%%)")
+    args = parser.parse_args(argv)
+    for name in ("output", "baseline"):
+        if getattr(args, name):
+            setattr(args, name, os.path.abspath(getattr(args, name)))
+
+    from src.utils.profiling import compare_reports
+
+    report = run(args)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    if args.check:
+        if not os.path.exists(args.baseline):
+            print(f"No baseline at {args.baseline}; run with --save-baseline first.")
+            return 1
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_reports(report, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"No regressions vs baseline {baseline.get('commit')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Speed / accuracy report for the quantised SignDETR backends.
+
+Runs the float model and each quantised variant over a held-out set and
+reports per-frame latency plus the accuracy delta against the float model
+(detect/no-detect and class agreement, confidence error, top-box IoU).
+Calibrate the int8 backbone on different frames than the held-out set.
+
+Usage (from anywhere):
+    python tests/bench_signdetr_quant.py --holdout clips/holdout.mp4 --calibration clips/calib/
+    python tests/bench_signdetr_quant.py --holdout synthetic:50 --output quant_report.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+SERVER_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'UnifiedServer'))
+sys.path.append(SERVER_DIR)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Quantised SignDETR speed/accuracy report")
+    parser.add_argument("--model", default=os.path.join(SERVER_DIR, "models", "signdetr.pt"))
+    parser.add_argument("--holdout", default="synthetic:50", help="Held-out frames (image dir, video, 'synthetic:N')")
+    parser.add_argument("--calibration", default=None, help="Calibration frames for int8 (default: synthetic)")
+    parser.add_argument("--frames", type=int, default=200, help="Max held-out frames")
+    parser.add_argument("--modes", default="dynamic,fp16,int8")
+    parser.add_argument("--threshold", type=float, default=0.7, help="Detection threshold (main.py CONFIDENCE_THRESHOLD)")
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    args = parser.parse_args(argv)
+    if args.calibration and os.path.abspath(args.calibration) == os.path.abspath(args.holdout):
+        print("WARNING: calibrating on the held-out set makes the int8 numbers optimistic")
+
+    from src.signdetr_engine import SignDETREngine
+    from src.signdetr_model import DETR
+    from src.signdetr_quant import accuracy_delta, load_frames
+    from src.utils.profiling import summarize
+    from src.utils.setup import get_classes
+
+    model = DETR(num_classes=len(get_classes()), pretrained_backbone=False)
+    if os.path.exists(args.model):
+        model.load_pretrained(args.model)
+    else:
+        print(f"WARNING: {args.model} not found, using random weights")
+    model.eval()
+
+    holdout = load_frames(args.holdout, args.frames)
+    calibration = load_frames(args.calibration) if args.calibration else None
+
+    def run(engine):
+        outputs, latency = [], []
+        for image in holdout:
+            start = time.perf_counter()
+            outputs.append(engine.infer(image))
+            latency.append((time.perf_counter() - start) * 1000)
+        return outputs, summarize(latency)
+
+    reference, reference_latency = run(SignDETREngine(model))
+    report = {"model": args.model, "holdout": args.holdout, "frames": len(holdout),
+              "threshold": args.threshold, "float": {"latency_ms": reference_latency}}
+    for mode in args.modes.split(","):
+        # model_path=None: build in memory, don't touch the cached artifacts
+        engine = SignDETREngine(model, backend=mode, calibration=calibration)
+        if engine.backend != mode:
+            continue
+        outputs, latency = run(engine)
+        report[mode] = {"latency_ms": latency, **accuracy_delta(reference, outputs, args.threshold)}
+
+    print(f"{'backend':<9}{'p50 ms':>9}{'speedup':>9}{'decision':>10}{'label':>8}{'conf MAE':>10}{'box IoU':>9}")
+    base = reference_latency["p50"]
+    for name, entry in report.items():
+        if not isinstance(entry, dict):
+            continue
+        p50 = entry["latency_ms"]["p50"]
+        iou = entry.get("box_iou")
+        print(f"{name:<9}{p50:>9.1f}{base / p50 if p50 else 0:>8.2f}x"
+              f"{entry.get('decision_agreement', 1.0):>10.3f}{entry.get('label_agreement', 1.0):>8.3f}"
+              f"{entry.get('conf_mae', 0.0):>10.4f}{'-' if iou is None else f'{iou:.3f}':>9}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
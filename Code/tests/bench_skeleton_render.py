@@ -0,0 +1,65 @@
+"""
+Microbenchmark of the ASL CNN input rendering: the reference
+skeleton_points + render_skeleton against SkeletonCanvas (preallocated
+canvas, numpy points, one polylines call). Every rendered image is compared
+byte-for-byte with the reference; exits 1 on any difference.
+
+Usage (from anywhere):
+    python tests/bench_skeleton_render.py --hands 2000
+    python tests/bench_skeleton_render.py --landmarks data/asl_landmarks.npz
+"""
+import argparse
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+SERVER_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'UnifiedServer'))
+sys.path.append(SERVER_DIR)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Skeleton rendering microbenchmark")
+    parser.add_argument("--hands", type=int, default=2000, help="Random hands (ignored with --landmarks)")
+    parser.add_argument("--landmarks", help="Real hands (.npz from distill_asl_landmarks.py)")
+    args = parser.parse_args(argv)
+
+    from src.skeleton_render import SkeletonCanvas, render_skeleton, skeleton_points
+    from src.utils.profiling import summarize
+
+    if args.landmarks:
+        data = np.load(args.landmarks)
+        rows, sizes = data["landmarks"], data["sizes"]
+    else:
+        rng = np.random.default_rng(0)
+        rows = rng.uniform(0.3, 0.7, (args.hands, 1, 2)) + rng.normal(0, 0.05, (args.hands, 21, 2))
+        sizes = np.tile([640, 480], (args.hands, 1))
+    hands = [([SimpleNamespace(x=float(x), y=float(y)) for x, y in row], int(w), int(h))
+             for row, (w, h) in zip(rows, sizes)]
+
+    canvas = SkeletonCanvas()
+    reference_ms, canvas_ms, mismatches = [], [], 0
+    for hand, w, h in hands:
+        start = time.perf_counter()
+        expected = render_skeleton(skeleton_points(hand, w, h))
+        reference_ms.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        image = canvas.render(canvas.points(hand, w, h))
+        canvas_ms.append((time.perf_counter() - start) * 1000)
+
+        mismatches += expected.tobytes() != image.tobytes()
+
+    reference, fast = summarize(reference_ms), summarize(canvas_ms)
+    print(f"{'render':<10}{'mean ms':>9}{'p95 ms':>9}")
+    print(f"{'reference':<10}{reference['mean']:>9.4f}{reference['p95']:>9.4f}")
+    print(f"{'canvas':<10}{fast['mean']:>9.4f}{fast['p95']:>9.4f}")
+    print(f"Speedup {reference['mean'] / fast['mean']:.2f}x, "
+          f"{len(hands) - mismatches}/{len(hands)} images byte-identical")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""
+Round-trip benchmark of the UDP wire formats: json.dumps/json.loads vs the
+fixed-layout binary encoder and its reference decoder.
+
+Usage:
+    python tests/bench_wire_format.py [--iterations 20000]
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'UnifiedServer'))
+
+from src.wire_format import PacketEncoder, decode_binary, sign_table
+from test_wire_format import CLASSES, sample_packet
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    packet = sample_packet()
+    signs = sign_table(CLASSES)
+    json_encoder = PacketEncoder("json", CLASSES)
+    binary_encoder = PacketEncoder("binary", CLASSES)
+    json_data = json_encoder.encode(packet)
+    binary_data = binary_encoder.encode(packet)
+
+    cases = {
+        "json encode": lambda: json_encoder.encode(packet),
+        "json decode": lambda: json.loads(json_data),
+        "binary encode": lambda: binary_encoder.encode(packet),
+        "binary decode": lambda: decode_binary(binary_data, signs),
+    }
+    print(f"packet size: json {len(json_data)} B, binary {len(binary_data)} B")
+    for name, fn in cases.items():
+        best = min(timeit.repeat(fn, number=args.iterations, repeat=3))
+        print(f"{name:<14} {best / args.iterations * 1e6:8.2f} us/packet")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Distils the skeleton CNN (cnn8grps_rad1_model.h5) into the landmark MLP
+used by ASLClassifier.predict_landmarks (src/landmark_classifier.py).
+
+1. Collects hand landmarks with the MediaPipe hand landmarker from a
+   frame source (image directory / video), or loads a saved landmark set.
+2. Labels every hand with the CNN's group probabilities (rendered skeleton,
+   as at runtime), plus `--augment` jittered copies per hand.
+3. Trains a scikit-learn MLP on landmark_features() and reports agreement
+   with the CNN on a held-out split, before and after apply_rules.
+
+Usage (from Code/UnifiedServer):
+    python ../tests/distill_asl_landmarks.py --source clips/signing.mp4 --save-landmarks data/asl_landmarks.npz
+    python ../tests/distill_asl_landmarks.py --landmarks data/asl_landmarks.npz --output models/asl_landmark_mlp.p
+"""
+import argparse
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+import numpy as np
+
+SERVER_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'UnifiedServer'))
+sys.path.append(SERVER_DIR)
+
+
+def collect_landmarks(spec, hand_model, limit):
+    """(N, 21, 2) normalised landmarks and (N, 2) image sizes of every hand found in the source."""
+    import mediapipe as mp
+    from mediapipe.tasks.python.core.base_options import BaseOptions
+    from mediapipe.tasks.python.vision.hand_landmarker import HandLandmarker, HandLandmarkerOptions
+    from src.frame_source import open_source
+
+    landmarker = HandLandmarker.create_from_options(
+        HandLandmarkerOptions(base_options=BaseOptions(model_asset_path=hand_model), num_hands=2))
+    source = open_source(spec)
+    landmarks, sizes = [], []
+    while len(landmarks) < limit:
+        ok, frame = source.read()
+        if not ok:
+            break
+        image = mp.Image(image_format=mp.ImageFormat.SRGB, data=np.ascontiguousarray(frame[:, :, ::-1]))
+        for hand in landmarker.detect(image).hand_landmarks:
+            landmarks.append([(lm.x, lm.y) for lm in hand])
+            sizes.append(frame.shape[1::-1])
+    source.release()
+    return np.array(landmarks, dtype=np.float32).reshape(-1, 21, 2), np.array(sizes, dtype=np.int32).reshape(-1, 2)
+
+
+def as_landmarks(row):
+    return [SimpleNamespace(x=float(x), y=float(y)) for x, y in row]
+
+
+def teacher_labels(asl, landmarks, sizes, batch=64):
+    """CNN group probabilities and the canvas points for every hand."""
+    points = [asl.skeleton_points(as_landmarks(row), w, h) for row, (w, h) in zip(landmarks, sizes)]
+    probs = []
+    for start in range(0, len(points), batch):
+        images = np.stack([asl.render_skeleton(p).copy() for p in points[start:start + batch]])  # Shared canvas
+        probs.append(asl.model_cnn.predict(images, verbose=0))
+    return np.concatenate(probs).astype(np.float32), points
+
+
+def final_chars(asl, probs, points):
+    """apply_rules on the top-2 groups, without touching the classifier's text state."""
+    chars = []
+    for prob, pts in zip(probs, points):
+        prob = prob.copy()
+        ch1 = int(np.argmax(prob))
+        prob[ch1] = 0
+        asl.pts = np.asarray(pts).tolist()
+        chars.append(asl.apply_rules(ch1, int(np.argmax(prob))))
+    return chars
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Distil the ASL skeleton CNN into a landmark MLP")
+    parser.add_argument("--source", help="Frames to collect hands from (image dir or video)")
+    parser.add_argument("--landmarks", help="Landmark set saved with --save-landmarks")
+    parser.add_argument("--save-landmarks", help="Write the collected landmarks (.npz) here")
+    parser.add_argument("--max-hands", type=int, default=20000)
+    parser.add_argument("--hand-model", default=os.path.join(SERVER_DIR, "models", "hand_landmarker.task"))
+    parser.add_argument("--cnn", default=os.path.join(SERVER_DIR, "models", "cnn8grps_rad1_model.h5"))
+    parser.add_argument("--augment", type=int, default=4, help="Jittered copies per hand (teacher-labelled)")
+    parser.add_argument("--jitter", type=float, default=0.004, help="Landmark noise, normalised image units")
+    parser.add_argument("--hidden", default="128,64")
+    parser.add_argument("--holdout", type=float, default=0.2)
+    parser.add_argument("--output", default=os.path.join(SERVER_DIR, "models", "asl_landmark_mlp.p"))
+    args = parser.parse_args(argv)
+
+    from sklearn.neural_network import MLPClassifier
+    from src.asl_classifier import ASLClassifier
+    from src.landmark_classifier import LandmarkClassifier, landmark_features
+
+    if args.landmarks:
+        data = np.load(args.landmarks)
+        landmarks, sizes = data["landmarks"], data["sizes"]
+    elif args.source:
+        landmarks, sizes = collect_landmarks(args.source, args.hand_model, args.max_hands)
+        if args.save_landmarks:
+            np.savez_compressed(args.save_landmarks, landmarks=landmarks, sizes=sizes)
+    else:
+        parser.error("give --source or --landmarks")
+    if len(landmarks) < 10:
+        print(f"Only {len(landmarks)} hands found, need more data")
+        return 1
+
+    # Split by hand before augmenting, so jittered copies don't leak into the held-out set
+    rng = np.random.default_rng(0)
+    order = rng.permutation(len(landmarks))
+    cut = int(len(order) * (1 - args.holdout))
+    train, test = order[:cut], order[cut:]
+    train_landmarks = np.concatenate([landmarks[train]] + [
+        landmarks[train] + rng.normal(0, args.jitter, landmarks[train].shape).astype(np.float32)
+        for _ in range(args.augment)])
+    train_sizes = np.concatenate([sizes[train]] * (args.augment + 1))
+
+    asl = ASLClassifier(args.cnn, None, output_dir=tempfile.mkdtemp())
+    if asl.model_cnn is None:
+        return 1
+    train_probs, train_points = teacher_labels(asl, train_landmarks, train_sizes)
+    test_probs, test_points = teacher_labels(asl, landmarks[test], sizes[test])
+
+    features = np.concatenate([landmark_features(p) for p in train_points])
+    mlp = MLPClassifier(hidden_layer_sizes=tuple(int(n) for n in args.hidden.split(",")),
+                        max_iter=500, early_stopping=True, random_state=0)
+    mlp.fit(features, train_probs.argmax(1))
+    student = LandmarkClassifier.from_sklearn(mlp)
+
+    student_probs = student.predict_proba(np.concatenate([landmark_features(p) for p in test_points]))
+    group_agreement = np.mean(student_probs.argmax(1) == test_probs.argmax(1))
+    char_agreement = np.mean([a == b for a, b in zip(final_chars(asl, student_probs, test_points),
+                                                      final_chars(asl, test_probs, test_points))])
+    print(f"Hands: {len(train)} train (+{args.augment}x jitter), {len(test)} held out")
+    print(f"Held-out agreement with the CNN: group {group_agreement:.3f}, character {char_agreement:.3f}")
+
+    student.save(args.output)
+    print(f"Saved landmark model to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+import sys
+import os
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'UnifiedServer'))
+
+from src.asl_classifier import ASLClassifier
+
+
+class CountingModel:
+    """Stands in for the Keras CNN: records batch sizes, always predicts group 4 (L)."""
+
+    def __init__(self):
+        self.batches = []
+
+    def predict(self, images, verbose=0):
+        self.batches.append(images.shape)
+        probs = np.zeros((len(images), 8), np.float32)
+        probs[:, 4], probs[:, 0] = 0.9, 0.1
+        return probs
+
+
+def hand(shift=0.0):
+    rng = np.random.default_rng(0)
+    return [SimpleNamespace(x=0.4 + shift + x, y=0.5 + y) for x, y in rng.normal(0, 0.05, (21, 2))]
+
+
+def make_classifier(tmp_path):
+    asl = ASLClassifier(str(tmp_path / "missing.h5"), None, output_dir=str(tmp_path))
+    asl.model_cnn = CountingModel()
+    asl.prediction_interval = 0
+    return asl
+
+
+def test_predict_batch_runs_one_model_call_for_all_hands(tmp_path):
+    asl = make_classifier(tmp_path)
+    chars = asl.predict_batch([("Left", hand(), 640, 480), ("Right", hand(0.2), 640, 480),
+                               ("cam1:Right", hand(-0.1), 1280, 720)])
+    assert chars == ["L", "L", "L"]
+    assert asl.model_cnn.batches == [(3, 400, 400, 3)]
+    # Same input as the single-hand path
+    images = asl.batch_images[:3].copy()
+    single = asl.render_skeleton(asl.skeleton_points(hand(0.2), 640, 480))
+    assert np.array_equal(images[1], single)
+
+
+def test_each_hand_keeps_its_own_text(tmp_path):
+    asl = make_classifier(tmp_path)
+    left, right = asl.signer("Left"), asl.signer("Right")
+    left.ten_prev_char = ["A"] * 10
+    left.prev_char = right.prev_char = "A"
+
+    asl.classify(np.eye(8)[4], asl.skeleton_points(hand(), 640, 480), "Left")  # Advance history
+    left.process_char("next")
+    asl.primary = "Left"
+    asl.save_text("Left")
+    assert asl.io.flush(timeout=5)
+
+    assert left.current_str == " A" and right.current_str == " "
+    assert asl.current_str == " A"
+    with open(tmp_path / "Text" / "output.txt") as f:
+        assert f.read() == " A"
+    assert os.path.exists(tmp_path / "Text" / "output_Left.txt")
+
+
+def test_rate_limit_is_per_hand(tmp_path):
+    asl = make_classifier(tmp_path)
+    asl.prediction_interval = 60
+    asl.predict_batch([("Left", hand(), 640, 480)])
+    chars = asl.predict_batch([("Left", hand(), 640, 480), ("Right", hand(0.2), 640, 480)])
+    assert chars == ["L", "L"]
+    assert asl.model_cnn.batches == [(1, 400, 400, 3), (1, 400, 400, 3)]  # Only the right hand was due
+
+
+def test_primary_signer_follows_its_key_not_the_hand_order(tmp_path):
+    asl = make_classifier(tmp_path)
+    asl.predict_batch([("Left", hand(), 640, 480), ("Right", hand(0.2), 640, 480)])
+    assert asl.primary == "Left"
+    asl.predict_batch([("Right", hand(0.2), 640, 480), ("Left", hand(), 640, 480)])  # MediaPipe swapped them
+    assert asl.primary == "Left"
+    asl.predict_batch([("Right", hand(0.2), 640, 480)])
+    assert asl.primary == "Right"
+
+
+def test_single_hand_api_still_writes_output_after_a_batch(tmp_path):
+    asl = make_classifier(tmp_path)
+    asl.predict_batch([("Left", hand(), 640, 480)])
+    assert asl.predict_cnn(hand(), 640, 480) == "L"
+    asl.signer().current_str = " B"
+    asl.save_text()
+    assert asl.io.flush(timeout=5)
+    assert asl.current_str == " B"
+    with open(tmp_path / "Text" / "output.txt") as f:
+        assert f.read() == " B"
@@ -0,0 +1,45 @@
+import sys
+import os
+from collections import Counter
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'UnifiedServer'))
+
+from src.asl_rules import GROUP_RULES, GROUPS, apply_rules, apply_rules_reference
+
+
+def corpus(count, seed=0):
+    """Skeleton point sets: spread-out hands, plus tightly packed ones so that ties (==) occur."""
+    rng = np.random.default_rng(seed)
+    for i in range(count):
+        if i % 2:
+            pts = rng.integers(150, 190, (21, 2))
+        else:
+            pts = rng.integers(60, 340, (21, 2))
+        yield pts.tolist()
+
+
+def test_table_engine_matches_reference_for_all_group_pairs():
+    outputs = Counter()
+    for pts in corpus(1500):
+        for ch1 in range(GROUPS):
+            for ch2 in range(GROUPS):
+                a, b = np.int64(ch1), np.int64(ch2)  # As they come from np.argmax
+                expected = apply_rules_reference(pts, a, b)
+                assert apply_rules(pts, a, b) == expected, (pts, ch1, ch2)
+                outputs[expected] += 1
+    # The corpus reaches every letter and every special output
+    assert set("ABCDEFGHIJKLMNOPQRSTUVWXYZ") <= set(outputs)
+    assert {" ", "next", "Backspace"} <= set(outputs)
+
+
+def test_group_rules_use_valid_pairs():
+    assert all(0 <= ch1 < GROUPS and 0 <= ch2 < GROUPS for pairs, _, _ in GROUP_RULES for ch1, ch2 in pairs)
+
+
+def test_backspace_only_overrides_its_letters():
+    # Thumb tip above every finger joint and the wrist right of all fingertips
+    pts = [[300, 300]] + [[200, 150]] * 3 + [[200, 100]] + [[100 + 5 * i, 200 + (i % 4) * 10] for i in range(16)]
+    assert apply_rules(pts, 3, 3) == "Backspace"  # H
+    assert apply_rules(pts, 4, 0) == "L"  # The old `ch1 == 'Next' or 'B' or ...` turned this into Backspace too
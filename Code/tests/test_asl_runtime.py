@@ -0,0 +1,48 @@
+import sys
+import os
+import time
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'UnifiedServer'))
+
+from src.asl_runtime import lean_path, load_asl_cnn
+from src.utils.setup import is_stale
+
+
+def test_exports_are_cached_next_to_the_h5_and_rebuilt_when_older(tmp_path):
+    model_path = str(tmp_path / "cnn.h5")
+    assert lean_path(model_path, "tflite") == str(tmp_path / "cnn.tflite")
+    assert lean_path(model_path, "onnx") == str(tmp_path / "cnn.onnx")
+
+    export = lean_path(model_path, "tflite")
+    assert is_stale(export, model_path)
+    open(model_path, "w").close()
+    open(export, "w").close()
+    os.utime(model_path, (time.time() - 10, time.time() - 10))
+    assert not is_stale(export, model_path)
+    os.utime(model_path, None)
+    os.utime(export, (time.time() - 10, time.time() - 10))
+    assert is_stale(export, model_path)
+
+    with pytest.raises(ValueError):
+        load_asl_cnn(model_path, "tensorrt")
+
+
+def test_tflite_export_matches_keras(tmp_path):
+    tf = pytest.importorskip("tensorflow")
+    inputs = tf.keras.Input((400, 400, 3))
+    x = tf.keras.layers.Conv2D(4, 3, strides=8, activation="relu")(inputs)
+    x = tf.keras.layers.GlobalAveragePooling2D()(x)
+    outputs = tf.keras.layers.Dense(8, activation="softmax")(x)
+    model = tf.keras.Model(inputs, outputs)
+    model_path = str(tmp_path / "cnn.h5")
+    model.save(model_path)
+
+    lean, runtime = load_asl_cnn(model_path, "tflite")
+    assert runtime == "tflite" and os.path.exists(lean_path(model_path, "tflite"))
+    images = np.random.default_rng(0).integers(0, 256, (2, 400, 400, 3)).astype(np.uint8)
+    expected = model.predict(images.astype(np.float32), verbose=0)
+    assert np.allclose(lean.predict(images[:1]), expected[:1], atol=1e-5)
+    assert np.allclose(lean.predict(images), expected, atol=1e-5)
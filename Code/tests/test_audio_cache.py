@@ -0,0 +1,74 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'UnifiedServer'))
+
+from src.audio_cache import AudioCache
+from src.text_io import TextIOWorker
+
+
+class CountingEngine:
+    """Stands in for pyttsx3: writes the text as the "audio" and counts syntheses."""
+
+    def __init__(self):
+        self.queued = []
+        self.calls = 0
+
+    def getProperty(self, name):
+        return {"voice": "test-voice", "rate": 100}[name]
+
+    def save_to_file(self, text, path):
+        self.queued.append((text, path))
+
+    def runAndWait(self):
+        for text, path in self.queued:
+            self.calls += 1
+            with open(path, "w") as f:
+                f.write(text)
+        self.queued = []
+
+
+def cache_entry(cache, text):
+    path = cache.temp_path(cache.key(text))
+    with open(path, "w") as f:
+        f.write(text * 10)
+    return cache.add(cache.key(text), path)
+
+
+def test_lru_eviction_keeps_recently_used(tmp_path):
+    cache = AudioCache(str(tmp_path), max_bytes=100)
+    for text in ("HELLO", "THANKS", "YES"):  # 50 + 60 + 30 bytes
+        cache_entry(cache, text)
+    assert cache.get(cache.key("HELLO")) is None  # Oldest went first
+    assert cache.get(cache.key("THANKS")) and cache.get(cache.key("YES"))
+    assert cache.total <= 100
+
+    cache.get(cache.key("THANKS"))  # Now most recent
+    cache_entry(cache, "NO")
+    assert cache.get(cache.key("YES")) is None and cache.get(cache.key("THANKS"))
+    assert cache.key("THANKS") == cache.key("  THANKS ") != cache.key("THANKS", rate=150)
+
+    # The order comes from the file times after a restart
+    os.utime(cache.path(cache.key("NO")), (0, 0))
+    reopened = AudioCache(str(tmp_path), max_bytes=100)
+    assert list(reopened.entries) == [cache.key("NO"), cache.key("THANKS")]
+
+
+def test_repeated_phrase_is_served_from_cache(tmp_path):
+    engine = CountingEngine()
+    cache = AudioCache(str(tmp_path / "cache"))
+    worker = TextIOWorker(lambda: engine, cache=cache).start()
+    target = str(tmp_path / "speech.wav")
+    done = []
+
+    worker.warm_up(["HELLO"])
+    assert worker.flush(timeout=5) and engine.calls == 1
+    for text in ("HELLO", " HELLO", "BYE", "HELLO"):
+        worker.speak(text, target, lambda status, path, text: done.append(status))
+        assert worker.flush(timeout=5)
+        with open(target) as f:
+            assert f.read() == text.strip()
+    assert engine.calls == 2  # Only BYE needed synthesising
+    assert done == ["ready"] * 4 and worker.status()["speech_id"] == 4
+    assert not [name for name in os.listdir(tmp_path) if ".tmp" in name]
+    worker.stop()
@@ -0,0 +1,53 @@
+import sys
+import os
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'UnifiedServer'))
+
+from src.utils.boxes import DETECTION_DTYPE, postprocess_detections
+
+
+def loop_postprocess(outputs, w, h, threshold):
+    """The per-query loop main.py used before postprocess_detections."""
+    probas = outputs['pred_logits'].softmax(-1)[0, :, :-1]
+    keep = probas.max(-1).values > threshold
+    detections = []
+    for idx in keep.nonzero(as_tuple=True)[0]:
+        box_class_id = probas[idx].argmax()
+        cx, cy, bw, bh = outputs['pred_boxes'][0, idx].tolist()
+        detections.append((int(box_class_id), probas[idx][box_class_id].item(),
+                           int((cx - bw/2) * w), int((cy - bh/2) * h), int((cx + bw/2) * w), int((cy + bh/2) * h)))
+    return sorted(detections, key=lambda d: -d[1])
+
+
+def test_matches_the_per_query_loop():
+    torch.manual_seed(0)
+    outputs = {"pred_logits": torch.randn(1, 100, 6) * 4, "pred_boxes": torch.rand(1, 100, 4) * 0.5 + 0.1}
+    detections = postprocess_detections(outputs, (640, 480), 0.7)
+    expected = loop_postprocess(outputs, 640, 480, 0.7)
+
+    assert detections.dtype == DETECTION_DTYPE
+    assert 0 < len(detections) == len(expected)
+    for row, (class_id, conf, *box) in zip(detections, expected):
+        assert row["class_id"] == class_id
+        assert row["conf"] == pytest.approx(conf, abs=1e-6)
+        assert all(abs(int(row[name]) - value) <= 1 for name, value in zip(("x1", "y1", "x2", "y2"), box))
+
+    empty = postprocess_detections(outputs, (640, 480), 1.0)
+    assert len(empty) == 0 and empty.dtype == DETECTION_DTYPE
+
+
+def test_class_aware_nms_keeps_best_box_per_class():
+    logits = torch.full((1, 3, 3), -10.0)
+    logits[0, 0, 0] = logits[0, 1, 0] = logits[0, 2, 1] = 10.0
+    logits[0, 1, 0] = 9.0
+    box = [0.5, 0.5, 0.2, 0.2]
+    outputs = {"pred_logits": logits, "pred_boxes": torch.tensor([[box, [0.51, 0.5, 0.2, 0.2], box]])}
+
+    assert len(postprocess_detections(outputs, (100, 100), 0.5)) == 3
+    detections = postprocess_detections(outputs, (100, 100), 0.5, nms_iou=0.5)
+    assert sorted(detections["class_id"].tolist()) == [0, 1]  # Same-class duplicate dropped, other class kept
+    assert detections[detections["class_id"] == 0]["x1"][0] == 40
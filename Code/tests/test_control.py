@@ -0,0 +1,41 @@
+import sys
+import os
+import socket
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'UnifiedServer'))
+
+from src.control import ControlChannel
+
+
+def test_control_channel_dispatches_udp_commands():
+    calls = []
+    probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    probe.bind(("127.0.0.1", 0))
+    port = probe.getsockname()[1]
+    probe.close()
+
+    control = ControlChannel({"speak": lambda: calls.append("speak")}, udp_port=port).start()
+    try:
+        sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sender.sendto(b"SPEAK\n", ("127.0.0.1", port))
+        deadline = time.time() + 2.0
+        while not calls and time.time() < deadline:
+            time.sleep(0.01)
+        assert calls == ["speak"]
+        assert not control.dispatch("unknown")
+    finally:
+        control.stop()
+
+
+def test_failing_command_is_logged_not_raised(caplog):
+    def broken():
+        raise RuntimeError("no audio device")
+
+    control = ControlChannel({"speak": broken})
+    with caplog.at_level("WARNING"):
+        assert control.dispatch("speak")
+        assert not control.dispatch("dance")
+    messages = [record.getMessage() for record in caplog.records]
+    assert "Control command 'speak' failed" in messages
+    assert "Unknown control command: dance" in messages
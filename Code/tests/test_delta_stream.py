@@ -0,0 +1,90 @@
+import sys
+import os
+import copy
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'UnifiedServer'))
+
+from src.delta_stream import DeltaDecoder, DeltaEncoder
+from src.wire_format import PacketEncoder, decode_binary, decode_json, sign_table
+from test_wire_format import CLASSES, sample_packet
+
+
+def stream(frames=40):
+    """A packet sequence with a slowly drifting head, a waving arm and occasional label changes."""
+    packet = sample_packet()
+    for i in range(frames):
+        packet = copy.deepcopy(packet)
+        packet["head_pose"]["yaw"] += 0.2
+        packet["body_pose"][4]["x"] += 3
+        if i % 10 == 5:
+            packet["asl_char"] = "C" if packet["asl_char"] == "B" else "B"
+            packet["current_text"] += packet["asl_char"]
+        yield packet
+
+
+def decode(data, wire_format):
+    if wire_format == "json":
+        return decode_json(data)
+    return decode_binary(data, sign_table(CLASSES))
+
+
+@pytest.mark.parametrize("wire_format", ["json", "binary"])
+def test_deltas_rebuild_the_stream(wire_format):
+    encoder = PacketEncoder(wire_format, CLASSES, DeltaEncoder(keyframe_interval=15))
+    decoder = DeltaDecoder()
+    sent = types = 0
+    for packet in stream():
+        data = encoder.encode(packet, timestamp=1.0)
+        if data is None:
+            continue
+        sent += 1
+        message = decode(data, wire_format)
+        types += message["type"] == "full"
+        state = decoder.apply(message)
+        assert state is not None
+        assert state["asl_char"] == packet["asl_char"]
+        assert state["current_text"] == packet["current_text"]
+        assert state["body_pose"][4]["x"] == packet["body_pose"][4]["x"]
+        assert state["head_pose"]["yaw"] == pytest.approx(packet["head_pose"]["yaw"], abs=0.5)
+    assert decoder.lost == 0
+    assert 2 <= types < sent
+
+
+@pytest.mark.parametrize("wire_format", ["json", "binary"])
+def test_new_speech_is_sent_as_a_delta(wire_format):
+    encoder = PacketEncoder(wire_format, CLASSES, DeltaEncoder(keyframe_interval=100))
+    packet = sample_packet()
+    encoder.encode(packet)
+    packet = copy.deepcopy(packet)
+    packet["speech"], packet["speech_id"] = "idle", packet["speech_id"] + 1
+    message = decode(encoder.encode(packet), wire_format)
+    assert message["type"] == "delta"
+    assert message["changes"] == {"speech": "idle", "speech_id": packet["speech_id"]}
+
+
+def test_unchanged_packets_are_not_sent():
+    encoder = PacketEncoder("json", CLASSES, DeltaEncoder(keyframe_interval=100))
+    packet = sample_packet()
+    assert encoder.encode(packet) is not None
+    assert encoder.encode(copy.deepcopy(packet)) is None
+    packet["body_pose"][1]["x"] += 1  # below joint_epsilon
+    assert encoder.encode(packet) is None
+    assert encoder.seq == 1
+
+
+def test_loss_waits_for_requested_keyframe():
+    encoder = PacketEncoder("binary", CLASSES, DeltaEncoder(keyframe_interval=1000))
+    decoder = DeltaDecoder()
+    messages = [decode(data, "binary") for data in map(encoder.encode, stream(10)) if data is not None]
+    decoder.apply(messages[0])
+    assert decoder.apply(messages[2]) is None  # messages[1] was lost
+    assert decoder.lost == 1 and decoder.needs_keyframe
+
+    encoder.request_keyframe()
+    packet = sample_packet()
+    keyframe = decode(encoder.encode(packet), "binary")
+    assert keyframe["type"] == "full"
+    assert decoder.apply(keyframe)["current_text"] == packet["current_text"]
+    assert not decoder.needs_keyframe
@@ -0,0 +1,142 @@
+import sys
+import os
+import json
+import socket
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'UnifiedServer'))
+
+from src.fanout import FanoutSender
+from test_wire_format import CLASSES, sample_packet
+
+
+def free_port():
+    probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    probe.bind(("127.0.0.1", 0))
+    port = probe.getsockname()[1]
+    probe.close()
+    return port
+
+
+def receiver():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(1.0)
+    return sock
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def drain(sock):
+    packets = []
+    sock.settimeout(0.05)
+    try:
+        while True:
+            packets.append(json.loads(sock.recv(65536)))
+    except socket.timeout:
+        pass
+    return packets
+
+
+def test_subscribers_get_their_fields_and_rate():
+    port = free_port()
+    sender = FanoutSender(CLASSES, bind_ip="127.0.0.1", port=port).start()
+    static, face, text = receiver(), receiver(), receiver()
+    try:
+        sender.add_target(static.getsockname())
+        face.sendto(json.dumps({"type": "hello", "fields": ["head_pose", "expression"]}).encode(),
+                    ("127.0.0.1", port))
+        text.sendto(json.dumps({"type": "hello", "fields": ["current_text"], "rate": 5}).encode(),
+                    ("127.0.0.1", port))
+        assert wait_for(lambda: len(sender.subscribers) == 3)
+
+        for i in range(10):
+            packet = sample_packet()
+            packet["current_text"] = str(i)
+            sender.publish(packet)
+            time.sleep(0.02)
+        time.sleep(0.25)
+
+        assert len(drain(static)) == 10
+        face_packets = drain(face)
+        assert len(face_packets) == 10
+        assert set(face_packets[0]) == {"head_pose", "expression"}
+        # Rate-limited to 5 Hz: fewer packets, but the latest text still arrives
+        text_packets = drain(text)
+        assert 1 <= len(text_packets) < 10
+        assert text_packets[-1] == {"current_text": "9"}
+    finally:
+        sender.stop()
+
+
+def test_subscribers_expire_and_can_leave():
+    port = free_port()
+    sender = FanoutSender(CLASSES, bind_ip="127.0.0.1", port=port, timeout=0.2).start()
+    a, b = receiver(), receiver()
+    try:
+        a.sendto(b"hello", ("127.0.0.1", port))
+        b.sendto(b"hello", ("127.0.0.1", port))
+        assert wait_for(lambda: len(sender.subscribers) == 2)
+        b.sendto(b"bye", ("127.0.0.1", port))
+        assert wait_for(lambda: len(sender.subscribers) == 1)
+        # No further hellos: the last subscriber times out
+        assert wait_for(lambda: not sender.subscribers)
+        a.sendto(b"not json {", ("127.0.0.1", port))
+        a.sendto(b'{"type": "hello", "format": "xml"}', ("127.0.0.1", port))
+        time.sleep(0.1)
+        assert not sender.subscribers
+    finally:
+        sender.stop()
+
+
+def test_static_target_can_request_keyframes_without_subscribe_port():
+    sender = FanoutSender(CLASSES, keyframe_interval=1000, bind_ip="127.0.0.1", port=0).start()
+    static, stranger = receiver(), receiver()
+    try:
+        sender.add_target(static.getsockname())
+        packet = sample_packet()
+        sender.publish(packet)
+        data, server = static.recvfrom(65536)
+        assert json.loads(data)["type"] == "full"
+
+        packet = dict(packet, current_text="changed")
+        sender.publish(packet)
+        assert json.loads(static.recv(65536))["type"] == "delta"
+
+        # Sent back to where the stream comes from, like CVReceiver.cs does
+        static.sendto(b"keyframe", server)
+        stranger.sendto(b"hello", server)
+        time.sleep(0.1)
+        sender.publish(dict(packet, current_text="again"))
+        assert json.loads(static.recv(65536))["type"] == "full"
+        assert len(sender.subscribers) == 1  # Hellos are ignored without a subscribe port
+    finally:
+        sender.stop()
+
+
+def test_subscribers_are_capped_and_keyed_by_source_address():
+    port = free_port()
+    sender = FanoutSender(CLASSES, port=port, max_subscribers=2).start()
+    assert sender.bind_ip == "127.0.0.1"  # Local only unless asked otherwise
+    a, b, c = receiver(), receiver(), receiver()
+    try:
+        for extra in (6000, 6001, 6002):  # A "port" no longer redirects the stream elsewhere
+            a.sendto(json.dumps({"type": "hello", "port": extra}).encode(), ("127.0.0.1", port))
+        b.sendto(b"hello", ("127.0.0.1", port))
+        assert wait_for(lambda: len(sender.subscribers) == 2)
+        assert set(sender.subscribers) == {a.getsockname(), b.getsockname()}
+
+        c.sendto(b"hello", ("127.0.0.1", port))
+        time.sleep(0.1)
+        assert c.getsockname() not in sender.subscribers
+        b.sendto(b"bye", ("127.0.0.1", port))
+        assert wait_for(lambda: b.getsockname() not in sender.subscribers)
+        c.sendto(b"hello", ("127.0.0.1", port))
+        assert wait_for(lambda: c.getsockname() in sender.subscribers)
+    finally:
+        sender.stop()
@@ -0,0 +1,53 @@
+import sys
+import os
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'UnifiedServer'))
+
+from src.filters import KalmanFilter, OneEuroFilter, PacketSmoother
+
+
+@pytest.mark.parametrize("make", [lambda: OneEuroFilter(min_cutoff=1.0, beta=0.1),
+                                  lambda: KalmanFilter(process_noise=1e3, measurement_noise=1.0)])
+def test_filters_smooth_noise_and_predict_motion(make):
+    rng = np.random.default_rng(0)
+    t = np.arange(300) / 30
+
+    still = make()
+    noisy = 10 + rng.normal(0, 1.0, (300, 3))
+    out = np.array([still.update(x, ti).copy() for x, ti in zip(noisy, t)])
+    assert np.std(out[100:] - 10) < 0.7 * np.std(noisy[100:] - 10)
+
+    moving = make()
+    for ti in t:
+        moving.update(np.array([20.0 * ti, -5.0 * ti]), ti)  # Constant velocity, no noise
+    ahead = moving.predict(0.1)
+    assert np.allclose(ahead, [20.0 * (t[-1] + 0.1), -5.0 * (t[-1] + 0.1)], atol=1.5)  # One Euro runs a little ahead: its speed is taken against the filtered value
+
+
+def test_masked_joints_keep_state_and_restart():
+    f = OneEuroFilter(min_cutoff=1.0, beta=0.0)
+    mask = np.array([True, False])
+    f.update(np.array([0.0, 0.0]), 0.0)
+    out = f.update(np.array([10.0, 99.0]), 0.1, mask)
+    assert 0 < out[0] < 10 and out[1] == 0.0  # Joint 1 missing: untouched
+    out = f.update(np.array([10.0, 50.0]), 0.2)
+    assert out[1] == 50.0  # Back: starts again from the measurement
+
+
+def test_packet_smoother_keeps_packet_format():
+    smoother = PacketSmoother("kalman", {"body_pose": {"process_noise": 1e4, "measurement_noise": 9.0}})
+    joints = [{"id": 0, "x": 100, "y": 200, "conf": 0.9}, None]
+    for i in range(5):
+        packet = {"face_found": True, "head_pose": {"pitch": 1.0, "yaw": 2.0, "roll": 3.0},
+                  "body_pose": [dict(j) if j else None for j in joints]}
+        smoother.smooth_packet(packet, i / 30, lead=0.5)
+    assert packet["body_pose"][1] is None
+    assert packet["body_pose"][0] == {"id": 0, "x": 100, "y": 200, "conf": 0.9}  # Still: prediction stays put
+    assert packet["head_pose"] == pytest.approx({"pitch": 1.0, "yaw": 2.0, "roll": 3.0})
+
+    smoother.smooth_packet({"face_found": False, "head_pose": {}, "body_pose": []}, 1.0)
+    assert smoother.head.x is None and smoother.body.x is None
+    assert PacketSmoother("none").smooth_hands(["Left"], np.zeros((1, 21, 3)), 0.0).shape == (1, 21, 3)
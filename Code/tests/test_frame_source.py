@@ -0,0 +1,87 @@
+import sys
+import os
+import time
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'UnifiedServer'))
+
+np = pytest.importorskip("numpy")
+cv2 = pytest.importorskip("cv2")
+
+from src.frame_source import ArraySource, ImageDirectorySource, VideoFileSource, open_source, synthetic_frames
+
+
+def read_all(source, limit=100):
+    frames = []
+    while source.isOpened() and len(frames) < limit:
+        success, frame = source.read()
+        if not success:
+            break
+        frames.append(frame)
+    return frames
+
+
+def test_array_source_plays_frames_once():
+    frames = synthetic_frames(5, width=32, height=24)
+    source = ArraySource(frames)
+    played = read_all(source)
+    assert len(played) == 5
+    assert all(np.array_equal(a, b) for a, b in zip(played, frames))
+    assert not source.isOpened()
+    assert source.read() == (False, None)
+
+
+def test_array_source_loops():
+    source = ArraySource(synthetic_frames(3, width=8, height=8), loop=True)
+    assert len(read_all(source, limit=7)) == 7
+
+
+def test_realtime_mode_paces_frames():
+    source = ArraySource(synthetic_frames(4, width=8, height=8), fps=50, realtime=True)
+    start = time.perf_counter()
+    read_all(source)
+    # Frames are due at 0, 20, 40, 60 ms
+    assert time.perf_counter() - start >= 0.055
+    assert source.live
+
+
+def test_image_directory_source(tmp_path):
+    frames = synthetic_frames(3, width=16, height=16)
+    for i, frame in enumerate(frames):
+        cv2.imwrite(str(tmp_path / f"{i:03d}.png"), frame)
+    (tmp_path / "notes.txt").write_text("ignored")
+
+    source = open_source(str(tmp_path))
+    assert isinstance(source, ImageDirectorySource)
+    played = read_all(source)
+    assert len(played) == 3
+    assert np.array_equal(played[0], frames[0])
+
+
+def test_video_file_source_reads_to_end_of_stream(tmp_path):
+    path = str(tmp_path / "clip.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 25, (32, 24))
+    for i in range(5):
+        writer.write(np.full((24, 32, 3), i * 40, np.uint8))
+    writer.release()
+
+    source = open_source(path)
+    assert isinstance(source, VideoFileSource)
+    assert source.fps == 25 and not source.live
+    played = read_all(source)
+    assert len(played) == 5
+    assert [int(round(frame.mean())) for frame in played] == pytest.approx([0, 40, 80, 120, 160], abs=3)  # MJPG is lossy
+    assert source.read() == (False, None)
+    assert not source.isOpened()
+    source.release()
+
+    looping = VideoFileSource(path, loop=True)
+    assert len(read_all(looping, limit=8)) == 8
+    looping.release()
+
+
+def test_synthetic_spec():
+    source = open_source("synthetic:4")
+    assert not source.live
+    assert len(read_all(source)) == 4
@@ -0,0 +1,64 @@
+import sys
+import os
+import math
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'UnifiedServer'))
+
+from src.gesture_tracker import GestureTracker, HandTrack
+
+
+def hand(x, y, scale=0.1, reach=2.0):
+    points = np.zeros((21, 3), np.float32)
+    points[:, :2] = x, y
+    points[9, :2] = x, y - scale
+    points[8, :2] = x, y - scale * reach
+    return points
+
+
+def run(tracker, frames, key="Right"):
+    gesture = None
+    for t, points in enumerate(frames):
+        gesture = tracker.update([key], points[None], t / 30)[0]
+    return gesture
+
+
+def test_ring_buffer_stats_match_recomputation():
+    rng = np.random.default_rng(0)
+    track = HandTrack(size=15)
+    samples = rng.uniform(0, 1, (60, 4)).astype(np.float32)
+    for n, sample in enumerate(samples, 1):
+        track.push(sample, n / 30)
+        window = samples[max(0, n - 15):n]
+        assert np.array_equal(track.window(), window)
+        assert math.isclose(track.x_range, np.ptp(window[:, 0]), abs_tol=1e-6)
+        assert math.isclose(track.y_range, np.ptp(window[:, 1]), abs_tol=1e-6)
+        assert math.isclose(track.path, np.linalg.norm(np.diff(window[:, :2], axis=0), axis=1).sum(), abs_tol=1e-4)
+    vx, vy = track.velocity()
+    assert math.isclose(vx, (samples[-1, 0] - samples[-15, 0]) / (14 / 30), rel_tol=1e-4)
+
+
+def test_motion_gestures():
+    t = np.arange(30)
+    assert run(GestureTracker(), [hand(0.5 + 0.15 * math.sin(i / 2), 0.5) for i in t]) == "wave_horizontal"
+    assert run(GestureTracker(), [hand(0.5, 0.5 + 0.15 * math.sin(i / 2)) for i in t]) == "wave_vertical"
+    assert run(GestureTracker(), [hand(0.2 + 0.03 * i, 0.5) for i in t]) == "swipe_right"
+    assert run(GestureTracker(), [hand(0.5, 0.8 - 0.03 * i) for i in t]) == "swipe_up"
+    assert run(GestureTracker(), [hand(0.5 + 0.1 * math.cos(i / 2), 0.5 + 0.1 * math.sin(i / 2)) for i in t]) == "circle"
+    assert run(GestureTracker(), [hand(0.5, 0.5, scale=0.1 + 0.005 * i) for i in t]) == "push"
+    assert run(GestureTracker(), [hand(0.5, 0.5, reach=2.0 if i % 4 < 2 else 1.2) for i in t]) == "beckon"
+    assert run(GestureTracker(), [hand(0.5, 0.5) for i in t]) == "none"
+
+
+def test_hands_keep_separate_histories():
+    tracker = GestureTracker()
+    for i in range(30):
+        # Two still hands far apart: one shared history would look like a wave
+        gestures = tracker.update(["Left", "Right"], np.stack([hand(0.2, 0.5), hand(0.8, 0.5)]), i / 30)
+    assert gestures == ["none", "none"]
+    assert tracker.tracks["Left"].x_range == 0
+
+    for i in range(4):  # The left hand leaves; its track is dropped after max_missing frames
+        tracker.update(["Right"], hand(0.8, 0.5)[None], 1 + i / 30)
+    assert list(tracker.tracks) == ["Right"]
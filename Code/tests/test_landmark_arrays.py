@@ -0,0 +1,51 @@
+import sys
+import os
+import math
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'UnifiedServer'))
+
+from src.landmark_arrays import FrameLandmarks, bounding_boxes, fingers_extended, hands_array, pixel_points
+from src.two_handed_gestures import detect_two_handed_gestures
+
+
+def random_hands(rng, count):
+    # float32 values, like MediaPipe's
+    return [[SimpleNamespace(x=float(x), y=float(y), z=float(z)) for x, y, z in hand]
+            for hand in rng.normal((0.5, 0.5, 0.0), 0.1, (count, 21, 3)).astype(np.float32)]
+
+
+def test_helpers_match_attribute_math():
+    rng = np.random.default_rng(0)
+    hands = random_hands(rng, 200)
+    points = hands_array(hands)
+    assert points.shape == (200, 21, 3) and points.dtype == np.float32 and points.flags.c_contiguous
+
+    def dist(p1, p2):
+        return math.sqrt((p1.x - p2.x)**2 + (p1.y - p2.y)**2)
+
+    expected = [[dist(hand[tip], hand[0]) > dist(hand[pip], hand[0]) for tip, pip in
+                 ((4, 2), (8, 6), (12, 10), (16, 14), (20, 18))] for hand in hands]
+    assert fingers_extended(points).tolist() == expected
+    assert fingers_extended(points[3]).tolist() == expected[3]  # One hand: (21, 3)
+
+    assert np.array_equal(bounding_boxes(points)[7], [min(lm.x for lm in hands[7]), min(lm.y for lm in hands[7]),
+                                                      max(lm.x for lm in hands[7]), max(lm.y for lm in hands[7])])
+    assert pixel_points(points[5], 1280, 720).tolist() == [[int(lm.x * 1280), int(lm.y * 720)] for lm in hands[5]]
+
+
+def test_frame_conversion_and_two_handed_gestures():
+    empty = FrameLandmarks.from_results(None, SimpleNamespace(hand_landmarks=[]))
+    assert empty.face is None and empty.hands.shape == (0, 21, 3)
+
+    open_hand = np.zeros((21, 3), np.float32)
+    open_hand[:, 1] = 0.9  # Wrist at the bottom
+    open_hand[[2, 6, 10, 14, 18], 1] = 0.6
+    open_hand[[4, 8, 12, 16, 20], 1] = 0.3  # Fingertips above the PIP joints
+    hands = np.stack([open_hand, open_hand])
+    assert detect_two_handed_gestures(hands) == "thank_you"
+    assert detect_two_handed_gestures(hands[:1]) is None
+    hands[1, :, 1] = 0.9 - hands[1, :, 1] + 0.9  # Mirrored: fingers point down
+    assert detect_two_handed_gestures(hands) is None
@@ -0,0 +1,43 @@
+import sys
+import os
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'UnifiedServer'))
+
+from src.landmark_classifier import GROUPS, LandmarkClassifier, landmark_features
+
+
+def test_features_are_wrist_relative_and_keep_hand_size():
+    points = [[200 + i, 300 - 2 * i] for i in range(21)]
+    features = landmark_features(points)
+    assert features.shape == (1, 42) and features.dtype == np.float32
+    assert features[0, :2].tolist() == [0.0, 0.0]
+    assert features[0, -2:] == pytest.approx([20 / 400, -40 / 400])
+    shifted = landmark_features([[x + 50, y - 30] for x, y in points])
+    assert np.array_equal(features, shifted)
+
+
+def test_numpy_forward_maps_groups_and_round_trips(tmp_path):
+    rng = np.random.default_rng(0)
+    model = LandmarkClassifier([rng.normal(size=(42, 16)), rng.normal(size=(16, 3))],
+                               [rng.normal(size=16), rng.normal(size=3)], classes=[0, 2, 7])
+    features = rng.normal(size=(5, 42))
+    probs = model.predict_proba(features)
+    assert probs.shape == (5, GROUPS)
+    assert np.allclose(probs.sum(1), 1.0)
+    assert np.all(probs[:, [1, 3, 4, 5, 6]] == 0)
+
+    path = str(tmp_path / "mlp.p")
+    model.save(path)
+    assert np.array_equal(LandmarkClassifier.load(path).predict_proba(features), probs)
+
+
+def test_matches_sklearn_mlp():
+    neural_network = pytest.importorskip("sklearn.neural_network")
+    rng = np.random.default_rng(0)
+    features = rng.normal(size=(200, 42)).astype(np.float32)
+    labels = np.argmax(features[:, :GROUPS], axis=1)
+    mlp = neural_network.MLPClassifier(hidden_layer_sizes=(32,), max_iter=50, random_state=0).fit(features, labels)
+    assert np.allclose(LandmarkClassifier.from_sklearn(mlp).predict_proba(features), mlp.predict_proba(features), atol=1e-5)
@@ -0,0 +1,164 @@
+import sys
+import os
+import random
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'UnifiedServer'))
+
+from src.pipeline import Pipeline, Stage
+
+
+class ListCapture:
+    """Minimal cv2.VideoCapture stand-in that plays back a list of frames once."""
+
+    def __init__(self, frames):
+        self.frames = list(frames)
+
+    def isOpened(self):
+        return bool(self.frames)
+
+    def read(self):
+        return True, self.frames.pop(0)
+
+
+def run_to_completion(pipeline, timeout=5.0):
+    pipeline.start()
+    deadline = time.time() + timeout
+    while not pipeline.finished() and time.time() < deadline:
+        time.sleep(0.01)
+    pipeline.stop()
+
+
+def test_frames_are_aggregated_in_order_with_all_stage_results():
+    emitted = []
+
+    def jitter(task):
+        time.sleep(random.uniform(0, 0.005))
+        return task.image * 10
+
+    stages = [
+        Stage("double", lambda task: task.image * 2, workers=2, queue_size=32),
+        Stage("jitter", jitter, workers=3, queue_size=32),
+    ]
+    pipeline = Pipeline(
+        ListCapture(range(20)), stages,
+        aggregate=lambda task: (task.results["double"], task.results["jitter"]),
+        emit=lambda task, packet: emitted.append((task.frame_id, packet)),
+        queue_size=32,
+    )
+    run_to_completion(pipeline)
+
+    assert [frame_id for frame_id, _ in emitted] == list(range(20))
+    assert all(packet == (i * 2, i * 10) for i, (_, packet) in enumerate(emitted))
+    stats = pipeline.stats()
+    assert stats["captured"] == stats["emitted"] == 20
+
+
+def test_slow_stage_drops_oldest_frames_and_pipeline_still_finishes():
+    emitted = []
+    stages = [Stage("slow", lambda task: time.sleep(0.02), workers=1, queue_size=1)]
+    pipeline = Pipeline(
+        ListCapture(range(50)), stages,
+        aggregate=lambda task: task.frame_id,
+        emit=lambda task, packet: emitted.append(packet),
+        queue_size=1,
+    )
+    run_to_completion(pipeline)
+
+    assert pipeline.finished()
+    assert emitted == sorted(emitted)
+    assert emitted[-1] == 49
+    assert pipeline.stats()["dropped"]["slow"] > 0
+
+
+def test_slow_aggregation_loses_no_frames_without_drop_frames():
+    from src.scheduler import Schedule
+
+    emitted = []
+
+    def aggregate(task):
+        time.sleep(0.005)
+        return task.frame_id
+
+    # Skipped frames go straight to aggregation, past the stage queues
+    stages = [Stage("fast", lambda task: None, queue_size=1),
+              Stage("scheduled", lambda task: None, queue_size=1, schedule=Schedule(every=10))]
+    pipeline = Pipeline(
+        ListCapture(range(40)), stages, aggregate,
+        emit=lambda task, packet: emitted.append(packet),
+        queue_size=1, drop_frames=False,
+    )
+    run_to_completion(pipeline)
+
+    assert emitted == list(range(40))
+    assert not any(pipeline.stats()["dropped"].values())
+
+
+def test_failing_stage_still_releases_frame():
+    emitted = []
+
+    def broken(task):
+        raise RuntimeError("model crashed")
+
+    pipeline = Pipeline(
+        ListCapture(range(3)), [Stage("broken", broken, queue_size=8)],
+        aggregate=lambda task: task.results["broken"],
+        emit=lambda task, packet: emitted.append(packet),
+        prepare=lambda task: None,
+        queue_size=8,
+    )
+    run_to_completion(pipeline)
+    assert emitted == [None, None, None]
+
+
+def test_scheduled_stage_skips_frames_and_carries_results():
+    from src.scheduler import Schedule
+
+    calls = []
+    emitted = []
+
+    def detector(task):
+        calls.append(task.frame_id)
+        return task.frame_id
+
+    stages = [Stage("detector", detector, queue_size=32, schedule=Schedule(every=4))]
+    pipeline = Pipeline(
+        ListCapture(range(12)), stages,
+        aggregate=lambda task: (task.results["detector"], task.result_age.get("detector")),
+        emit=lambda task, packet: emitted.append(packet),
+        queue_size=32, drop_frames=False,
+    )
+    run_to_completion(pipeline)
+
+    assert calls == [0, 4, 8]
+    assert len(emitted) == 12
+    assert emitted[0] == (0, 0.0)
+    assert all(result in (None, 0, 4, 8) for result, _ in emitted)
+    assert emitted[-1][0] == 8
+    assert pipeline.stats()["scheduled"]["detector"]["skipped"] == 9
+
+
+def test_stage_after_another_sees_its_result():
+    seen = []
+
+    def hands(task):
+        time.sleep(random.uniform(0, 0.003))
+        return task.image % 2
+
+    def detector(task):
+        seen.append(task.results["hands"])
+        return None if task.results["hands"] else task.image
+
+    stages = [Stage("hands", hands, workers=2, queue_size=32),
+              Stage("detector", detector, queue_size=32, after=("hands",))]
+    emitted = []
+    pipeline = Pipeline(
+        ListCapture(range(10)), stages,
+        aggregate=lambda task: task.results["detector"],
+        emit=lambda task, packet: emitted.append(packet),
+        queue_size=32, drop_frames=False,
+    )
+    run_to_completion(pipeline)
+
+    assert sorted(seen) == [0] * 5 + [1] * 5
+    assert emitted == [0, None, 2, None, 4, None, 6, None, 8, None]
@@ -0,0 +1,40 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'UnifiedServer'))
+
+from src.utils.profiling import LatencyRecorder, compare_reports, percentile, summarize
+
+
+def test_percentile_interpolates():
+    values = [1, 2, 3, 4, 5]
+    assert percentile(values, 0) == 1
+    assert percentile(values, 50) == 3
+    assert percentile(values, 100) == 5
+    assert percentile([10, 20], 50) == 15
+    assert percentile([], 95) == 0.0
+
+
+def test_recorder_times_wrapped_calls():
+    recorder = LatencyRecorder()
+    double = recorder.timed("double", lambda x: x * 2)
+    assert [double(i) for i in range(4)] == [0, 2, 4, 6]
+    stats = recorder.summary()["double"]
+    assert stats["count"] == 4
+    assert stats["p99"] >= stats["p50"] >= 0
+
+
+def test_compare_reports_flags_slower_stage_and_lower_fps():
+    baseline = {"fps": 30.0, "stages": {"detr_forward": summarize([10.0] * 10),
+                                        "json": summarize([0.1] * 10)}}
+    report = {"fps": 29.0, "stages": {"detr_forward": summarize([12.0] * 10),
+                                      "json": summarize([0.105] * 10),
+                                      "new_stage": summarize([5.0])}}
+    regressions = compare_reports(report, baseline, threshold=0.15)
+    assert len(regressions) == 1 and regressions[0].startswith("detr_forward")
+
+    report["fps"] = 20.0
+    assert any(r.startswith("fps") for r in compare_reports(report, baseline, threshold=0.15))
+
+    del report["stages"]["json"]
+    assert any(r.startswith("json: in the baseline") for r in compare_reports(report, baseline, threshold=0.15))
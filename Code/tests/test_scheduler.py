@@ -0,0 +1,72 @@
+import sys
+import os
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'UnifiedServer'))
+
+from src.pipeline import FrameTask
+from src.scheduler import HandMotion, Schedule, extrapolate_body_pose
+
+
+def task(frame_id, image=None):
+    if image is None:
+        image = np.zeros((48, 64, 3), dtype=np.uint8)
+    return FrameTask(frame_id, frame_id / 30.0, image)
+
+
+def hands(*points):
+    return [[SimpleNamespace(x=x, y=y) for _ in range(21)] for x, y in points]
+
+
+def test_fixed_cadence_and_carry_over():
+    schedule = Schedule(every=3)
+    ran = [schedule.should_run(task(i)) for i in range(7)]
+    assert ran == [True, False, False, True, False, False, True]
+
+    assert schedule.carry(task(1)) == (None, None)
+    schedule.record(task(0), "result-0")
+    result, age = schedule.carry(task(2))
+    assert result == "result-0"
+    assert abs(age - 2 / 30.0 * 1000) < 1e-6
+    # A late, older result never replaces a newer one
+    schedule.record(task(3), "result-3")
+    schedule.record(task(2), "result-2")
+    assert schedule.carry(task(4))[0] == "result-3"
+    assert schedule.stats()["runs"] == 3
+
+
+def test_frame_difference_triggers_an_early_run():
+    schedule = Schedule(every=100, diff_threshold=10.0)
+    assert schedule.should_run(task(0))
+    assert not schedule.should_run(task(1))
+    assert schedule.should_run(task(2, np.full((48, 64, 3), 200, dtype=np.uint8)))
+    assert not schedule.should_run(task(3, np.full((48, 64, 3), 205, dtype=np.uint8)))
+
+
+def test_hand_motion_triggers_an_early_run():
+    motion = HandMotion()
+    schedule = Schedule(every=100, hand_motion=motion, hand_threshold=0.05)
+    assert schedule.should_run(task(0))
+    motion.update(hands((0.5, 0.5)))   # hand appeared
+    assert schedule.should_run(task(1))
+    motion.update(hands((0.51, 0.5)))  # barely moved
+    assert not schedule.should_run(task(2))
+    motion.update(hands((0.7, 0.5)))
+    assert schedule.should_run(task(3))
+    motion.update(None)                # hand left
+    assert schedule.should_run(task(4))
+    motion.update(None)
+    assert not schedule.should_run(task(5))
+
+
+def test_body_pose_is_extrapolated_between_runs():
+    schedule = Schedule(every=2, extrapolate=extrapolate_body_pose)
+    joint = lambda x: [{"id": 0, "x": x, "y": 10, "conf": 0.9}, None]
+    schedule.record(task(0), joint(100))
+    schedule.record(task(2), joint(110))
+    result, _ = schedule.carry(task(3))
+    assert result[0]["x"] == 115 and result[0]["y"] == 10 and result[1] is None
+    # Never further than one run interval ahead
+    assert schedule.carry(task(9))[0][0]["x"] == 120
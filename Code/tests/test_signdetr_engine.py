@@ -0,0 +1,122 @@
+import sys
+import os
+import threading
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("torchvision")
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'UnifiedServer'))
+
+from src.signdetr_model import DETR
+from src.signdetr_engine import SignDETREngine, hand_rois, merge_roi_outputs, preprocess
+
+
+@pytest.fixture(scope="module")
+def model():
+    torch.manual_seed(0)
+    return DETR(num_classes=3, pretrained_backbone=False).eval()
+
+
+def frames(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return [rng.integers(0, 256, (480, 640, 3), dtype=np.uint8) for _ in range(count)]
+
+
+def eager(model, images):
+    A = pytest.importorskip("albumentations")
+    from albumentations.pytorch import ToTensorV2
+    transform = A.Compose([
+        A.Resize(224, 224),
+        A.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225]),
+        ToTensorV2()
+    ])
+    batch = torch.stack([transform(image=image)['image'] for image in images])
+    with torch.no_grad():
+        return batch, model(batch)
+
+
+@pytest.mark.parametrize("backend", ["eager", "torchscript"])
+def test_engine_matches_eager_model(model, backend, tmp_path):
+    images = frames(3)
+    reference_input, reference = eager(model, images)
+    engine = SignDETREngine(model, backend=backend, max_batch=2)
+
+    preprocess(images[0], engine.buffer[0])
+    assert torch.allclose(engine.buffer[0], reference_input[0], atol=1e-5)
+
+    outputs = engine.infer_batch(images)  # 3 frames with max_batch=2: two forwards
+    assert len(outputs) == 3
+    for i, output in enumerate(outputs):
+        assert output["pred_logits"].shape == (1, model.num_queries, 4)
+        assert torch.allclose(output["pred_logits"], reference["pred_logits"][i:i + 1], atol=1e-4)
+        assert torch.allclose(output["pred_boxes"], reference["pred_boxes"][i:i + 1], atol=1e-4)
+
+
+def test_torchscript_export_is_cached_next_to_checkpoint(model, tmp_path):
+    checkpoint = tmp_path / "signdetr.pt"
+    torch.save(model.state_dict(), checkpoint)
+    engine = SignDETREngine(model, backend="torchscript", model_path=str(checkpoint))
+    assert engine.backend == "torchscript"
+    assert (tmp_path / "signdetr.torchscript.pt").exists()
+
+    reloaded = SignDETREngine(model, backend="torchscript", model_path=str(checkpoint))
+    image = frames(1, seed=1)[0]
+    assert torch.allclose(reloaded.infer(image)["pred_logits"], engine.infer(image)["pred_logits"], atol=1e-5)
+
+
+def test_concurrent_requests_are_micro_batched(model):
+    engine = SignDETREngine(model, max_batch=4, batch_wait_ms=200)
+    sizes = []
+    infer_batch = engine.infer_batch
+    engine.infer_batch = lambda images: sizes.append(len(images)) or infer_batch(images)
+
+    images = frames(3, seed=2)
+    results = [None] * 3
+
+    def camera(i):
+        results[i] = engine.infer(images[i])
+
+    threads = [threading.Thread(target=camera, args=(i,)) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.close()
+
+    assert sizes == [3]
+    single = SignDETREngine(model).infer(images[1])
+    assert torch.allclose(results[1]["pred_logits"], single["pred_logits"], atol=1e-4)
+
+
+def test_hand_rois_are_padded_squares_inside_the_frame():
+    from types import SimpleNamespace as Landmark
+
+    hand = [Landmark(x=0.45, y=0.4), Landmark(x=0.55, y=0.6)]  # 64x96 px in a 640x480 frame
+    corner = [Landmark(x=0.99, y=0.01), Landmark(x=1.0, y=0.02)]
+    (x1, y1, x2, y2), edge = hand_rois([hand, corner], 640, 480, padding=0.25, min_size=64)
+    assert x2 - x1 == y2 - y1 == 144
+    assert (x1 + x2) / 2 == pytest.approx(320, abs=1) and (y1 + y2) / 2 == pytest.approx(240, abs=1)
+    assert edge == (576, 0, 640, 64)
+
+
+def test_roi_boxes_map_back_to_frame_coordinates(model):
+    crop_output = {"pred_logits": torch.zeros(1, 2, 4),
+                   "pred_boxes": torch.tensor([[[0.5, 0.5, 1.0, 1.0], [0.25, 0.25, 0.5, 0.5]]])}
+    rois = [(100, 50, 200, 150), (300, 200, 400, 300)]
+    merged = merge_roi_outputs([crop_output, crop_output], rois, 640, 480)
+    assert merged["pred_logits"].shape == (1, 4, 4)
+    boxes = merged["pred_boxes"][0] * torch.tensor([640, 480, 640, 480])
+    assert torch.allclose(boxes[0], torch.tensor([150.0, 100.0, 100.0, 100.0]))
+    assert torch.allclose(boxes[1], torch.tensor([125.0, 75.0, 50.0, 50.0]))
+    assert torch.allclose(boxes[2], torch.tensor([350.0, 250.0, 100.0, 100.0]))
+
+    engine = SignDETREngine(model)
+    image = frames(1)[0]
+    assert engine.infer_rois(image, []) is None
+    outputs = engine.infer_rois(image, rois)
+    assert outputs["pred_logits"].shape[1] == 2 * model.query_pos.shape[0]
+    crop = engine.infer_batch([image[50:150, 100:200]])[0]
+    assert torch.allclose(outputs["pred_logits"][:, :crop["pred_logits"].shape[1]], crop["pred_logits"], atol=1e-4)
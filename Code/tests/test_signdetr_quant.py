@@ -0,0 +1,79 @@
+import sys
+import os
+
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("torchvision")
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'UnifiedServer'))
+
+from src.frame_source import synthetic_frames
+from src.signdetr_model import DETR
+from src.signdetr_engine import SignDETREngine
+from src.signdetr_quant import accuracy_delta
+
+
+@pytest.fixture(scope="module")
+def model():
+    torch.manual_seed(0)
+    return DETR(num_classes=3, pretrained_backbone=False).eval()
+
+
+@pytest.fixture(scope="module")
+def frames():
+    return list(synthetic_frames(6, seed=3))
+
+
+@pytest.mark.parametrize("mode, tolerance", [("dynamic", 0.2), ("fp16", 1e-2), ("int8", 0.5)])
+def test_quantised_outputs_stay_close_to_float(model, frames, mode, tolerance):
+    reference = SignDETREngine(model).infer_batch(frames)
+    engine = SignDETREngine(model, backend=mode, calibration=frames[:4])
+    assert engine.backend == mode
+    outputs = engine.infer_batch(frames)
+
+    report = accuracy_delta(reference, outputs)
+    assert report["frames"] == len(frames)
+    assert report["max_logit_diff"] < tolerance
+    assert report["conf_mae"] < 0.05
+    # The float model is not modified by quantisation
+    assert torch.equal(SignDETREngine(model).infer(frames[0])["pred_logits"], reference[0]["pred_logits"])
+
+
+def test_int8_artifact_is_cached_next_to_checkpoint(model, frames, tmp_path):
+    checkpoint = tmp_path / "signdetr.pt"
+    torch.save(model.state_dict(), checkpoint)
+    calls = []
+
+    def calibration():
+        calls.append(1)
+        return frames[:2]
+
+    first = SignDETREngine(model, backend="int8", model_path=str(checkpoint), calibration=calibration)
+    assert (tmp_path / "signdetr.int8.pt").exists()
+    second = SignDETREngine(model, backend="int8", model_path=str(checkpoint), calibration=calibration)
+    assert calls == [1]  # The cached artifact is reused without recalibrating
+    assert torch.allclose(first.infer(frames[0])["pred_logits"], second.infer(frames[0])["pred_logits"])
+
+
+def test_identical_outputs_report_full_agreement(model, frames):
+    reference = SignDETREngine(model).infer_batch(frames[:2])
+    report = accuracy_delta(reference, reference, threshold=0.0)
+    assert report["decision_agreement"] == report["label_agreement"] == 1.0
+    assert report["box_iou"] == pytest.approx(1.0)
+    assert report["max_logit_diff"] == 0.0
+
+
+def test_quantized_engine_is_only_set_at_backend_selection(model, frames):
+    from src.signdetr_quant import QuantizedDETR
+
+    before = torch.backends.quantized.engine
+    other = next(e for e in ("qnnpack", "fbgemm", "x86") if e in torch.backends.quantized.supported_engines and e != before)
+    try:
+        QuantizedDETR(model, "int8", frames[:1])
+        assert torch.backends.quantized.engine == before  # Building the model has no global side effect
+        engine = SignDETREngine(model, backend="int8", calibration=frames[:1], quantized_engine=other)
+        assert engine.backend == "int8"
+        assert torch.backends.quantized.engine == other
+    finally:
+        torch.backends.quantized.engine = before
@@ -0,0 +1,36 @@
+import sys
+import os
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'UnifiedServer'))
+
+from src.skeleton_render import SkeletonCanvas, render_skeleton, skeleton_points
+
+
+def random_hands(count, seed=0):
+    rng = np.random.default_rng(seed)
+    for _ in range(count):
+        centre = rng.uniform(-0.1, 1.1, 2)
+        spread = rng.uniform(0.01, 0.5)
+        landmarks = centre + rng.normal(0, spread, (21, 2))
+        yield [SimpleNamespace(x=x, y=y) for x, y in landmarks], int(rng.integers(160, 1920)), int(rng.integers(120, 1080))
+
+
+def test_canvas_matches_reference_points_and_pixels():
+    canvas = SkeletonCanvas()
+    for hand, w, h in random_hands(300):
+        expected_pts = skeleton_points(hand, w, h)
+        pts = canvas.points(hand, w, h)
+        assert pts.tolist() == expected_pts
+        assert np.array_equal(canvas.render(pts), render_skeleton(expected_pts))
+
+
+def test_canvas_is_reused_and_reset():
+    canvas = SkeletonCanvas()
+    (first, w1, h1), (second, w2, h2) = random_hands(2, seed=1)
+    image = canvas.render(canvas.points(first, w1, h1))
+    again = canvas.render(canvas.points(second, w2, h2))
+    assert again is image
+    assert np.array_equal(again, render_skeleton(skeleton_points(second, w2, h2)))
@@ -0,0 +1,60 @@
+import sys
+import os
+import io
+import json
+import logging
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'UnifiedServer'))
+
+from src.telemetry import Sampler, get_logger, log_event, setup_logging, shutdown_logging
+
+
+def capture_logs(fn, **kwargs):
+    stream = io.StringIO()
+    setup_logging("DEBUG", stream=stream, **kwargs)
+    try:
+        fn(get_logger("test"))
+    finally:
+        shutdown_logging()
+    return stream.getvalue().splitlines()
+
+
+def test_rate_limited_key_is_emitted_once_per_interval():
+    def burst(logger):
+        for i in range(50):
+            log_event(logger, logging.INFO, "packet", key="packet", interval=60, frame=i)
+        log_event(logger, logging.INFO, "unkeyed")
+
+    lines = capture_logs(burst)
+    assert len(lines) == 2
+    assert "frame=0" in lines[0]
+    assert "unkeyed" in lines[1]
+
+
+def test_suppressed_count_is_reported_on_next_record():
+    def burst(logger):
+        for _ in range(5):
+            log_event(logger, logging.INFO, "tick", key="tick", interval=60)
+        log_event(logger, logging.INFO, "tick", key="tick", interval=0)
+
+    lines = capture_logs(burst)
+    assert lines[-1].endswith("(+4 suppressed)")
+
+
+def test_json_output_includes_fields():
+    lines = capture_logs(lambda logger: log_event(logger, logging.WARNING, "socket", port=5005),
+                         json_output=True)
+    entry = json.loads(lines[0])
+    assert entry["msg"] == "socket" and entry["port"] == 5005 and entry["level"] == "WARNING"
+
+
+def test_disabled_level_is_not_emitted():
+    lines = capture_logs(lambda logger: (logger.setLevel(logging.INFO),
+                                         log_event(logger, logging.DEBUG, "hidden")))
+    assert lines == []
+
+
+def test_sampler():
+    assert not any(Sampler(0).tick() for _ in range(10))
+    sampler = Sampler(3)
+    assert [sampler.tick() for _ in range(6)] == [False, False, True, False, False, True]
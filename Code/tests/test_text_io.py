@@ -0,0 +1,113 @@
+import sys
+import os
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'UnifiedServer'))
+
+from src.audio_cache import AudioCache
+from src.text_io import TextIOWorker
+
+
+class FakeEngine:
+    """Stands in for pyttsx3: save_to_file writes the text, runAndWait blocks until released."""
+
+    def __init__(self):
+        self.queued = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def save_to_file(self, text, path):
+        self.queued.append((text, path))
+
+    def runAndWait(self):
+        self.started.set()
+        self.release.wait(5)
+        for text, path in self.queued:
+            with open(path, "w") as f:
+                f.write(text)
+        self.queued = []
+
+
+def test_text_writes_are_coalesced_and_atomic(tmp_path):
+    engine = FakeEngine()
+    engine.release.clear()
+    worker = TextIOWorker(lambda: engine).start()
+    worker.speak("busy", str(tmp_path / "speech.wav"))  # Hold the worker while text piles up
+    assert engine.started.wait(5)
+    path = str(tmp_path / "output.txt")
+    for i in range(50):
+        worker.write_text(path, "A" * i)
+    assert not os.path.exists(path)
+
+    engine.release.set()
+    assert worker.flush(timeout=5)
+    with open(path) as f:
+        assert f.read() == "A" * 49
+    assert sorted(os.listdir(tmp_path)) == ["output.txt", "speech.wav"]  # No temp files left
+    worker.stop()
+
+
+def test_speak_returns_at_once_and_reports_completion(tmp_path):
+    engine = FakeEngine()
+    engine.release.clear()
+    worker = TextIOWorker(lambda: engine).start()
+    path = str(tmp_path / "speech.wav")
+    with open(path, "w") as f:
+        f.write("old")
+    done = []
+
+    worker.speak("first", path, lambda *args: done.append(args))
+    worker.speak("second", path, lambda *args: done.append(args))
+    worker.speak("third", path, lambda *args: done.append(args))
+    with open(path) as f:
+        assert f.read() == "old"  # The previous file stays readable while synthesising
+
+    engine.release.set()
+    assert worker.flush(timeout=5)
+    with open(path) as f:
+        assert f.read() == "third"
+    statuses = [(status, text) for status, _, text in done]
+    assert ("skipped", "second") in statuses and statuses[-1] == ("ready", "third")
+    assert worker.status() == {"speech": "idle", "speech_id": statuses.count(("ready", "first")) + 1}
+    worker.stop()
+
+
+def test_speak_without_engine_reports_error(tmp_path):
+    def broken():
+        raise RuntimeError("no audio device")
+
+    worker = TextIOWorker(broken).start()
+    done = []
+    worker.speak("hello", str(tmp_path / "speech.wav"), lambda *args: done.append(args[0]))
+    assert worker.flush(timeout=5)
+    assert done == ["error"] and worker.status()["speech"] == "error"
+    worker.stop()
+
+
+def test_stop_finishes_speech_but_drops_warm_up(tmp_path):
+    engine = FakeEngine()
+    engine.release.clear()
+    cache = AudioCache(str(tmp_path / "cache"))
+    worker = TextIOWorker(lambda: engine, cache=cache).start()
+    target = str(tmp_path / "speech.wav")
+    done = []
+
+    worker.warm_up([f"PHRASE {i}" for i in range(50)])
+    assert engine.started.wait(5)  # Stuck rendering the first phrase
+    worker.speak("HELLO", target, lambda status, path, text: done.append(status))
+    stopper = threading.Thread(target=worker.stop)
+    stopper.start()
+    for _ in range(500):  # Wait for stop() to get in before the engine moves on
+        if not worker.pending_warm:
+            break
+        time.sleep(0.01)
+    engine.release.set()
+    stopper.join(5)
+
+    assert not stopper.is_alive() and not worker.thread.is_alive()
+    assert done == ["ready"]
+    with open(target) as f:
+        assert f.read() == "HELLO"
+    assert len(cache.entries) == 2  # The phrase in progress and HELLO, none of the other 49
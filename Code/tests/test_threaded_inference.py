@@ -0,0 +1,106 @@
+import sys
+import os
+import threading
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'UnifiedServer'))
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("mediapipe")
+
+from src.threaded_inference import ThreadedInference
+from src.utils.queues import DropOldestQueue
+
+
+class FakeLandmarker:
+    """Stands in for a MediaPipe landmarker; records the timestamps it was called with."""
+
+    def __init__(self, gate=None):
+        self.timestamps = []
+        self.gate = gate
+
+    def detect_for_video(self, mp_image, timestamp_ms):
+        if self.gate is not None:
+            self.gate.wait()
+        self.timestamps.append(timestamp_ms)
+        return ("result", timestamp_ms)
+
+
+def make_frame():
+    return np.zeros((8, 8, 3), dtype=np.uint8)
+
+
+def test_drop_oldest_queue_evicts_oldest():
+    q = DropOldestQueue(2)
+    assert q.put(1) is None
+    assert q.put(2) is None
+    assert q.put(3) == 1
+    assert q.dropped == 1
+    assert q.get(timeout=0) == 2
+    assert q.get(timeout=0) == 3
+    assert q.get(timeout=0) is None
+
+
+def test_results_carry_frame_id_and_timestamp():
+    face, hand = FakeLandmarker(), FakeLandmarker()
+    inference = ThreadedInference(face, hand).start()
+    try:
+        frame_id = inference.submit(make_frame(), timestamp_ms=1000)
+        result = inference.get_results(frame_id, timeout=2.0)
+        assert result.frame_id == frame_id
+        assert result.timestamp_ms == 1000
+        assert result.face_results == ("result", 1000)
+        assert result.hand_results == ("result", 1000)
+        assert inference.get_results() is result
+    finally:
+        inference.stop()
+
+
+def test_timestamps_strictly_increase():
+    face, hand = FakeLandmarker(), FakeLandmarker()
+    inference = ThreadedInference(face, hand, queue_size=4).start()
+    try:
+        ids = [inference.submit(make_frame(), timestamp_ms=500) for _ in range(3)]
+        stamps = [inference.get_results(i, timeout=2.0).timestamp_ms for i in ids]
+        assert stamps == [500, 501, 502]
+    finally:
+        inference.stop()
+
+
+def test_dropped_frame_returns_none_without_waiting():
+    gate = threading.Event()
+    face, hand = FakeLandmarker(gate), FakeLandmarker()
+    inference = ThreadedInference(face, hand, queue_size=1).start()
+    try:
+        first = inference.submit(make_frame())
+        # Give the worker a moment to pick up the first frame and block on the gate
+        for _ in range(100):
+            if len(inference.frames) == 0:
+                break
+            threading.Event().wait(0.01)
+        second = inference.submit(make_frame())
+        third = inference.submit(make_frame())  # evicts the second frame
+        assert inference.get_results(second, timeout=5.0) is None
+        gate.set()
+        assert inference.get_results(first, timeout=2.0).frame_id == first
+        assert inference.get_results(third, timeout=2.0).frame_id == third
+    finally:
+        gate.set()
+        inference.stop()
+
+
+def test_parallel_mode_joins_results_per_frame():
+    face, hand = FakeLandmarker(), FakeLandmarker()
+    inference = ThreadedInference(face, hand, queue_size=4, parallel=True).start()
+    try:
+        ids = [inference.submit(make_frame(), timestamp_ms=100 + i) for i in range(3)]
+        for i, frame_id in enumerate(ids):
+            result = inference.get_results(frame_id, timeout=2.0)
+            assert result.face_results == ("result", 100 + i)
+            assert result.hand_results == ("result", 100 + i)
+            assert set(result.timings) == {"face_ms", "hand_ms", "total_ms"}
+        summary = inference.latency_summary()
+        assert summary["total_ms"]["max"] >= summary["total_ms"]["mean"] >= 0
+    finally:
+        inference.stop()
@@ -0,0 +1,84 @@
+import sys
+import os
+import json
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'UnifiedServer'))
+
+from src.wire_format import PacketEncoder, decode_binary, describe_schema, is_binary, sign_table
+
+CLASSES = ["hello", "iloveyou", "thankyou"]
+
+
+def sample_packet(with_body=True):
+    body = []
+    if with_body:
+        body = [{"id": i, "x": 10 * i, "y": 480 - i, "conf": 0.5 + i / 100} if i % 3 else None
+                for i in range(18)]
+    return {
+        "face_found": True,
+        "head_pose": {"pitch": 1.5, "yaw": -12.25, "roll": 3.0},
+        "expression": "happy",
+        "hand_found": True,
+        "gesture": "wave_horizontal",
+        "sign_asl": "iloveyou",
+        "sign_conf": 0.875,
+        "asl_char": "B",
+        "current_text": " HELLO WORLD",
+        "body_pose": body,
+        "result_age": {"signdetr": 66.7, "body_pose": 0.0},
+        "speech": "speaking",
+        "speech_id": 7,
+    }
+
+
+@pytest.mark.parametrize("with_body", [True, False])
+def test_binary_round_trip(with_body):
+    packet = sample_packet(with_body)
+    encoder = PacketEncoder("binary", CLASSES)
+    data = encoder.encode(packet, timestamp=1234.5)
+    assert is_binary(data)
+    assert len(data) < 1200
+
+    decoded = decode_binary(data, sign_table(CLASSES))
+    assert decoded.pop("type") == "full"
+    assert decoded.pop("seq") == 1
+    assert decoded.pop("timestamp") == 1234.5
+    assert decoded["head_pose"] == pytest.approx(packet["head_pose"])
+    assert decoded["sign_conf"] == pytest.approx(packet["sign_conf"])
+    assert decoded["result_age"] == pytest.approx(packet["result_age"])
+    for key in ("face_found", "hand_found", "expression", "gesture", "sign_asl", "asl_char", "current_text",
+                "speech", "speech_id"):
+        assert decoded[key] == packet[key]
+    assert len(decoded["body_pose"]) == len(packet["body_pose"])
+    for got, want in zip(decoded["body_pose"], packet["body_pose"]):
+        if want is None:
+            assert got is None
+        else:
+            assert (got["id"], got["x"], got["y"]) == (want["id"], want["x"], want["y"])
+            assert got["conf"] == pytest.approx(want["conf"])
+
+
+def test_binary_is_smaller_than_json():
+    packet = sample_packet()
+    binary = PacketEncoder("binary", CLASSES).encode(packet)
+    text = PacketEncoder("json", CLASSES).encode(packet)
+    assert len(binary) < len(text) / 3
+    assert json.loads(text) == packet
+
+
+def test_unknown_labels_and_sequence_numbers():
+    packet = sample_packet(False)
+    packet["gesture"] = "brand_new_gesture"
+    encoder = PacketEncoder("binary", CLASSES)
+    encoder.encode(packet)
+    decoded = decode_binary(encoder.encode(packet), sign_table(CLASSES))
+    assert decoded["seq"] == 2
+    assert decoded["gesture"] == "unknown"
+
+
+def test_schema_lists_sign_classes():
+    schema = describe_schema(CLASSES)
+    assert schema["enums"]["sign_asl"] == ["none"] + CLASSES
+    assert schema["enums"]["result_age"] == ["signdetr", "body_pose"]
@@ -132,8 +132,16 @@ public class AvatarController : MonoBehaviour
                         bodyAnimator.SetTrigger("Gun");
                         break;
                     case "wave_horizontal":
+                    case "swipe_left":  // A single horizontal sweep was reported as wave_horizontal before swipes existed
+                    case "swipe_right":
                         bodyAnimator.SetTrigger("Wave");
                         break;
+                    // Motion gestures: only fired if the Animator Controller defines the trigger
+                    case "circle": SetOptionalTrigger("Circle"); break;
+                    case "push": SetOptionalTrigger("Push"); break;
+                    case "beckon": SetOptionalTrigger("Beckon"); break;
+                    case "swipe_up": SetOptionalTrigger("SwipeUp"); break;
+                    case "swipe_down": SetOptionalTrigger("SwipeDown"); break;
                 }
             }
         }
@@ -151,6 +159,18 @@ public class AvatarController : MonoBehaviour
         }
     }
 
+    void SetOptionalTrigger(string name)
+    {
+        foreach (AnimatorControllerParameter parameter in bodyAnimator.parameters)
+        {
+            if (parameter.type == AnimatorControllerParameterType.Trigger && parameter.name == name)
+            {
+                bodyAnimator.SetTrigger(name);
+                return;
+            }
+        }
+    }
+
     void SetBlendShape(string name, float value)
     {
         int index = faceMesh.sharedMesh.GetBlendShapeIndex(name);
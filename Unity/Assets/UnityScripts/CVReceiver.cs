@@ -4,6 +4,8 @@ using System.Net.Sockets;
 using System.Text;
 using System.Threading;
 using System;
+using System.IO;
+using System.Collections.Concurrent;
 
 [Serializable]
 public class CVData
@@ -18,9 +20,29 @@ public class CVData
     public string asl_char;
     public string new_asl_char;
     public string current_text;
+    public string speech;  // "idle" / "speaking" / "error"
+    public int speech_id;  // Goes up by one each time a new speech.wav is in place
+    public ResultAge result_age;  // Keyframes / full packets only
     // public List<BodyPart> body_pose; // Requires defining BodyPart, leaving out for simplicity unless requested
 }
 
+// Delta-stream header fields (absent on plain JSON packets)
+[Serializable]
+public class PacketHeader
+{
+    public string type;
+    public uint seq;
+    public uint key_seq;
+}
+
+// Age in ms of the scheduled models' results in this packet (0 = fresh, >0 = carried over)
+[Serializable]
+public class ResultAge
+{
+    public float signdetr;
+    public float body_pose;
+}
+
 [Serializable]
 public class HeadPose
 {
@@ -34,14 +56,56 @@ public class CVReceiver : MonoBehaviour
     [Header("Network Settings")]
     public int port = 5005;
 
+    [Header("Binary Wire Format")]
+    // Must match the server's config.json classes (sign_asl enum ids, 0 = "none")
+    public string[] signClasses = { "hello", "iloveyou", "thankyou" };
+
+    [Header("Subscription")]
+    // Leave serverHost empty to rely on the server's default target (UDP_IP:UDP_PORT).
+    // Otherwise a hello is sent to serverHost:subscribePort every few seconds, see UnifiedServer/src/fanout.py
+    // (a server on another host must be started with --subscribe-ip 0.0.0.0)
+    public string serverHost = "";
+    public int subscribePort = 5007;
+    public string subscribeFormat = "json";
+    // Comma-separated packet fields, e.g. "head_pose,expression" (empty = all; JSON only)
+    public string subscribeFields = "";
+    // Max packets per second (0 = every frame)
+    public float subscribeRate = 0;
+    public float helloInterval = 2.0f;
+
     [Header("Debug")]
     public bool showDebugLog = true;
 
+    // Enum tables of the binary format, see UnifiedServer/src/wire_format.py
+    private static readonly string[] Expressions = { "neutral", "happy", "sad", "surprised", "angry", "blink", "tongue", "cute" };
+    private static readonly string[] Gestures = { "none", "hello", "i_love_you", "gun", "punch", "wave_horizontal", "wave_vertical", "thank_you",
+                                                  "circle", "push", "beckon", "swipe_left", "swipe_right", "swipe_up", "swipe_down" };
+    private static readonly string[] AslChars = {
+        "none", "", " ", "next", "Backspace", "Model Error", "Err",
+        "A", "B", "C", "D", "E", "F", "G", "H", "I", "J", "K", "L", "M",
+        "N", "O", "P", "Q", "R", "S", "T", "U", "V", "W", "X", "Y", "Z" };
+    private static readonly string[] SpeechStates = { "idle", "speaking", "error" };
+    private const byte BinaryVersion = 3;
+    private const byte TypeFull = 0;
+    private const byte TypeDelta = 1;
+    private static readonly string[] DeltaFields = {
+        "face_found", "hand_found", "head_pose", "expression", "gesture",
+        "asl_char", "sign_asl", "sign_conf", "current_text", "body_pose", "joints",
+        "speech", "speech_id" };
+
     // Private
     private UdpClient client;
     private Thread receiveThread;
     private bool isRunning = true;
-    private string lastJson = "";
+    // Every datagram is applied in order: deltas are only valid on top of the previous packet
+    private ConcurrentQueue<byte[]> packets = new ConcurrentQueue<byte[]>();
+    private IPEndPoint serverEndPoint;
+    private float nextHello = 0;
+    private uint lastSeq;
+    private uint keySeq;
+    private bool awaitingKeyframe = true;
+    [HideInInspector]
+    public int lostPackets = 0;
 
     // Public access for other scripts
     public CVData currentData;
@@ -75,10 +139,10 @@ public class CVReceiver : MonoBehaviour
             {
                 IPEndPoint anyIP = new IPEndPoint(IPAddress.Any, 0);
                 byte[] data = client.Receive(ref anyIP);
-                string text = Encoding.UTF8.GetString(data);
 
-                // Store string to be parsed on main thread
-                lastJson = text;
+                // Store payload to be parsed on main thread
+                serverEndPoint = anyIP;
+                packets.Enqueue(data);
                 hasNewData = true;
             }
             catch (Exception e)
@@ -91,20 +155,233 @@ public class CVReceiver : MonoBehaviour
 
     void Update()
     {
-        if (hasNewData && !string.IsNullOrEmpty(lastJson))
+        if (!string.IsNullOrEmpty(serverHost) && client != null && Time.realtimeSinceStartup >= nextHello)
         {
+            nextHello = Time.realtimeSinceStartup + helloInterval;
+            SendHello();
+        }
+
+        if (!hasNewData) return;
+        hasNewData = false;
+        byte[] data;
+        while (packets.TryDequeue(out data))
+        {
+            bool binary = data.Length >= 2 && data[0] == (byte)'C' && data[1] == (byte)'V';
             try
             {
-                currentData = JsonUtility.FromJson<CVData>(lastJson);
-                hasNewData = false;
-                if (showDebugLog)
-                {
-                    // Optional: Debug.Log($"Expr: {currentData.expression}, Sign: {currentData.sign_asl}");
-                }
+                if (binary) ApplyBinary(data);
+                else ApplyJson(Encoding.UTF8.GetString(data));
             }
             catch (Exception e)
             {
-                Debug.LogError("JSON Parse Error: " + e.Message);
+                Debug.LogError((binary ? "Binary" : "JSON") + " Parse Error: " + e.Message);
+            }
+        }
+    }
+
+    void ApplyJson(string json)
+    {
+        var header = JsonUtility.FromJson<PacketHeader>(json);
+        if (string.IsNullOrEmpty(header.type))
+        {
+            // Plain full packet (server not in delta mode)
+            currentData = JsonUtility.FromJson<CVData>(json);
+            if (showDebugLog)
+            {
+                // Optional: Debug.Log($"Expr: {currentData.expression}, Sign: {currentData.sign_asl}");
+            }
+            return;
+        }
+
+        bool keyframe = header.type == "full";
+        if (!AcceptSequence(header.seq, keyframe, header.key_seq)) return;
+        if (keyframe) currentData = JsonUtility.FromJson<CVData>(json);
+        else JsonUtility.FromJsonOverwrite(json, currentData); // Only the changed fields are present
+    }
+
+    void ApplyBinary(byte[] data)
+    {
+        using (var reader = new BinaryReader(new MemoryStream(data)))
+        {
+            reader.ReadBytes(2); // magic "CV"
+            byte version = reader.ReadByte();
+            if (version != BinaryVersion) throw new Exception("Unsupported packet version " + version);
+            byte type = reader.ReadByte();
+            uint seq = reader.ReadUInt32();
+            reader.ReadDouble(); // timestamp
+
+            if (type == TypeFull)
+            {
+                if (!AcceptSequence(seq, true, 0)) return;
+                currentData = DecodeBinary(reader);
+            }
+            else if (type == TypeDelta)
+            {
+                uint key = reader.ReadUInt32();
+                if (!AcceptSequence(seq, false, key)) return;
+                ApplyBinaryDelta(reader, currentData);
+            }
+        }
+    }
+
+    // Sequence tracking for delta streams: after a gap, deltas are dropped until the next keyframe
+    bool AcceptSequence(uint seq, bool keyframe, uint key)
+    {
+        // Old deltas are dropped; a keyframe is always taken (e.g. the server restarted and seq began at 1 again)
+        if (!keyframe && currentData != null && seq <= lastSeq) return false;
+        if (currentData != null && seq > lastSeq + 1)
+        {
+            lostPackets += (int)(seq - lastSeq - 1);
+            if (!awaitingKeyframe) RequestKeyframe();
+            awaitingKeyframe = true;
+        }
+        lastSeq = seq;
+
+        if (keyframe)
+        {
+            keySeq = seq;
+            awaitingKeyframe = false;
+            return true;
+        }
+        if (awaitingKeyframe || key != keySeq || currentData == null)
+        {
+            awaitingKeyframe = true;
+            return false;
+        }
+        return true;
+    }
+
+    // Keyframe requests go back to the socket the stream comes from (the server's subscribe port)
+    void RequestKeyframe()
+    {
+        if (serverEndPoint == null || client == null) return;
+        if (showDebugLog) Debug.Log("Packet loss detected, requesting keyframe");
+        Send("keyframe", serverEndPoint);
+    }
+
+    void SendHello()
+    {
+        var hello = new StringBuilder("{\"type\": \"hello\", \"format\": \"" + subscribeFormat + "\"");
+        hello.Append(", \"rate\": " + subscribeRate.ToString(System.Globalization.CultureInfo.InvariantCulture));
+        if (!string.IsNullOrEmpty(subscribeFields))
+        {
+            string[] fields = subscribeFields.Split(',');
+            for (int i = 0; i < fields.Length; i++) fields[i] = "\"" + fields[i].Trim() + "\"";
+            hello.Append(", \"fields\": [" + string.Join(", ", fields) + "]");
+        }
+        hello.Append("}");
+        try
+        {
+            Send(hello.ToString(), SubscribeEndPoint());
+        }
+        catch (Exception e)
+        {
+            if (showDebugLog) Debug.LogWarning("Subscribe failed: " + e.Message);
+        }
+    }
+
+    IPEndPoint SubscribeEndPoint()
+    {
+        foreach (IPAddress address in Dns.GetHostAddresses(serverHost))
+        {
+            if (address.AddressFamily == AddressFamily.InterNetwork) return new IPEndPoint(address, subscribePort);
+        }
+        throw new Exception("No IPv4 address for " + serverHost);
+    }
+
+    void Send(string message, IPEndPoint target)
+    {
+        byte[] bytes = Encoding.UTF8.GetBytes(message);
+        client.Send(bytes, bytes.Length, target);
+    }
+
+    static string Label(string[] table, byte id)
+    {
+        return id < table.Length ? table[id] : "unknown";
+    }
+
+    string SignLabel(byte sign)
+    {
+        return sign == 0 ? "none" : (sign - 1 < signClasses.Length ? signClasses[sign - 1] : "unknown");
+    }
+
+    // Decoder for the fixed-layout binary packet (little-endian, see wire_format.py), after the header
+    CVData DecodeBinary(BinaryReader reader)
+    {
+        var result = new CVData();
+        byte flags = reader.ReadByte();
+        result.face_found = (flags & 1) != 0;
+        result.hand_found = (flags & 2) != 0;
+        result.head_pose = new HeadPose
+        {
+            pitch = reader.ReadSingle(),
+            yaw = reader.ReadSingle(),
+            roll = reader.ReadSingle()
+        };
+        result.expression = Label(Expressions, reader.ReadByte());
+        result.gesture = Label(Gestures, reader.ReadByte());
+        result.asl_char = Label(AslChars, reader.ReadByte());
+        result.sign_asl = SignLabel(reader.ReadByte());
+        result.sign_conf = reader.ReadSingle();
+
+        SkipBody(reader, reader.ReadByte());
+
+        ushort textLength = reader.ReadUInt16();
+        result.current_text = Encoding.UTF8.GetString(reader.ReadBytes(textLength));
+
+        result.result_age = new ResultAge();
+        byte ages = reader.ReadByte();
+        for (int i = 0; i < ages; i++)
+        {
+            byte model = reader.ReadByte();
+            float age = reader.ReadSingle();
+            if (model == 0) result.result_age.signdetr = age;      // SCHEDULED_MODELS order
+            else if (model == 1) result.result_age.body_pose = age;
+        }
+
+        result.speech = Label(SpeechStates, reader.ReadByte());
+        result.speech_id = reader.ReadUInt16(); // Wraps at 65536; compare for inequality only
+        return result;
+    }
+
+    // Body joints are not consumed by CVData; skip over them
+    static void SkipBody(BinaryReader reader, byte joints)
+    {
+        if (joints > 0)
+        {
+            reader.ReadUInt32();             // valid-joint mask
+            reader.ReadBytes(joints * 2 * 2); // int16 x, y
+            reader.ReadBytes(joints * 4);     // float32 conf
+        }
+    }
+
+    // Delta packet: a field mask (bit order = DeltaFields) followed by the changed fields only
+    void ApplyBinaryDelta(BinaryReader reader, CVData data)
+    {
+        ushort mask = reader.ReadUInt16();
+        for (int bit = 0; bit < DeltaFields.Length; bit++)
+        {
+            if ((mask & (1 << bit)) == 0) continue;
+            switch (DeltaFields[bit])
+            {
+                case "face_found": data.face_found = reader.ReadByte() != 0; break;
+                case "hand_found": data.hand_found = reader.ReadByte() != 0; break;
+                case "head_pose":
+                    data.head_pose = new HeadPose { pitch = reader.ReadSingle(), yaw = reader.ReadSingle(), roll = reader.ReadSingle() };
+                    break;
+                case "expression": data.expression = Label(Expressions, reader.ReadByte()); break;
+                case "gesture": data.gesture = Label(Gestures, reader.ReadByte()); break;
+                case "asl_char": data.asl_char = Label(AslChars, reader.ReadByte()); break;
+                case "sign_asl": data.sign_asl = SignLabel(reader.ReadByte()); break;
+                case "sign_conf": data.sign_conf = reader.ReadSingle(); break;
+                case "current_text":
+                    ushort textLength = reader.ReadUInt16();
+                    data.current_text = Encoding.UTF8.GetString(reader.ReadBytes(textLength));
+                    break;
+                case "body_pose": SkipBody(reader, reader.ReadByte()); break;
+                case "joints": reader.ReadBytes(reader.ReadByte() * 10); break; // index, valid, int16 x, y, float32 conf
+                case "speech": data.speech = Label(SpeechStates, reader.ReadByte()); break;
+                case "speech_id": data.speech_id = reader.ReadUInt16(); break;
             }
         }
     }
@@ -112,6 +389,10 @@ public class CVReceiver : MonoBehaviour
     void OnDestroy()
     {
         isRunning = false;
+        if (client != null && !string.IsNullOrEmpty(serverHost))
+        {
+            try { Send("bye", SubscribeEndPoint()); } catch (Exception) { }
+        }
         if (client != null) client.Close();
         if (receiveThread != null && receiveThread.IsAlive) receiveThread.Abort();
     }